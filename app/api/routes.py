@@ -1,43 +1,51 @@
 from __future__ import annotations
 
-import difflib
 import importlib.util
 import re
 import sys
-from datetime import datetime
 
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
 from sqlalchemy import func, tuple_
 from app.config import settings
 from app.db import get_db
+from app.discovery_cache import coverage_status
 from app.models import (
     AgendaItem,
+    AgendaItemClassification,
+    AgendaItemTopic,
     Document,
     DocumentTextExtraction,
     Entity,
     EntityAlias,
     EntityBinding,
     EntityConnection,
+    EntityCooccurrence,
     EntityDateValue,
     EntityMention,
     EntityOrganization,
     EntityPerson,
     EntityPlace,
     Meeting,
+    MeetingDiscoveryWindow,
     MeetingMinutesMetadata,
-    MeetingRangeDiscoveryCache,
+    ZoningEvent,
 )
+from app.content_search import SOURCE_KEYS, search_content as search_content_index
+from app.cooccurrence import RELATED_TOP_K
 from app.graph import backfill_graph_entities_and_connections
+from app.graph_cache import CONNECTION_SCAN_LIMIT, get_graph_snapshot
 from app.entities import backfill_entity_kind_records
+from app.entity_index import get_entity_index
+from app.zoning_events import query_zoning_events
 from app.services.civicweb_client import CivicWebClient
-from app.classifiers.topics import classify_topics
-from app.extractors.zoning import extract_zoning_signals
+from app.classifiers.topics import TOPIC_BITS, topics_from_mask
 from app.schemas import (
     AgendaItemOut,
     AgendaTopicSearchOut,
     AddressExploreOut,
     DocumentSearchOut,
+    DocumentTextSearchOut,
     DocumentOut,
     ExplorePopularOut,
     ExploreTopicSummaryOut,
@@ -52,6 +60,8 @@ from app.schemas import (
     StoredMeetingSummaryOut,
     PopularTopicOut,
     TimelineBucketOut,
+    ZoningEventOut,
+    ZoningEventsPageOut,
     ZoningSignalsOut,
 )
 from app.utils.text import normalize_text
@@ -181,48 +191,14 @@ def graph_backfill(
 def ingest_cache_status(
     from_date: str,
     to_date: str,
-    crawl: bool = True,
-    chunk_days: int = 31,
     cache_ttl_minutes: int = 60,
     db: Session = Depends(get_db),
 ):
-    row = (
-        db.query(MeetingRangeDiscoveryCache)
-        .filter(
-            MeetingRangeDiscoveryCache.from_date == from_date,
-            MeetingRangeDiscoveryCache.to_date == to_date,
-            MeetingRangeDiscoveryCache.crawl == (1 if crawl else 0),
-            MeetingRangeDiscoveryCache.chunk_days == int(chunk_days),
-        )
-        .one_or_none()
-    )
-    if not row or not row.last_fetched_at:
-        return {
-            "has_cache": False,
-            "cache_fresh": False,
-            "discovered_count": 0,
-            "last_fetched_at": "",
-            "cache_ttl_minutes": cache_ttl_minutes,
-        }
-
-    cache_fresh = False
-    if row.last_fetched_at:
-        try:
-            fetched_at = datetime.fromisoformat(row.last_fetched_at.replace("Z", "+00:00"))
-            cache_fresh = (
-                datetime.now(fetched_at.tzinfo) - fetched_at
-            ).total_seconds() <= max(cache_ttl_minutes, 0) * 60
-        except ValueError:
-            cache_fresh = False
-
-    return {
-        "has_cache": True,
-        "cache_fresh": cache_fresh,
-        "discovered_count": int(row.discovered_count or 0),
-        "last_fetched_at": row.last_fetched_at or "",
-        "last_used_at": row.last_used_at or "",
-        "cache_ttl_minutes": cache_ttl_minutes,
-    }
+    # Cached discovery windows serve any crawl/chunk_days setting, so coverage depends on the dates alone.
+    try:
+        return coverage_status(db, from_date, to_date, cache_ttl_minutes=cache_ttl_minutes)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="invalid_date_range_use_yyyy_mm_dd")
 
 
 @router.get("/explore/coverage")
@@ -243,8 +219,8 @@ def explore_coverage(db: Session = Depends(get_db)):
         for entity_type, count in sorted(entity_type_rows, key=lambda row: (-int(row[1] or 0), str(row[0] or "")))
     ]
     cache_rows = (
-        db.query(MeetingRangeDiscoveryCache)
-        .order_by(MeetingRangeDiscoveryCache.last_fetched_at.desc(), MeetingRangeDiscoveryCache.id.desc())
+        db.query(MeetingDiscoveryWindow)
+        .order_by(MeetingDiscoveryWindow.last_fetched_at.desc(), MeetingDiscoveryWindow.id.desc())
         .limit(8)
         .all()
     )
@@ -279,36 +255,16 @@ def suggest_entities(
     limit: int = Query(default=10, ge=1, le=50),
     db: Session = Depends(get_db),
 ):
-    needle = normalize_text(q).lower()
-    entity_type_norm = normalize_text(entity_type or "").lower()
-    tokens = [t for t in needle.replace(",", " ").split() if t]
-
-    # Pull a manageable candidate pool, then score in Python for loose matches.
-    candidates = db.query(Entity).order_by(Entity.id.desc()).limit(5000).all()
-    scored: list[tuple[float, Entity]] = []
-    for entity in candidates:
-        if entity_type_norm and (entity.entity_type or "").lower() != entity_type_norm:
-            continue
-        text = (entity.display_value or "").lower()
-        if not text:
-            continue
-        ratio = difflib.SequenceMatcher(None, needle, text).ratio()
-        starts = 1.0 if text.startswith(needle) else 0.0
-        contains = 1.0 if needle in text else 0.0
-        token_hits = sum(1 for t in tokens if t in text) / max(len(tokens), 1)
-        score = (starts * 2.0) + (contains * 1.5) + (token_hits * 1.2) + ratio
-        if score >= 0.4:
-            scored.append((score, entity))
-
-    scored.sort(key=lambda x: (-x[0], x[1].display_value.lower()))
+    index = get_entity_index(db)
+    ranked = index.suggest(q, entity_type=normalize_text(entity_type or "").lower(), limit=limit)
     return [
         EntitySuggestOut(
-            entity_id=e.id,
-            entity_type=e.entity_type,
-            display_value=e.display_value,
+            entity_id=entity_id,
+            entity_type=index.entity_type[entity_id],
+            display_value=index.display_value[entity_id],
             score=round(score, 3),
         )
-        for score, e in scored[:limit]
+        for score, entity_id in ranked
     ]
 
 
@@ -335,6 +291,14 @@ def list_stored_meetings(
     q_meeting_id_match = re.search(r"\bmeeting\s+(\d+)\b", q_norm)
     q_meeting_id = int(q_meeting_id_match.group(1)) if q_meeting_id_match else (int(q_norm) if q_norm.isdigit() else None)
     topic_norm = normalize_text(topic or "").lower()
+    topic_item_counts: dict[int, int] = {}
+    if topic_norm:
+        topic_item_counts = dict(
+            db.query(AgendaItemTopic.meeting_id, func.count(AgendaItemTopic.id))
+            .filter(AgendaItemTopic.topic == topic_norm)
+            .group_by(AgendaItemTopic.meeting_id)
+            .all()
+        )
     out: list[StoredMeetingSummaryOut] = []
     for m in meetings:
         # `Meeting.date` may be blank in current ingest; fall back to lexical match against name when date filters provided.
@@ -366,10 +330,7 @@ def list_stored_meetings(
         )
         matched_topic_count = 0
         if topic_norm:
-            for item in agenda_items:
-                item_topics = classify_topics(normalize_text(item.title or ""))
-                if topic_norm in item_topics:
-                    matched_topic_count += 1
+            matched_topic_count = topic_item_counts.get(m.meeting_id, 0)
             if matched_topic_count == 0:
                 continue
 
@@ -410,18 +371,24 @@ def get_agenda(
         .all()
     )
 
-    # compute topics
+    topic_masks = dict(
+        db.query(AgendaItemClassification.agenda_item_id, AgendaItemClassification.topic_mask)
+        .filter(AgendaItemClassification.meeting_id == meeting_id)
+        .all()
+    )
+    zoning_events = {
+        e.agenda_item_id: e for e in db.query(ZoningEvent).filter(ZoningEvent.meeting_id == meeting_id).all()
+    }
+    docs_by_item: dict[int, list[Document]] = {}
+    for d in db.query(Document).filter(Document.meeting_id == meeting_id).order_by(Document.id.asc()).all():
+        docs_by_item.setdefault(d.agenda_item_id, []).append(d)
+
     topic_filter = normalize_text(topic or "").lower()
     enriched = []
     for it in items:
-        docs = (
-            db.query(Document)
-            .filter(Document.agenda_item_id == it.id)
-            .all()
-        )
+        docs = docs_by_item.get(it.id, [])
         normalized_title = normalize_text(it.title)
-        docs_text = " ".join(normalize_text(d.title) for d in docs)
-        topics = classify_topics(normalized_title, docs_text)
+        topics = topics_from_mask(topic_masks.get(it.id, 0))
         if topic_filter and topic_filter not in topics:
             continue
         enriched.append((it, docs, normalized_title, topics))
@@ -437,10 +404,16 @@ def get_agenda(
             )
             for d in docs
         ]
-        docs_text = " ".join(d.title for d in docs_out)
+        event = zoning_events.get(it.id)
         zoning_signals = (
-            ZoningSignalsOut(**extract_zoning_signals(normalized_title, docs_text))
-            if "zoning" in topics
+            ZoningSignalsOut(
+                ordinance_number=event.ordinance_number,
+                from_zone=event.from_zone,
+                to_zone=event.to_zone,
+                reading_stage=event.reading_stage,
+                address=event.address,
+            )
+            if event is not None and "zoning" in topics
             else None
         )
 
@@ -458,6 +431,55 @@ def get_agenda(
     return out
 
 
+@router.get("/zoning/events", response_model=ZoningEventsPageOut)
+def list_zoning_events(
+    ordinance_number: str | None = Query(default=None),
+    from_zone: str | None = Query(default=None),
+    to_zone: str | None = Query(default=None),
+    address: str | None = Query(default=None, description="Substring, case-insensitive"),
+    reading_stage: str | None = Query(default=None),
+    meeting_id: int | None = Query(default=None),
+    date_from: str | None = Query(default=None, description="YYYY-MM-DD"),
+    date_to: str | None = Query(default=None, description="YYYY-MM-DD"),
+    limit: int = Query(default=50, ge=1, le=500),
+    offset: int = Query(default=0, ge=0),
+    db: Session = Depends(get_db),
+):
+    total, rows = query_zoning_events(
+        db,
+        ordinance_number=ordinance_number,
+        from_zone=from_zone,
+        to_zone=to_zone,
+        address=address,
+        reading_stage=reading_stage,
+        meeting_id=meeting_id,
+        date_from=date_from,
+        date_to=date_to,
+        limit=limit,
+        offset=offset,
+    )
+    return ZoningEventsPageOut(
+        total=total,
+        limit=limit,
+        offset=offset,
+        items=[
+            ZoningEventOut(
+                meeting_id=r.meeting_id,
+                meeting_date=r.meeting_date or "",
+                agenda_item_id=r.agenda_item_id,
+                item_key=r.item_key or "",
+                title=r.title or "",
+                ordinance_number=r.ordinance_number,
+                from_zone=r.from_zone,
+                to_zone=r.to_zone,
+                reading_stage=r.reading_stage,
+                address=r.address,
+            )
+            for r in rows
+        ],
+    )
+
+
 @router.get("/meetings/{meeting_id}/minutes-metadata", response_model=list[MeetingMinutesMetadataOut])
 def get_minutes_metadata(meeting_id: int, db: Session = Depends(get_db)):
     rows = (
@@ -547,11 +569,9 @@ def search_entities(
     limit: int = Query(default=50, ge=1, le=200),
     db: Session = Depends(get_db),
 ):
-    term = f"%{normalize_text(q).lower()}%"
-    query = db.query(Entity).filter(func.lower(Entity.display_value).like(term))
-    if entity_type:
-        query = query.filter(Entity.entity_type == normalize_text(entity_type).lower())
-    entities = query.order_by(Entity.entity_type.asc(), Entity.display_value.asc()).limit(limit).all()
+    entity_ids = get_entity_index(db).search(q, entity_type=normalize_text(entity_type or "").lower(), limit=limit)
+    by_id = {row.id: row for row in db.query(Entity).filter(Entity.id.in_(entity_ids)).all()} if entity_ids else {}
+    entities = [by_id[entity_id] for entity_id in entity_ids if entity_id in by_id]
 
     out: list[EntitySummaryOut] = []
     for entity in entities:
@@ -655,65 +675,34 @@ def get_entity_detail(
 @router.get("/entities/{entity_id}/related", response_model=list[RelatedEntityOut])
 def related_entities(
     entity_id: int,
-    limit: int = Query(default=25, ge=1, le=200),
+    limit: int = Query(default=25, ge=1, le=RELATED_TOP_K),
+    granularity: str = Query(default="meeting", pattern="^(meeting|agenda_item)$"),
     db: Session = Depends(get_db),
 ):
+    """Entities mentioned alongside this one. At agenda_item granularity, `shared_meeting_count` counts shared agenda items."""
     target = db.query(Entity).filter(Entity.id == entity_id).one_or_none()
     if not target:
         return []
 
-    target_meeting_ids = [
-        row[0]
-        for row in (
-            db.query(EntityMention.meeting_id)
-            .filter(EntityMention.entity_id == entity_id)
-            .distinct()
-            .all()
-        )
-    ]
-    if not target_meeting_ids:
-        return []
-
     rows = (
-        db.query(EntityMention, Entity)
-        .join(Entity, Entity.id == EntityMention.entity_id)
-        .filter(EntityMention.meeting_id.in_(target_meeting_ids))
-        .filter(EntityMention.entity_id != entity_id)
+        db.query(EntityCooccurrence, Entity)
+        .join(Entity, Entity.id == EntityCooccurrence.other_entity_id)
+        .filter(EntityCooccurrence.entity_id == entity_id, EntityCooccurrence.granularity == granularity)
+        .order_by(EntityCooccurrence.rank.asc())
+        .limit(limit)
         .all()
     )
-
-    counts: dict[int, dict] = {}
-    for mention, entity in rows:
-        bucket = counts.setdefault(
-            entity.id,
-            {
-                "entity": entity,
-                "cooccurrence_count": 0,
-                "meeting_ids": set(),
-            },
-        )
-        bucket["cooccurrence_count"] += 1
-        bucket["meeting_ids"].add(mention.meeting_id)
-
-    ranked = sorted(
-        counts.values(),
-        key=lambda b: (-b["shared_meeting_count"] if "shared_meeting_count" in b else -len(b["meeting_ids"]), -b["cooccurrence_count"], b["entity"].display_value.lower()),
-    )
-
-    out: list[RelatedEntityOut] = []
-    for bucket in ranked[:limit]:
-        entity = bucket["entity"]
-        out.append(
-            RelatedEntityOut(
-                entity_id=entity.id,
-                entity_type=entity.entity_type,
-                display_value=entity.display_value,
-                normalized_value=entity.normalized_value,
-                cooccurrence_count=int(bucket["cooccurrence_count"]),
-                shared_meeting_count=len(bucket["meeting_ids"]),
-            )
+    return [
+        RelatedEntityOut(
+            entity_id=entity.id,
+            entity_type=entity.entity_type,
+            display_value=entity.display_value,
+            normalized_value=entity.normalized_value,
+            cooccurrence_count=int(row.cooccurrence_count),
+            shared_meeting_count=int(row.shared_count),
         )
-    return out
+        for row, entity in rows
+    ]
 
 
 @router.get("/entities/{entity_id}/connections", response_model=list[EntityConnectionOut])
@@ -728,130 +717,27 @@ def get_entity_connections(
     if not target:
         return []
 
-    edges = (
-        db.query(EntityConnection)
-        .filter(
-            (EntityConnection.from_entity_id == entity_id) | (EntityConnection.to_entity_id == entity_id)
-        )
-        .order_by(EntityConnection.id.desc())
-        .limit(5000)
-        .all()
-    )
+    edges = get_graph_snapshot(db).incident_edges(entity_id, CONNECTION_SCAN_LIMIT)
     if not edges:
         return []
 
     topic_norm = normalize_text(topic or "")
     if topic_norm:
-        source_topic_cache: dict[tuple[str, int], bool] = {}
-        mention_source_cache: dict[tuple[str, int], EntityMention | None] = {}
-        agenda_cache: dict[int, AgendaItem | None] = {}
-        doc_cache: dict[int, Document | None] = {}
-        extraction_cache: dict[int, DocumentTextExtraction | None] = {}
-        minutes_cache: dict[int, MeetingMinutesMetadata | None] = {}
-        meeting_cache: dict[int, Meeting | None] = {}
-
-        def _agenda_row(row_id: int) -> AgendaItem | None:
-            if row_id not in agenda_cache:
-                agenda_cache[row_id] = db.get(AgendaItem, row_id)
-            return agenda_cache[row_id]
-
-        def _doc_row(row_id: int) -> Document | None:
-            if row_id not in doc_cache:
-                doc_cache[row_id] = db.get(Document, row_id)
-            return doc_cache[row_id]
-
-        def _extraction_row(row_id: int) -> DocumentTextExtraction | None:
-            if row_id not in extraction_cache:
-                extraction_cache[row_id] = db.get(DocumentTextExtraction, row_id)
-            return extraction_cache[row_id]
-
-        def _minutes_row(row_id: int) -> MeetingMinutesMetadata | None:
-            if row_id not in minutes_cache:
-                minutes_cache[row_id] = db.get(MeetingMinutesMetadata, row_id)
-            return minutes_cache[row_id]
-
-        def _meeting_row(row_id: int) -> Meeting | None:
-            if row_id not in meeting_cache:
-                meeting_cache[row_id] = db.get(Meeting, row_id)
-            return meeting_cache[row_id]
-
-        def _mention_source_row(source_type: str, source_id: int) -> EntityMention | None:
-            key = (source_type, source_id)
-            if key not in mention_source_cache:
-                mention_source_cache[key] = (
-                    db.query(EntityMention)
-                    .filter(
-                        EntityMention.source_type == source_type,
-                        EntityMention.source_id == source_id,
-                    )
-                    .order_by(EntityMention.id.desc())
-                    .first()
-                )
-            return mention_source_cache[key]
-
-        def _edge_matches_topic(edge: EntityConnection) -> bool:
-            source_type = normalize_text(edge.evidence_source_type or "")
-            source_id = int(edge.evidence_source_id or 0)
-            cache_key = (source_type, source_id)
-            if cache_key in source_topic_cache:
-                return source_topic_cache[cache_key]
-
-            text_parts: list[str] = []
-            if source_type and source_id > 0 and source_type != "documents":
-                mention = _mention_source_row(source_type, source_id)
-                if mention:
-                    text_parts.extend([mention.context_text or "", mention.mention_text or ""])
-            if source_type in {"agenda_item_title", "agenda_items"} and source_id > 0:
-                agenda = _agenda_row(source_id)
-                if agenda:
-                    text_parts.extend([agenda.title or "", agenda.section or "", agenda.item_key or ""])
-            elif source_type in {"document_title", "documents"} and source_id > 0:
-                doc = _doc_row(source_id)
-                if doc:
-                    text_parts.append(doc.title or "")
-                    if doc.agenda_item_id:
-                        agenda = _agenda_row(int(doc.agenda_item_id))
-                        if agenda:
-                            text_parts.append(agenda.title or "")
-            elif source_type == "document_content" and source_id > 0:
-                extraction = _extraction_row(source_id)
-                if extraction:
-                    text_parts.extend([extraction.title or "", extraction.text_excerpt or ""])
-            elif source_type == "minutes_excerpt" and source_id > 0:
-                minutes = _minutes_row(source_id)
-                if minutes:
-                    text_parts.extend([minutes.title or "", minutes.text_excerpt or ""])
-            elif source_type == "meeting_metadata" and source_id > 0:
-                meeting = _meeting_row(source_id)
-                if meeting:
-                    text_parts.extend(
-                        [
-                            meeting.name or "",
-                            meeting.location or "",
-                            meeting.date or "",
-                            meeting.time or "",
-                        ]
-                    )
-
-            source_text = normalize_text(" ".join(p for p in text_parts if p).strip())
-            if not source_text:
-                source_topic_cache[cache_key] = False
-                return False
-            source_topic_cache[cache_key] = topic_norm in classify_topics(source_text)
-            return source_topic_cache[cache_key]
-
-        edges = [edge for edge in edges if _edge_matches_topic(edge)]
+        topic_bit = TOPIC_BITS.get(topic_norm, 0)
+        if not topic_bit:
+            return []
+        # Sources not classified under the current taxonomy carry mask 0 until the background pass.
+        edges = [edge for edge in edges if edge.topic_mask & topic_bit]
         if not edges:
             return []
 
     buckets: dict[tuple[int, str, str], dict] = {}
     other_ids: set[int] = set()
     for edge in edges:
-        outgoing = int(edge.from_entity_id) == int(entity_id)
-        other_id = int(edge.to_entity_id if outgoing else edge.from_entity_id)
+        other_id = edge.other_id
         other_ids.add(other_id)
-        direction = "outgoing" if outgoing else "incoming"
-        key = (other_id, edge.relation_type or "", direction)
+        direction = "outgoing" if edge.outgoing else "incoming"
+        key = (other_id, edge.relation_type, direction)
         bucket = buckets.setdefault(
             key,
             {
@@ -1003,46 +889,72 @@ def get_entity_connection_evidence(
 def search_content(
     q: str = Query(..., min_length=1),
     limit: int = Query(default=20, ge=1, le=200),
+    source: str | None = Query(default=None, pattern="^(agenda_topics|documents|document_text|minutes)$"),
     db: Session = Depends(get_db),
 ):
-    term = f"%{normalize_text(q).lower()}%"
-
-    agenda_rows = (
-        db.query(AgendaItem)
-        .filter(func.lower(AgendaItem.title).like(term))
-        .order_by(AgendaItem.meeting_id.desc(), AgendaItem.item_key.asc())
-        .limit(limit)
-        .all()
-    )
-    document_rows = (
-        db.query(Document)
-        .filter(func.lower(Document.title).like(term))
-        .order_by(Document.meeting_id.desc(), Document.document_id.desc())
-        .limit(limit)
-        .all()
-    )
+    """
+    Full-text search of agenda titles, document titles, extracted document text and minutes.
+
+    Bare terms must all match; `"quoted phrases"` match in order and `term*` matches
+    as a prefix. Each list holds the best `limit` hits of its source, and `facets`
+    counts every match per source. `source` restricts the lists to one source.
+    """
+    hits, facets = search_content_index(db, q, limit=limit, source_keys=(source,) if source else SOURCE_KEYS)
+
+    def rows_by_id(model, key: str) -> dict:
+        ids = [hit.row_id for hit in hits.get(key, [])]
+        return {row.id: row for row in db.query(model).filter(model.id.in_(ids)).all()} if ids else {}
+
+    agenda = rows_by_id(AgendaItem, "agenda_topics")
+    documents = rows_by_id(Document, "documents")
+    texts = rows_by_id(DocumentTextExtraction, "document_text")
+    minutes = rows_by_id(MeetingMinutesMetadata, "minutes")
+
+    def text_results(key: str, rows: dict) -> list[DocumentTextSearchOut]:
+        return [
+            DocumentTextSearchOut(
+                meeting_id=rows[hit.row_id].meeting_id,
+                document_id=rows[hit.row_id].document_id,
+                title=normalize_text(rows[hit.row_id].title),
+                url=rows[hit.row_id].url or "",
+                title_highlight=hit.title,
+                snippet=hit.snippet,
+                score=hit.score,
+            )
+            for hit in hits.get(key, [])
+            if hit.row_id in rows
+        ]
 
     return {
         "agenda_topics": [
             AgendaTopicSearchOut(
-                meeting_id=row.meeting_id,
-                agenda_item_id=row.id,
-                item_key=row.item_key,
-                title=normalize_text(row.title),
-                section=row.section or "",
+                meeting_id=agenda[hit.row_id].meeting_id,
+                agenda_item_id=hit.row_id,
+                item_key=agenda[hit.row_id].item_key,
+                title=normalize_text(agenda[hit.row_id].title),
+                section=agenda[hit.row_id].section or "",
+                title_highlight=hit.title,
+                score=hit.score,
             )
-            for row in agenda_rows
+            for hit in hits.get("agenda_topics", [])
+            if hit.row_id in agenda
         ],
         "documents": [
             DocumentSearchOut(
-                meeting_id=row.meeting_id,
-                document_id=row.document_id,
-                agenda_item_id=row.agenda_item_id,
-                title=normalize_text(row.title),
-                url=row.url,
+                meeting_id=documents[hit.row_id].meeting_id,
+                document_id=documents[hit.row_id].document_id,
+                agenda_item_id=documents[hit.row_id].agenda_item_id,
+                title=normalize_text(documents[hit.row_id].title),
+                url=documents[hit.row_id].url,
+                title_highlight=hit.title,
+                score=hit.score,
             )
-            for row in document_rows
+            for hit in hits.get("documents", [])
+            if hit.row_id in documents
         ],
+        "document_text": text_results("document_text", texts),
+        "minutes": text_results("minutes", minutes),
+        "facets": facets,
     }
 
 
@@ -1096,15 +1008,15 @@ def explore_popular(
             )
         )
 
-    topic_counts: dict[str, int] = {}
-    for row in db.query(AgendaItem).order_by(AgendaItem.id.desc()).limit(5000).all():
-        for topic in classify_topics(row.title or ""):
-            topic_counts[topic] = topic_counts.get(topic, 0) + 1
-
-    topics_out = [
-        PopularTopicOut(topic=t, count=c)
-        for t, c in sorted(topic_counts.items(), key=lambda kv: (-kv[1], kv[0]))[:topic_limit]
-    ]
+    item_count = func.count(AgendaItemTopic.id)
+    topic_counts = (
+        db.query(AgendaItemTopic.topic, item_count)
+        .group_by(AgendaItemTopic.topic)
+        .order_by(item_count.desc(), AgendaItemTopic.topic.asc())
+        .limit(topic_limit)
+        .all()
+    )
+    topics_out = [PopularTopicOut(topic=t, count=int(c)) for t, c in topic_counts]
     return ExplorePopularOut(topics=topics_out, entities=entities_out)
 
 
@@ -1115,32 +1027,36 @@ def explore_topics(
     db: Session = Depends(get_db),
 ):
     q_norm = normalize_text(q or "").lower()
-    buckets: dict[str, dict[str, object]] = {}
-    rows = db.query(AgendaItem).order_by(AgendaItem.meeting_id.desc(), AgendaItem.id.desc()).limit(10000).all()
-    for row in rows:
-        title = normalize_text(row.title or "")
-        topics = classify_topics(title)
-        for topic in topics:
-            if q_norm and q_norm not in topic:
-                continue
-            b = buckets.setdefault(topic, {"agenda_item_count": 0, "meeting_ids": []})
-            b["agenda_item_count"] = int(b["agenda_item_count"]) + 1
-            mids = b["meeting_ids"]
-            if row.meeting_id not in mids:
-                mids.append(row.meeting_id)
-
-    ranked = sorted(
-        buckets.items(),
-        key=lambda kv: (-int(kv[1]["agenda_item_count"]), kv[0]),
-    )[:limit]
+    item_count = func.count(AgendaItemTopic.id)
+    query = db.query(
+        AgendaItemTopic.topic,
+        item_count,
+        func.count(func.distinct(AgendaItemTopic.meeting_id)),
+    )
+    if q_norm:
+        query = query.filter(AgendaItemTopic.topic.contains(q_norm, autoescape=True))
+    ranked = (
+        query.group_by(AgendaItemTopic.topic)
+        .order_by(item_count.desc(), AgendaItemTopic.topic.asc())
+        .limit(limit)
+        .all()
+    )
     return [
         ExploreTopicSummaryOut(
             topic=topic,
-            agenda_item_count=int(data["agenda_item_count"]),
-            meeting_count=len(data["meeting_ids"]),
-            recent_meeting_ids=list(data["meeting_ids"])[:5],
+            agenda_item_count=int(count),
+            meeting_count=int(meeting_count),
+            recent_meeting_ids=[
+                mid
+                for (mid,) in db.query(AgendaItemTopic.meeting_id)
+                .filter(AgendaItemTopic.topic == topic)
+                .distinct()
+                .order_by(AgendaItemTopic.meeting_id.desc())
+                .limit(5)
+                .all()
+            ],
         )
-        for topic, data in ranked
+        for topic, count, meeting_count in ranked
     ]
 
 
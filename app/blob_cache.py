@@ -0,0 +1,181 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+
+from .config import settings
+
+
+@dataclass(frozen=True)
+class CachedBlob:
+    url: str
+    sha256: str
+    size: int
+    content_type: str
+    etag: str
+    last_modified: str
+
+    def conditional_headers(self) -> dict[str, str]:
+        headers: dict[str, str] = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+class BlobCache:
+    """
+    Content-addressed attachment store on local disk.
+
+    Layout under `root`:
+      blobs/<sha[:2]>/<sha256>   raw bytes, shared by every URL with the same content
+      index/<sha256(url)>.json   URL -> blob hash plus ETag / Last-Modified validators
+
+    Blob mtimes double as LRU clocks: reads touch them, and eviction removes the
+    least recently used blobs once the total size passes `max_bytes`. Index entries
+    whose blob was evicted are dropped on the next lookup.
+    """
+
+    def __init__(self, root: str | os.PathLike[str], max_bytes: int):
+        self.root = Path(root)
+        self.max_bytes = max(int(max_bytes), 0)
+        self._lock = threading.Lock()
+        self._total_bytes: int | None = None
+
+    def _blob_path(self, sha256: str) -> Path:
+        return self.root / "blobs" / sha256[:2] / sha256
+
+    def _index_path(self, url: str) -> Path:
+        return self.root / "index" / f"{hashlib.sha256(url.encode('utf-8')).hexdigest()}.json"
+
+    @staticmethod
+    def _write_atomic(path: Path, data: bytes) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        tmp.write_bytes(data)
+        os.replace(tmp, path)
+
+    def _scan_total_bytes(self) -> int:
+        blobs = self.root / "blobs"
+        if not blobs.exists():
+            return 0
+        return sum(p.stat().st_size for p in blobs.glob("*/*") if p.is_file())
+
+    def lookup(self, url: str) -> CachedBlob | None:
+        index_path = self._index_path(url)
+        try:
+            raw = json.loads(index_path.read_text(encoding="utf-8"))
+            entry = CachedBlob(
+                url=str(raw["url"]),
+                sha256=str(raw["sha256"]),
+                size=int(raw.get("size") or 0),
+                content_type=str(raw.get("content_type") or ""),
+                etag=str(raw.get("etag") or ""),
+                last_modified=str(raw.get("last_modified") or ""),
+            )
+        except (OSError, ValueError, KeyError):
+            return None
+        if entry.url != url or not self._blob_path(entry.sha256).exists():
+            index_path.unlink(missing_ok=True)
+            return None
+        return entry
+
+    def read(self, entry: CachedBlob) -> bytes | None:
+        path = self._blob_path(entry.sha256)
+        try:
+            body = path.read_bytes()
+            os.utime(path, None)
+        except OSError:
+            return None
+        if hashlib.sha256(body).hexdigest() != entry.sha256:
+            path.unlink(missing_ok=True)
+            return None
+        return body
+
+    def store(
+        self,
+        url: str,
+        body: bytes,
+        *,
+        content_type: str = "",
+        etag: str = "",
+        last_modified: str = "",
+    ) -> CachedBlob | None:
+        if self.max_bytes and len(body) > self.max_bytes:
+            return None
+        sha256 = hashlib.sha256(body).hexdigest()
+        entry = CachedBlob(
+            url=url,
+            sha256=sha256,
+            size=len(body),
+            content_type=content_type,
+            etag=etag,
+            last_modified=last_modified,
+        )
+        blob_path = self._blob_path(sha256)
+        with self._lock:
+            if self._total_bytes is None:
+                self._total_bytes = self._scan_total_bytes()
+            if blob_path.exists():
+                os.utime(blob_path, None)
+            else:
+                self._write_atomic(blob_path, body)
+                self._total_bytes += len(body)
+            self._write_atomic(
+                self._index_path(url),
+                json.dumps(entry.__dict__, ensure_ascii=True, sort_keys=True).encode("utf-8"),
+            )
+            self._evict_locked(keep=sha256)
+        return entry
+
+    def evict(self) -> int:
+        with self._lock:
+            if self._total_bytes is None:
+                self._total_bytes = self._scan_total_bytes()
+            return self._evict_locked()
+
+    def _evict_locked(self, keep: str | None = None) -> int:
+        if not self.max_bytes or (self._total_bytes or 0) <= self.max_bytes:
+            return 0
+        blobs = []
+        for p in (self.root / "blobs").glob("*/*"):
+            try:
+                st = p.stat()
+            except OSError:
+                continue
+            if p.is_file() and not p.name.startswith("."):
+                blobs.append((st.st_mtime, p.name, st.st_size, p))
+        blobs.sort()
+        total = sum(size for _, _, size, _ in blobs)
+        removed = 0
+        for _, name, size, path in blobs:
+            if total <= self.max_bytes:
+                break
+            if name == keep:
+                continue
+            path.unlink(missing_ok=True)
+            total -= size
+            removed += 1
+        self._total_bytes = total
+        return removed
+
+
+_cache: BlobCache | None = None
+_cache_lock = threading.Lock()
+
+
+def get_blob_cache() -> BlobCache | None:
+    """Shared cache built from settings; None when `blob_cache_dir` is unset."""
+    global _cache
+    if not settings.blob_cache_dir:
+        return None
+    if _cache is None or str(_cache.root) != str(Path(settings.blob_cache_dir)):
+        with _cache_lock:
+            if _cache is None or str(_cache.root) != str(Path(settings.blob_cache_dir)):
+                _cache = BlobCache(settings.blob_cache_dir, settings.blob_cache_max_bytes)
+    return _cache
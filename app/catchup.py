@@ -0,0 +1,34 @@
+"""
+Startup catch-up for derived data.
+
+Ingest keeps topic classifications, evidence topic masks and co-occurrence
+current. What a previous process left stale (a taxonomy bump, an interrupted
+job) is redone once at startup by a single background thread that runs one
+pass at a time, so the passes never compete for SQLite's one writer. The
+entity index is loaded last, after the writes.
+"""
+from __future__ import annotations
+
+import threading
+import traceback
+
+from .cooccurrence import refresh_stale_cooccurrences
+from .entity_index import warm_entity_index
+from .topic_index import reclassify_stale_topics
+
+STARTUP_PASSES = (reclassify_stale_topics, refresh_stale_cooccurrences, warm_entity_index)
+
+
+def run_startup_catchup() -> None:
+    for catch_up in STARTUP_PASSES:
+        try:
+            catch_up()
+        except Exception:
+            # One failed pass must not skip the others; report it as an unhandled thread error would be.
+            traceback.print_exc()
+
+
+def start_startup_catchup() -> threading.Thread:
+    thread = threading.Thread(target=run_startup_catchup, name="startup-catchup", daemon=True)
+    thread.start()
+    return thread
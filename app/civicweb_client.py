@@ -1,9 +1,9 @@
-import requests
+from .http_client import http_get
 
 BASE = "https://urbandale.civicweb.net"
 
-def _get_json(url: str, timeout=30):
-    r = requests.get(url, timeout=timeout)
+def _get_json(url: str, timeout=None):
+    r = http_get(url, timeout=timeout)
     r.raise_for_status()
     return r.json()
 
@@ -17,4 +17,4 @@ def get_meeting_data(meeting_id: int):
 
 def get_meeting_documents(meeting_id: int):
     url = f"{BASE}/Services/MeetingsService.svc/meetings/{meeting_id}/meetingDocuments?$format=json"
-    return _get_json(url)
\ No newline at end of file
+    return _get_json(url)
@@ -1,3 +1,5 @@
+import hashlib
+import json
 import re
 from app.utils.text import normalize_text
 
@@ -91,14 +93,55 @@ TOPIC_PATTERNS: dict[str, list[str]] = {
     ],
 }
 
+# Changes whenever a pattern or topic changes, so stored classifications can be recognized as stale.
+TAXONOMY_VERSION = hashlib.sha256(json.dumps(TOPIC_PATTERNS).encode("utf-8")).hexdigest()[:16]
+
+# Bit i of a topic mask is TOPIC_NAMES[i]; taxonomy order, so masks stay stable as long as topics are only appended.
+TOPIC_NAMES: tuple[str, ...] = tuple(TOPIC_PATTERNS)
+TOPIC_BITS: dict[str, int] = {topic: 1 << i for i, topic in enumerate(TOPIC_NAMES)}
+
+# One alternation per topic: a topic matches if any of its patterns does, so a single
+# search per topic replaces one search per pattern. Topics stay separate because one
+# combined pattern would let a match for one topic hide an overlapping match for another.
+_COMPILED_TOPICS: tuple[tuple[int, re.Pattern], ...] = tuple(
+    (TOPIC_BITS[topic], re.compile("|".join(f"(?:{pat})" for pat in patterns)))
+    for topic, patterns in TOPIC_PATTERNS.items()
+)
+
+
+def _classify_normalized(text: str) -> int:
+    mask = 0
+    for bit, pattern in _COMPILED_TOPICS:
+        if pattern.search(text):
+            mask |= bit
+    return mask
+
+
+def topics_from_mask(mask: int) -> set[str]:
+    return {topic for topic, bit in TOPIC_BITS.items() if mask & bit}
+
+
+def classify_topics_mask(title: str, body: str | None = None) -> int:
+    return _classify_normalized(normalize_text(" ".join([title or "", body or ""])).lower())
+
+
 def classify_topics(title: str, body: str | None = None) -> set[str]:
-    text = normalize_text(" ".join([title or "", body or ""])).lower()
-    topics: set[str] = set()
+    return topics_from_mask(classify_topics_mask(title, body))
+
 
-    for topic, patterns in TOPIC_PATTERNS.items():
-        for pat in patterns:
-            if re.search(pat, text):
-                topics.add(topic)
-                break
+def classify_topics_batch(texts: list[str]) -> list[int]:
+    """
+    Topic masks for many texts at once, one per input (see `topics_from_mask`).
 
-    return topics
+    Agenda titles repeat heavily ("Approval of Minutes", "Bill List"), so each
+    distinct normalized text is classified once.
+    """
+    masks: dict[str, int] = {}
+    out: list[int] = []
+    for raw in texts:
+        text = normalize_text(raw or "").lower()
+        mask = masks.get(text)
+        if mask is None:
+            mask = masks[text] = _classify_normalized(text)
+        out.append(mask)
+    return out
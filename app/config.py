@@ -6,5 +6,42 @@ class Settings(BaseSettings):
 
     civicweb_base_url: str = "https://urbandale.civicweb.net"
 
+    # Shared outbound HTTP pool (see app/http_client.py).
+    http_max_connections: int = 20
+    http_max_keepalive_connections: int = 10
+    http_keepalive_expiry_seconds: float = 30.0
+    http_timeout_seconds: float = 30.0
+    http_connect_timeout_seconds: float = 10.0
+    http_document_timeout_seconds: float = 20.0
+    http2_enabled: bool = False  # requires the optional `h2` package
 
-settings = Settings()
\ No newline at end of file
+    # Concurrent CivicWeb list_meetings calls while discovering a date range.
+    ingest_discovery_concurrency: int = 4
+    # Persisted ingest jobs (see app/jobs.py): finished jobs are purged after the retention
+    # period; an interrupted job is resumed at startup at most this many times.
+    ingest_job_retention_hours: int = 72
+    ingest_job_max_attempts: int = 3
+    # Concurrent job slots; `interactive_reserve` of them are kept free of bulk range jobs.
+    ingest_job_workers: int = 3
+    ingest_job_interactive_reserve: int = 1
+    # A meeting lease outlives a crashed holder by at most this long (see app/leases.py);
+    # live holders renew theirs. `/ingest/meeting/{id}` gives up waiting for one after
+    # `meeting_lease_wait_seconds`.
+    meeting_lease_seconds: float = 900.0
+    meeting_lease_wait_seconds: float = 30.0
+
+    # Discovery windows older than this are deleted (see app/discovery_cache.py).
+    discovery_cache_retention_hours: int = 24 * 7
+
+    # On-disk attachment cache (see app/blob_cache.py); empty disables it.
+    blob_cache_dir: str = ""
+    blob_cache_max_bytes: int = 2 * 1024 * 1024 * 1024
+
+    # PDF parsing worker processes (see app/pdf_worker.py); 0 parses in-process.
+    pdf_worker_processes: int = 1
+    pdf_timeout_seconds: float = 60.0
+    pdf_worker_memory_limit_mb: int = 512
+    pdf_worker_max_tasks_per_child: int = 50
+
+
+settings = Settings()
@@ -0,0 +1,281 @@
+"""
+Full-text search over agenda items, documents, extracted document text and minutes.
+
+On SQLite, `/search/content` reads the FTS5 table `content_search` (a title and
+a body column, BM25 ranked, titles weighted above bodies). Each indexed row's
+rowid encodes its source row as `id * 4 + source code`. Triggers on the four
+source tables keep the index in the same transaction as the rows ingest writes,
+and creating the index on an existing database fills it from the rows already
+stored. Queries take bare terms (all must match), `"quoted phrases"` and
+`prefix*` terms.
+
+Other backends, and SQLite builds without FTS5, fall back to `LIKE` matching
+of the same query terms, ordered as the old title search was.
+"""
+from __future__ import annotations
+
+import html
+import re
+import weakref
+from dataclasses import dataclass
+
+from sqlalchemy import event, func, or_, select, text
+from sqlalchemy.engine import Connection
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import Session
+
+from .db import Base
+from .models import AgendaItem, Document, DocumentTextExtraction, MeetingMinutesMetadata
+from .utils.text import normalize_text
+
+FTS_TABLE = "content_search"
+TITLE_WEIGHT = 4.0
+BODY_WEIGHT = 1.0
+SNIPPET_TOKENS = 16
+
+# Private-use markers survive html.escape and become <mark> tags afterwards.
+_HIT_OPEN = "\ue000"
+_HIT_CLOSE = "\ue001"
+_TERM = re.compile(r'"([^"]*)"?|(\S+)')
+_TOKEN = re.compile(r"[^\W_]+")
+
+_fts_ready: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()  # engine -> bool
+
+
+@dataclass(frozen=True)
+class ContentSource:
+    key: str  # response key and facet name
+    code: int  # rowid % 4
+    model: type
+    title_column: str
+    body_column: str | None
+
+
+SOURCES = (
+    ContentSource("agenda_topics", 0, AgendaItem, "title", None),
+    ContentSource("documents", 1, Document, "title", None),
+    ContentSource("document_text", 2, DocumentTextExtraction, "title", "text_excerpt"),
+    ContentSource("minutes", 3, MeetingMinutesMetadata, "title", "text_excerpt"),
+)
+SOURCE_KEYS = tuple(source.key for source in SOURCES)
+
+
+@dataclass
+class ContentHit:
+    row_id: int
+    title: str  # html-escaped, matches in <mark>
+    snippet: str  # html-escaped, matches in <mark>
+    score: float | None  # BM25 (lower is better); None from the LIKE fallback
+
+
+def _source_triggers(source: ContentSource) -> list[str]:
+    table = source.model.__tablename__
+    body = f"coalesce(new.{source.body_column}, '')" if source.body_column else "''"
+    row_insert = (
+        f"INSERT INTO {FTS_TABLE}(rowid, title, body) "
+        f"VALUES (new.id * 4 + {source.code}, coalesce(new.{source.title_column}, ''), {body});"
+    )
+    row_delete = f"DELETE FROM {FTS_TABLE} WHERE rowid = old.id * 4 + {source.code};"
+    columns = [source.title_column] + ([source.body_column] if source.body_column else [])
+    changed = " OR ".join(f"old.{column} IS NOT new.{column}" for column in columns)
+    return [
+        f"CREATE TRIGGER IF NOT EXISTS {table}_{FTS_TABLE}_ai AFTER INSERT ON {table} BEGIN {row_insert} END",
+        f"CREATE TRIGGER IF NOT EXISTS {table}_{FTS_TABLE}_ad AFTER DELETE ON {table} BEGIN {row_delete} END",
+        f"CREATE TRIGGER IF NOT EXISTS {table}_{FTS_TABLE}_au AFTER UPDATE OF {', '.join(columns)} ON {table} "
+        f"WHEN {changed} BEGIN {row_delete} {row_insert} END",
+    ]
+
+
+def _backfill_sql(source: ContentSource) -> str:
+    table = source.model.__tablename__
+    body = f"coalesce({source.body_column}, '')" if source.body_column else "''"
+    return (
+        f"INSERT INTO {FTS_TABLE}(rowid, title, body) "
+        f"SELECT id * 4 + {source.code}, coalesce({source.title_column}, ''), {body} FROM {table}"
+    )
+
+
+def install_content_index(connection: Connection) -> bool:
+    """Create the FTS5 table and its triggers if missing, filling a new table from stored rows."""
+    if connection.dialect.name != "sqlite":
+        return False
+    exists = connection.execute(
+        text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"), {"name": FTS_TABLE}
+    ).first()
+    try:
+        if exists is None:
+            connection.execute(
+                text(
+                    f"CREATE VIRTUAL TABLE {FTS_TABLE} USING fts5("
+                    "title, body, tokenize = 'unicode61 remove_diacritics 2', prefix = '2 3')"
+                )
+            )
+            for source in SOURCES:
+                connection.execute(text(_backfill_sql(source)))
+        for source in SOURCES:
+            for statement in _source_triggers(source):
+                connection.execute(text(statement))
+    except OperationalError:
+        return False  # no FTS5 in this SQLite build: searches use LIKE
+    return True
+
+
+@event.listens_for(Base.metadata, "after_create")
+def _install_after_create(_metadata, connection: Connection, **_kw) -> None:
+    _fts_ready[connection.engine] = install_content_index(connection)
+
+
+def fts_available(db: Session) -> bool:
+    bind = db.get_bind()
+    ready = _fts_ready.get(bind)
+    if ready is None:
+        ready = _fts_ready[bind] = bind.dialect.name == "sqlite" and (
+            db.execute(
+                text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"), {"name": FTS_TABLE}
+            ).first()
+            is not None
+        )
+    return ready
+
+
+def parse_query(q: str) -> list[tuple[list[str], bool]]:
+    """`[(tokens, prefix)]`: one entry per phrase or term, every entry must match."""
+    terms: list[tuple[list[str], bool]] = []
+    for match in _TERM.finditer(normalize_text(q)):
+        phrase, word = match.groups()
+        tokens = _TOKEN.findall((phrase if phrase is not None else word).lower())
+        if tokens:
+            terms.append((tokens, word is not None and word.endswith("*")))
+    return terms
+
+
+def fts_match_expression(terms: list[tuple[list[str], bool]]) -> str:
+    # Tokens are alphanumeric only, so quoting them leaves no FTS5 syntax to escape.
+    return " ".join(f'"{" ".join(tokens)}"' + ("*" if prefix else "") for tokens, prefix in terms)
+
+
+def _markup(marked: str) -> str:
+    return html.escape(marked).replace(_HIT_OPEN, "<mark>").replace(_HIT_CLOSE, "</mark>")
+
+
+def _search_fts(
+    db: Session, terms: list[tuple[list[str], bool]], sources: tuple[ContentSource, ...], limit: int
+) -> tuple[dict[str, list[ContentHit]], dict[str, int]]:
+    match = fts_match_expression(terms)
+    hits: dict[str, list[ContentHit]] = {}
+    for source in sources:
+        rows = db.execute(
+            text(
+                f"SELECT rowid, highlight({FTS_TABLE}, 0, :open, :close), "
+                f"snippet({FTS_TABLE}, 1, :open, :close, '…', :tokens), "
+                f"bm25({FTS_TABLE}, :title_weight, :body_weight) AS score "
+                f"FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH :match AND rowid % 4 = :code "
+                "ORDER BY score, rowid DESC LIMIT :limit"
+            ),
+            {
+                "open": _HIT_OPEN,
+                "close": _HIT_CLOSE,
+                "tokens": SNIPPET_TOKENS,
+                "title_weight": TITLE_WEIGHT,
+                "body_weight": BODY_WEIGHT,
+                "match": match,
+                "code": source.code,
+                "limit": limit,
+            },
+        )
+        hits[source.key] = [
+            ContentHit(row_id=rowid // 4, title=_markup(title or ""), snippet=_markup(snippet or ""), score=score)
+            for rowid, title, snippet, score in rows
+        ]
+    counts = dict(
+        db.execute(
+            text(f"SELECT rowid % 4, count(*) FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH :match GROUP BY rowid % 4"),
+            {"match": match},
+        ).all()
+    )
+    facets = {source.key: int(counts.get(source.code, 0)) for source in SOURCES}
+    return hits, facets
+
+
+def _like_terms(terms: list[tuple[list[str], bool]]) -> list[str]:
+    return [f"%{' '.join(tokens)}%" for tokens, _prefix in terms]
+
+
+def _mark_all(value: str, patterns: list[str]) -> str:
+    lowered = value.lower()
+    marked = [False] * len(value)
+    for pattern in patterns:
+        needle = pattern.strip("%")
+        start = lowered.find(needle)
+        while needle and start >= 0:
+            marked[start : start + len(needle)] = [True] * len(needle)
+            start = lowered.find(needle, start + len(needle))
+    out: list[str] = []
+    for i, ch in enumerate(value):
+        if marked[i] and (i == 0 or not marked[i - 1]):
+            out.append(_HIT_OPEN)
+        out.append(ch)
+        if marked[i] and (i + 1 == len(value) or not marked[i + 1]):
+            out.append(_HIT_CLOSE)
+    return _markup("".join(out))
+
+
+def _like_snippet(value: str, patterns: list[str]) -> str:
+    """About `SNIPPET_TOKENS` words, starting a few words before the first match."""
+    words = normalize_text(value or "").split()
+    first_tokens = [pattern.strip("%").split()[0] for pattern in patterns]
+    first = next((i for i, word in enumerate(words) if any(token in word.lower() for token in first_tokens)), 0)
+    start = max(first - SNIPPET_TOKENS // 4, 0)
+    window = _mark_all(" ".join(words[start : start + SNIPPET_TOKENS]), patterns)
+    return ("…" if start else "") + window + ("…" if start + SNIPPET_TOKENS < len(words) else "")
+
+
+def _search_like(
+    db: Session, terms: list[tuple[list[str], bool]], sources: tuple[ContentSource, ...], limit: int
+) -> tuple[dict[str, list[ContentHit]], dict[str, int]]:
+    patterns = _like_terms(terms)
+    hits: dict[str, list[ContentHit]] = {}
+    facets: dict[str, int] = {}
+    for source in SOURCES:
+        model = source.model
+        title = getattr(model, source.title_column)
+        body = getattr(model, source.body_column) if source.body_column else None
+        conditions = [
+            or_(func.lower(title).like(pattern), func.lower(body).like(pattern))
+            if body is not None
+            else func.lower(title).like(pattern)
+            for pattern in patterns
+        ]
+        facets[source.key] = int(db.scalar(select(func.count()).select_from(model).where(*conditions)) or 0)
+        if source not in sources:
+            continue
+        if model is AgendaItem:
+            order = (model.meeting_id.desc(), model.item_key.asc())
+        else:
+            order = (model.meeting_id.desc(), model.document_id.desc())
+        rows = db.execute(
+            select(model.id, title, body if body is not None else text("''")).where(*conditions).order_by(*order).limit(limit)
+        )
+        hits[source.key] = [
+            ContentHit(
+                row_id=row_id,
+                title=_mark_all(normalize_text(row_title or ""), patterns),
+                snippet=_like_snippet(row_body, patterns) if body is not None else "",
+                score=None,
+            )
+            for row_id, row_title, row_body in rows
+        ]
+    return hits, facets
+
+
+def search_content(
+    db: Session, q: str, *, limit: int, source_keys: tuple[str, ...] = SOURCE_KEYS
+) -> tuple[dict[str, list[ContentHit]], dict[str, int]]:
+    """Best `limit` hits per requested source, and match counts per source (all sources)."""
+    terms = parse_query(q)
+    sources = tuple(source for source in SOURCES if source.key in source_keys)
+    if not terms:
+        return {source.key: [] for source in sources}, {key: 0 for key in SOURCE_KEYS}
+    if fts_available(db):
+        return _search_fts(db, terms, sources, limit)
+    return _search_like(db, terms, sources, limit)
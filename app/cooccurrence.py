@@ -0,0 +1,144 @@
+"""
+Precomputed entity co-occurrence.
+
+For every mentioned entity, `entity_cooccurrences` stores its `RELATED_TOP_K`
+strongest neighbors at two granularities: entities mentioned in the same
+meetings and in the same agenda items. Each entity's row of the co-occurrence
+matrix is a sparse product over the mention incidence held by the graph
+snapshot (`app.graph_cache`). Graph rebuilds mark the entities of the rebuilt
+meeting stale in `entity_cooccurrence_states`. Stale entities, and entities that
+were never computed, are refreshed by `ensure_cooccurrences` at the end of each
+ingest and once by the app's startup catch-up. Reads serve the stored rows.
+"""
+from __future__ import annotations
+
+import time
+
+from sqlalchemy import delete, select
+from sqlalchemy.orm import Session
+
+from .db import UPSERT_BATCH_ROWS, SessionLocal, upsert_rows
+from .graph_cache import get_graph_snapshot
+from .models import Entity, EntityCooccurrence, EntityCooccurrenceState, EntityMention
+
+GRANULARITIES = ("meeting", "agenda_item")
+# The related endpoint's maximum limit, so stored lists answer every request exactly.
+RELATED_TOP_K = 200
+REFRESH_BATCH_ENTITIES = 200
+
+
+def mark_cooccurrences_stale(db: Session, entity_ids: set[int]) -> None:
+    """Mark entities whose mentions (or their neighbors' mentions) changed; the caller commits."""
+    now = time.time()
+    upsert_rows(
+        db,
+        EntityCooccurrenceState,
+        [{"entity_id": int(entity_id), "marked_at": now} for entity_id in sorted(entity_ids)],
+        conflict_columns=["entity_id"],
+        update_columns=["marked_at"],
+    )
+
+
+def _pending_entities(db: Session, limit: int) -> dict[int, float]:
+    """`{entity_id: marked_at}` of stale entities, then of mentioned entities never computed."""
+    stale = select(EntityCooccurrenceState.entity_id, EntityCooccurrenceState.marked_at).where(
+        EntityCooccurrenceState.marked_at > EntityCooccurrenceState.computed_at
+    )
+    missing = (
+        select(EntityMention.entity_id)
+        .outerjoin(EntityCooccurrenceState, EntityCooccurrenceState.entity_id == EntityMention.entity_id)
+        .where(EntityCooccurrenceState.entity_id.is_(None))
+        .distinct()
+    )
+    pending = dict(db.execute(stale.order_by(EntityCooccurrenceState.entity_id).limit(limit)).all())
+    if len(pending) < limit:
+        for (missing_id,) in db.execute(missing.order_by(EntityMention.entity_id).limit(limit - len(pending))):
+            pending.setdefault(missing_id, 0.0)
+    return pending
+
+
+def _top_neighbors(
+    counts: dict[int, tuple[int, int]], display_values: dict[int, str]
+) -> list[tuple[int, int, int]]:
+    ranked = sorted(
+        (other_id for other_id in counts if other_id in display_values),
+        key=lambda other_id: (-counts[other_id][1], -counts[other_id][0], display_values[other_id].lower()),
+    )
+    return [(other_id, *counts[other_id]) for other_id in ranked[:RELATED_TOP_K]]
+
+
+def _cut_candidates(counts: dict[int, tuple[int, int]]) -> list[int]:
+    """Neighbors that can still reach the top K once display values break ties."""
+    ranked = sorted(counts, key=lambda other_id: (-counts[other_id][1], -counts[other_id][0]))
+    if len(ranked) <= RELATED_TOP_K:
+        return ranked
+    cutoff = counts[ranked[RELATED_TOP_K - 1]]
+    return [other_id for other_id in ranked if (counts[other_id][1], counts[other_id][0]) >= (cutoff[1], cutoff[0])]
+
+
+def refresh_cooccurrences(db: Session, entity_ids: dict[int, float]) -> int:
+    """Recompute the stored neighbors of `{entity_id: marked_at}`; the caller commits."""
+    if not entity_ids:
+        return 0
+    snapshot = get_graph_snapshot(db)
+    matrices = {
+        (entity_id, granularity): snapshot.cooccurrences(entity_id, granularity)
+        for entity_id in entity_ids
+        for granularity in GRANULARITIES
+    }
+    candidate_ids = sorted({other_id for counts in matrices.values() for other_id in _cut_candidates(counts)})
+    display_values: dict[int, str] = {}
+    for start in range(0, len(candidate_ids), UPSERT_BATCH_ROWS):
+        rows = db.execute(
+            select(Entity.id, Entity.display_value).where(Entity.id.in_(candidate_ids[start : start + UPSERT_BATCH_ROWS]))
+        )
+        display_values.update((row_id, display or "") for row_id, display in rows)
+
+    db.execute(delete(EntityCooccurrence).where(EntityCooccurrence.entity_id.in_(list(entity_ids))))
+    upsert_rows(
+        db,
+        EntityCooccurrence,
+        [
+            {
+                "entity_id": entity_id,
+                "granularity": granularity,
+                "rank": rank,
+                "other_entity_id": other_id,
+                "cooccurrence_count": cooccurrence_count,
+                "shared_count": shared_count,
+            }
+            for (entity_id, granularity), counts in matrices.items()
+            for rank, (other_id, cooccurrence_count, shared_count) in enumerate(_top_neighbors(counts, display_values))
+        ],
+        conflict_columns=["entity_id", "granularity", "other_entity_id"],
+        update_columns=[],
+    )
+    # Computed up to the change that was read; a newer mark keeps the entity stale.
+    upsert_rows(
+        db,
+        EntityCooccurrenceState,
+        [
+            {"entity_id": entity_id, "marked_at": marked_at, "computed_at": marked_at}
+            for entity_id, marked_at in entity_ids.items()
+        ],
+        conflict_columns=["entity_id"],
+        update_columns=["computed_at"],
+    )
+    return len(entity_ids)
+
+
+def ensure_cooccurrences(db: Session) -> int:
+    """Refresh every entity that is stale or missing, committing per batch."""
+    total = 0
+    while True:
+        pending = _pending_entities(db, REFRESH_BATCH_ENTITIES)
+        if not pending:
+            return total
+        total += refresh_cooccurrences(db, pending)
+        db.commit()
+
+
+def refresh_stale_cooccurrences() -> int:
+    """Startup catch-up for entities ingested without a refresh; runs on its own session."""
+    with SessionLocal() as db:
+        return ensure_cooccurrences(db)
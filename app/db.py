@@ -1,7 +1,7 @@
 import os
 
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker, DeclarativeBase
+from sqlalchemy import create_engine, insert, select, update
+from sqlalchemy.orm import Session, sessionmaker, DeclarativeBase
 
 DB_URL = os.getenv("DATABASE_URL", "sqlite:///./civicwatch.db")
 
@@ -9,6 +9,9 @@ connect_args = {"check_same_thread": False} if DB_URL.startswith("sqlite") else
 engine = create_engine(DB_URL, connect_args=connect_args)
 SessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False)
 
+# Rows per multi-VALUES statement; keeps well under SQLite's bound-parameter limit.
+UPSERT_BATCH_ROWS = 500
+
 class Base(DeclarativeBase):
     pass
 
@@ -18,3 +21,41 @@ def get_db():
         yield db
     finally:
         db.close()
+
+def upsert_rows(db: Session, model, rows: list[dict], *, conflict_columns: list[str], update_columns: list[str]) -> None:
+    """
+    Batched INSERT ... ON CONFLICT DO UPDATE (SQLite, PostgreSQL); other dialects fall back to per-row writes.
+
+    With no `update_columns`, conflicting rows are left as they are (ON CONFLICT DO NOTHING).
+    """
+    if not rows:
+        return
+    dialect = db.get_bind().dialect.name
+    if dialect == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert as dialect_insert
+    elif dialect == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert as dialect_insert
+    else:
+        _upsert_rows_one_by_one(db, model, rows, conflict_columns=conflict_columns, update_columns=update_columns)
+        return
+
+    for start in range(0, len(rows), UPSERT_BATCH_ROWS):
+        stmt = dialect_insert(model).values(rows[start : start + UPSERT_BATCH_ROWS])
+        if update_columns:
+            stmt = stmt.on_conflict_do_update(
+                index_elements=conflict_columns,
+                set_={col: stmt.excluded[col] for col in update_columns},
+            )
+        else:
+            stmt = stmt.on_conflict_do_nothing(index_elements=conflict_columns)
+        db.execute(stmt)
+
+def _upsert_rows_one_by_one(db: Session, model, rows: list[dict], *, conflict_columns: list[str], update_columns: list[str]) -> None:
+    table = model.__table__
+    for row in rows:
+        match = [table.c[col] == row[col] for col in conflict_columns]
+        found = db.execute(select(table.c[conflict_columns[0]]).where(*match)).first()
+        if found is None:
+            db.execute(insert(table).values(**row))
+        elif update_columns:
+            db.execute(update(table).where(*match).values(**{col: row[col] for col in update_columns}))
@@ -0,0 +1,252 @@
+"""
+Interval-aware cache of CivicWeb meeting discovery.
+
+Every `list_meetings` window that ingest fetches is stored as its own coverage
+record. A later range request is assembled from the fresh windows that lie
+wholly inside it; only the uncovered gaps go to the network. A window that only
+partly overlaps the range cannot be reused, because CivicWeb's listing carries no
+per-meeting date to trim it by. Windows older than the retention period are
+deleted whenever new coverage is written.
+"""
+from __future__ import annotations
+
+import json
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta, timezone
+
+from sqlalchemy.orm import Session
+
+from .config import settings
+from .models import MeetingDiscoveryWindow
+
+
+def _utcnow_iso() -> str:
+    return datetime.now(timezone.utc).replace(microsecond=0).isoformat().replace("+00:00", "Z")
+
+
+def _parse_iso_timestamp(value: str) -> datetime | None:
+    try:
+        return datetime.fromisoformat((value or "").replace("Z", "+00:00"))
+    except ValueError:
+        return None
+
+
+def _is_fresh(row: MeetingDiscoveryWindow, cache_ttl_minutes: int) -> bool:
+    fetched_at = _parse_iso_timestamp(row.last_fetched_at)
+    if fetched_at is None:
+        return False
+    return datetime.now(fetched_at.tzinfo) - fetched_at <= timedelta(minutes=max(cache_ttl_minutes, 0))
+
+
+def window_meeting_ids(row: MeetingDiscoveryWindow) -> list[int] | None:
+    try:
+        ids_raw = json.loads(row.meeting_ids_json or "[]")
+    except json.JSONDecodeError:
+        return None
+    return [mid for mid in ids_raw if isinstance(mid, int)]
+
+
+@dataclass
+class DiscoverySegment:
+    from_date: str
+    to_date: str
+    window: MeetingDiscoveryWindow | None = None  # None: not covered, must be fetched
+    meeting_ids: list[int] = field(default_factory=list)
+
+
+@dataclass
+class DiscoveryPlan:
+    from_date: str
+    to_date: str
+    segments: list[DiscoverySegment]  # contiguous, in date order, spanning the whole range
+    stale_windows: int = 0
+
+    @property
+    def gaps(self) -> list[tuple[str, str]]:
+        return [(s.from_date, s.to_date) for s in self.segments if s.window is None]
+
+    @property
+    def cached_windows(self) -> list[MeetingDiscoveryWindow]:
+        return [s.window for s in self.segments if s.window is not None]
+
+    @property
+    def discovery_source(self) -> str:
+        if not self.gaps:
+            return "cache"
+        return "partial" if self.cached_windows else "network"
+
+    @property
+    def last_fetched_at(self) -> str:
+        """Oldest fetch time among reused windows: the staleness bound of the merged list."""
+        stamps = [w.last_fetched_at for w in self.cached_windows if w.last_fetched_at]
+        return min(stamps) if stamps else ""
+
+    def covered_days(self) -> int:
+        return sum(
+            (date.fromisoformat(s.to_date) - date.fromisoformat(s.from_date)).days + 1
+            for s in self.segments
+            if s.window is not None
+        )
+
+
+def plan_discovery(
+    db: Session,
+    from_date: str,
+    to_date: str,
+    *,
+    cache_ttl_minutes: int,
+    use_cache: bool = True,
+) -> DiscoveryPlan:
+    start = date.fromisoformat(from_date)
+    end = date.fromisoformat(to_date)
+    if end < start:
+        raise ValueError("to_date must be on or after from_date")
+
+    rows: list[MeetingDiscoveryWindow] = []
+    if use_cache:
+        rows = (
+            db.query(MeetingDiscoveryWindow)
+            .filter(
+                MeetingDiscoveryWindow.from_date >= start.isoformat(),
+                MeetingDiscoveryWindow.to_date <= end.isoformat(),
+            )
+            .order_by(MeetingDiscoveryWindow.from_date.asc(), MeetingDiscoveryWindow.to_date.desc())
+            .all()
+        )
+
+    segments: list[DiscoverySegment] = []
+    stale = 0
+    cursor = start
+    for row in rows:
+        if not _is_fresh(row, cache_ttl_minutes):
+            stale += 1
+            continue
+        ids = window_meeting_ids(row)
+        row_from = date.fromisoformat(row.from_date)
+        row_to = date.fromisoformat(row.to_date)
+        if ids is None or row_from < cursor:
+            continue  # unreadable, or overlaps a window already chosen (longest first per start day)
+        if row_from > cursor:
+            segments.append(DiscoverySegment(cursor.isoformat(), (row_from - timedelta(days=1)).isoformat()))
+        segments.append(DiscoverySegment(row.from_date, row.to_date, window=row, meeting_ids=ids))
+        cursor = row_to + timedelta(days=1)
+    if cursor <= end:
+        segments.append(DiscoverySegment(cursor.isoformat(), end.isoformat()))
+    return DiscoveryPlan(from_date=from_date, to_date=to_date, segments=segments, stale_windows=stale)
+
+
+def store_discovery_window(
+    db: Session,
+    *,
+    from_date: str,
+    to_date: str,
+    crawl: bool,
+    chunk_days: int,
+    meeting_ids: list[int],
+    fetched_at: str | None = None,
+) -> MeetingDiscoveryWindow:
+    row = (
+        db.query(MeetingDiscoveryWindow)
+        .filter(MeetingDiscoveryWindow.from_date == from_date, MeetingDiscoveryWindow.to_date == to_date)
+        .one_or_none()
+    )
+    if not row:
+        row = MeetingDiscoveryWindow(from_date=from_date, to_date=to_date)
+        db.add(row)
+
+    now = fetched_at or _utcnow_iso()
+    row.crawl = 1 if crawl else 0
+    row.chunk_days = int(chunk_days)
+    row.meeting_ids_json = json.dumps(meeting_ids, ensure_ascii=True)
+    row.discovered_count = len(meeting_ids)
+    row.last_fetched_at = now
+    row.last_used_at = now
+    return row
+
+
+def purge_expired_windows(db: Session, *, retention_hours: int | None = None) -> int:
+    hours = settings.discovery_cache_retention_hours if retention_hours is None else retention_hours
+    cutoff = (datetime.now(timezone.utc) - timedelta(hours=max(hours, 0))).replace(microsecond=0)
+    cutoff_iso = cutoff.isoformat().replace("+00:00", "Z")
+    return (
+        db.query(MeetingDiscoveryWindow)
+        .filter(MeetingDiscoveryWindow.last_fetched_at < cutoff_iso)
+        .delete(synchronize_session=False)
+    )
+
+
+def resolve_discovery(
+    db: Session,
+    plan: DiscoveryPlan,
+    fetched: list[tuple[str, str, list[int]]],
+    *,
+    crawl: bool,
+    chunk_days: int,
+) -> list[int]:
+    """
+    Record freshly fetched windows and merge every segment's IDs in date order.
+
+    `fetched` holds one `(from_date, to_date, ids)` entry per network window, in
+    date order, together covering exactly the plan's gaps. The caller commits.
+    """
+    now = _utcnow_iso()
+    for window in plan.cached_windows:
+        window.last_used_at = now
+
+    fetched_iter = iter(fetched)
+    pending = next(fetched_iter, None)
+    id_lists: list[list[int]] = []
+    for segment in plan.segments:
+        if segment.window is not None:
+            id_lists.append(segment.meeting_ids)
+            continue
+        # Consume the network windows that make up this gap.
+        while pending is not None and pending[0] <= segment.to_date:
+            w_from, w_to, ids = pending
+            store_discovery_window(
+                db,
+                from_date=w_from,
+                to_date=w_to,
+                crawl=crawl,
+                chunk_days=chunk_days,
+                meeting_ids=ids,
+                fetched_at=now,
+            )
+            id_lists.append(ids)
+            pending = next(fetched_iter, None)
+
+    purge_expired_windows(db)
+    db.flush()
+
+    merged: list[int] = []
+    seen: set[int] = set()
+    for ids in id_lists:
+        for mid in ids:
+            if mid not in seen:
+                seen.add(mid)
+                merged.append(mid)
+    return merged
+
+
+def coverage_status(db: Session, from_date: str, to_date: str, *, cache_ttl_minutes: int) -> dict:
+    plan = plan_discovery(db, from_date, to_date, cache_ttl_minutes=cache_ttl_minutes)
+    total_days = (date.fromisoformat(to_date) - date.fromisoformat(from_date)).days + 1
+    covered_days = plan.covered_days()
+    ids: set[int] = set()
+    for segment in plan.segments:
+        ids.update(segment.meeting_ids)
+    cached = plan.cached_windows
+    return {
+        "has_cache": bool(cached) or plan.stale_windows > 0,
+        "cache_fresh": not plan.gaps,
+        "coverage": "full" if not plan.gaps else ("partial" if cached else "none"),
+        "covered_days": covered_days,
+        "total_days": total_days,
+        "uncovered_ranges": [{"from_date": f, "to_date": t} for f, t in plan.gaps],
+        "cached_window_count": len(cached),
+        "stale_window_count": plan.stale_windows,
+        "discovered_count": len(ids),
+        "last_fetched_at": plan.last_fetched_at,
+        "last_used_at": max((w.last_used_at or "" for w in cached), default=""),
+        "cache_ttl_minutes": cache_ttl_minutes,
+    }
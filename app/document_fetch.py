@@ -0,0 +1,116 @@
+from __future__ import annotations
+
+import asyncio
+from dataclasses import dataclass, field
+
+from .blob_cache import BlobCache, CachedBlob, get_blob_cache
+from .config import settings
+from .http_client import get_async_client, http_get
+from .pdf_worker import PdfSummary, parse_pdf
+from .utils.text import normalize_text
+
+
+@dataclass
+class FetchedDocument:
+    """One attachment download, shared by every extractor that needs its bytes."""
+
+    url: str
+    status: str  # ok, missing_url, download_failed
+    content_type: str = ""
+    body: bytes = b""
+    from_cache: bool = False
+    _pdf: PdfSummary | None = field(default=None, repr=False)
+
+    @property
+    def ok(self) -> bool:
+        return self.status == "ok"
+
+    def pdf(self) -> PdfSummary:
+        # Parse lazily and at most once, reading enough pages for every consumer.
+        if self._pdf is None:
+            self._pdf = parse_pdf(self.body)
+        return self._pdf
+
+
+def _from_cache(url: str, cached: CachedBlob, body: bytes) -> FetchedDocument:
+    return FetchedDocument(
+        url=url,
+        status="ok",
+        content_type=cached.content_type,
+        body=body,
+        from_cache=True,
+    )
+
+
+def _from_response(url: str, response, cache: BlobCache | None) -> FetchedDocument:
+    content_type = normalize_text(response.headers.get("content-type", "").split(";")[0].strip().lower())
+    body = response.content or b""
+    if cache is not None:
+        etag = response.headers.get("etag", "") or ""
+        last_modified = response.headers.get("last-modified", "") or ""
+        if etag or last_modified:
+            cache.store(
+                url,
+                body,
+                content_type=content_type,
+                etag=etag,
+                last_modified=last_modified,
+            )
+    return FetchedDocument(
+        url=url,
+        status="ok",
+        content_type=content_type,
+        body=body,
+    )
+
+
+def fetch_document(url: str) -> FetchedDocument:
+    normalized_url = normalize_text(url)
+    if not normalized_url:
+        return FetchedDocument(url="", status="missing_url")
+
+    cache = get_blob_cache()
+    cached = cache.lookup(normalized_url) if cache else None
+    try:
+        response = http_get(
+            normalized_url,
+            timeout=settings.http_document_timeout_seconds,
+            headers=cached.conditional_headers() if cached else None,
+        )
+        if cached is not None and getattr(response, "status_code", 200) == 304:
+            body = cache.read(cached)
+            if body is not None:
+                return _from_cache(normalized_url, cached, body)
+            # Blob vanished between lookup and read; fall back to an unconditional GET.
+            response = http_get(normalized_url, timeout=settings.http_document_timeout_seconds)
+        response.raise_for_status()
+        return _from_response(normalized_url, response, cache)
+    except Exception:
+        return FetchedDocument(url=normalized_url, status="download_failed")
+
+
+async def fetch_document_async(url: str) -> FetchedDocument:
+    """`fetch_document` on the shared async client; cache disk I/O runs off the event loop."""
+    normalized_url = normalize_text(url)
+    if not normalized_url:
+        return FetchedDocument(url="", status="missing_url")
+
+    cache = get_blob_cache()
+    cached = await asyncio.to_thread(cache.lookup, normalized_url) if cache else None
+    client = get_async_client()
+    timeout = settings.http_document_timeout_seconds
+    try:
+        response = await client.get(
+            normalized_url,
+            timeout=timeout,
+            headers=cached.conditional_headers() if cached else None,
+        )
+        if cached is not None and response.status_code == 304:
+            body = await asyncio.to_thread(cache.read, cached)
+            if body is not None:
+                return _from_cache(normalized_url, cached, body)
+            response = await client.get(normalized_url, timeout=timeout)
+        response.raise_for_status()
+        return await asyncio.to_thread(_from_response, normalized_url, response, cache)
+    except Exception:
+        return FetchedDocument(url=normalized_url, status="download_failed")
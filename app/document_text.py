@@ -1,30 +1,17 @@
-import io
-
-import requests
 from bs4 import BeautifulSoup
 from sqlalchemy.orm import Session
 
+from .document_fetch import FetchedDocument, fetch_document
 from .models import DocumentTextExtraction
+from .pdf_worker import PDF_TEXT_PAGES, PdfSummary
 from .utils.text import normalize_text
 
 
-def _extract_pdf_text(pdf_bytes: bytes) -> tuple[str, str]:
-    try:
-        from pypdf import PdfReader  # optional dependency
-    except Exception:
-        return "", "pdf_parser_unavailable"
-
-    try:
-        reader = PdfReader(io.BytesIO(pdf_bytes))
-        parts: list[str] = []
-        for page in reader.pages[:8]:
-            txt = normalize_text(page.extract_text() or "")
-            if txt:
-                parts.append(txt)
-        text = normalize_text(" ".join(parts))
-        return text, "ok"
-    except Exception:
-        return "", "pdf_parse_failed"
+def _extract_pdf_text(pdf: PdfSummary) -> tuple[str, str]:
+    if not pdf.pages_ok(PDF_TEXT_PAGES):
+        return "", pdf.status if pdf.status != "ok" else "pdf_parse_failed"
+    text = normalize_text(" ".join(txt for txt in pdf.page_texts[:PDF_TEXT_PAGES] if txt))
+    return text, "ok"
 
 
 def _extract_html_text(html_text: str) -> str:
@@ -34,7 +21,7 @@ def _extract_html_text(html_text: str) -> str:
     return normalize_text(soup.get_text(" ", strip=True))
 
 
-def extract_document_text(title: str, url: str) -> dict[str, str | int]:
+def extract_document_text(title: str, url: str, fetched: FetchedDocument | None = None) -> dict[str, str | int]:
     normalized_title = normalize_text(title)
     normalized_url = normalize_text(url)
     if not normalized_url:
@@ -45,10 +32,9 @@ def extract_document_text(title: str, url: str) -> dict[str, str | int]:
             "status": "missing_url",
         }
 
-    try:
-        response = requests.get(normalized_url, timeout=20)
-        response.raise_for_status()
-    except Exception:
+    if fetched is None:
+        fetched = fetch_document(normalized_url)
+    if not fetched.ok:
         return {
             "content_type": "",
             "text_excerpt": "",
@@ -56,13 +42,13 @@ def extract_document_text(title: str, url: str) -> dict[str, str | int]:
             "status": "download_failed",
         }
 
-    content_type = normalize_text(response.headers.get("content-type", "").split(";")[0].strip().lower())
-    body = response.content or b""
+    content_type = fetched.content_type
+    body = fetched.body
     text = ""
     status = "unsupported_content"
 
     if "pdf" in content_type or normalized_url.lower().endswith(".pdf"):
-        text, status = _extract_pdf_text(body)
+        text, status = _extract_pdf_text(fetched.pdf())
     else:
         decoded = ""
         for enc in ("utf-8", "latin-1"):
@@ -97,6 +83,29 @@ def extract_document_text(title: str, url: str) -> dict[str, str | int]:
     }
 
 
+def document_text_values(
+    *,
+    meeting_id: int,
+    document_id: int,
+    title: str,
+    url: str,
+    extracted: dict[str, str | int] | None = None,
+) -> dict:
+    """Column values for a `DocumentTextExtraction` row."""
+    if extracted is None:
+        extracted = extract_document_text(title=title, url=url)
+    return {
+        "meeting_id": meeting_id,
+        "document_id": document_id,
+        "title": normalize_text(title),
+        "url": normalize_text(url),
+        "content_type": str(extracted.get("content_type") or ""),
+        "text_excerpt": str(extracted.get("text_excerpt") or ""),
+        "text_length": int(extracted.get("text_length") or 0),
+        "status": str(extracted.get("status") or "unknown"),
+    }
+
+
 def upsert_document_text_extraction_from_document(
     db: Session,
     *,
@@ -104,7 +113,15 @@ def upsert_document_text_extraction_from_document(
     document_id: int,
     title: str,
     url: str,
+    extracted: dict[str, str | int] | None = None,
 ) -> DocumentTextExtraction:
+    values = document_text_values(
+        meeting_id=meeting_id,
+        document_id=document_id,
+        title=title,
+        url=url,
+        extracted=extracted,
+    )
     row = (
         db.query(DocumentTextExtraction)
         .filter(
@@ -117,11 +134,6 @@ def upsert_document_text_extraction_from_document(
         row = DocumentTextExtraction(meeting_id=meeting_id, document_id=document_id)
         db.add(row)
 
-    extracted = extract_document_text(title=title, url=url)
-    row.title = normalize_text(title)
-    row.url = normalize_text(url)
-    row.content_type = str(extracted.get("content_type") or "")
-    row.text_excerpt = str(extracted.get("text_excerpt") or "")
-    row.text_length = int(extracted.get("text_length") or 0)
-    row.status = str(extracted.get("status") or "unknown")
+    for key, value in values.items():
+        setattr(row, key, value)
     return row
@@ -1,8 +1,12 @@
 import re
 from datetime import datetime
 
+from sqlalchemy import event, select, update
 from sqlalchemy.orm import Session
 
+from .db import UPSERT_BATCH_ROWS, upsert_rows
+from .entity_index import mark_entity_values_changed
+from .graph_cache import mark_graph_changed
 from .models import (
     Entity,
     EntityAlias,
@@ -52,8 +56,34 @@ PERSON_ROLE_TRAIL_WORDS = {
 }
 
 
+MONTH_NAMES = (
+    "january",
+    "february",
+    "march",
+    "april",
+    "may",
+    "june",
+    "july",
+    "august",
+    "september",
+    "october",
+    "november",
+    "december",
+)
+PERSON_TITLE_ANCHORS = ("mayor", "council", "chair", "commissioner", "manager", "director")
+ORG_SUFFIX_ANCHORS = ("LLC", "Inc", "Company", "Corp")
+DIGIT_PATTERN = re.compile(r"\d")
+WORD_BOUNDARY = re.compile(r"\b")
+# Literal tails every date / organization match must contain; see `_anchored_finditer`.
+DATE_TAIL_ANCHOR = re.compile(r"\d{1,2},\s+\d{4}")
+ORG_SUFFIX_ANCHOR = re.compile(r"\s(?:LLC|Inc|Company|Corp)")
+DATE_MAX_LEAD_CHARS = 12  # longest month name, the space after it, and slack
+ORG_MAX_LEAD_SPACES = 8  # up to eight capitalized words before the suffix
+
+
 def _normalize_entity_value(entity_type: str, value: str) -> tuple[str, str]:
-    raw = normalize_text(value)
+    # `value` comes from already normalized text, so only the span edges need trimming.
+    raw = value.strip()
     if entity_type == "date":
         try:
             return raw, datetime.strptime(raw, "%B %d, %Y").date().isoformat()
@@ -66,25 +96,53 @@ def _normalize_entity_value(entity_type: str, value: str) -> tuple[str, str]:
     if entity_type == "address":
         return raw, raw.lower()
     if entity_type == "organization":
-        return raw, re.sub(r"\s+", " ", raw).strip().lower()
+        return raw, raw.lower()
     if entity_type == "person":
-        return raw, re.sub(r"\s+", " ", raw).strip().lower()
+        return raw, raw.lower()
     return raw, raw.lower()
 
 
 def _clean_person_name(name: str) -> str:
-    name = normalize_text(name)
     parts = name.split()
     while parts and parts[-1].lower().rstrip(".,") in PERSON_ROLE_TRAIL_WORDS:
         parts.pop()
     return " ".join(parts)
 
 
-def extract_entities_from_text(text: str) -> list[dict[str, str]]:
-    normalized = normalize_text(text)
-    if not normalized:
-        return []
+def _date_window_start(text: str, anchor_start: int) -> int:
+    return max(anchor_start - DATE_MAX_LEAD_CHARS, 0)
+
+
+def _org_window_start(text: str, anchor_start: int) -> int:
+    # Normalized text has single spaces, so the organization name starts after at most this many.
+    start = anchor_start
+    for _ in range(ORG_MAX_LEAD_SPACES):
+        start = text.rfind(" ", 0, start)
+        if start < 0:
+            return 0
+    return start + 1
+
+
+def _anchored_finditer(pattern: re.Pattern, anchor: re.Pattern, text: str, window_start):
+    """
+    Yield exactly the matches of `pattern.finditer(text)`, skipping the text between anchors.
+
+    Every match of `pattern` contains an `anchor` match and starts no earlier than
+    `window_start(text, anchor.start())`, so each search can begin at the window of
+    the next unconsumed anchor instead of trying every position before it.
+    """
+    pos = 0
+    for a in anchor.finditer(text):
+        if a.start() < pos:
+            continue
+        m = pattern.search(text, max(pos, window_start(text, a.start())))
+        if m is None:
+            return
+        yield m
+        pos = m.end()
 
+
+def _extract_from_normalized(normalized: str) -> list[dict[str, str]]:
     found: list[dict[str, str]] = []
     seen: set[tuple[str, str]] = set()
 
@@ -99,146 +157,347 @@ def extract_entities_from_text(text: str) -> list[dict[str, str]]:
                 "entity_type": entity_type,
                 "display_value": display,
                 "normalized_value": normalized_value,
-                "mention_text": normalize_text(match_text),
+                "mention_text": display,
             }
         )
 
-    for m in DATE_PATTERN.finditer(normalized):
-        add("date", m.group(0))
-    for m in ZIP_PATTERN.finditer(normalized):
-        add("zip_code", m.group(0))
-
-    for m in ADDRESS_PATTERN.finditer(normalized):
-        candidate = m.group(0)
-        # Guard against ordinance/resolution tails like "... 2026-14 for 10841 Douglas Avenue"
-        # by re-anchoring to the last street-number phrase inside the matched span.
-        if re.search(r"\bfor\s+\d", candidate, re.IGNORECASE):
-            parts = re.split(r"\bfor\b", candidate, flags=re.IGNORECASE)
-            if parts:
-                maybe = normalize_text(parts[-1])
-                if re.match(r"^\d{1,6}\b", maybe):
-                    candidate = maybe
-        add("address", candidate)
-
-    for m in ORDINANCE_PATTERN.finditer(normalized):
-        add("ordinance_number", m.group(1))
-
-    for m in RESOLUTION_PATTERN.finditer(normalized):
-        add("resolution_number", m.group(1))
-
-    for m in ORG_PATTERN.finditer(normalized):
-        add("organization", m.group(1))
-
-    for m in PERSON_PREFIX_TITLED_PATTERN.finditer(normalized):
-        person = _clean_person_name(m.group(1))
-        if person.count(" ") >= 1:
-            add("person", person)
-    for m in PERSON_SUFFIX_TITLED_PATTERN.finditer(normalized):
-        person = _clean_person_name(m.group(1))
-        if person.count(" ") >= 1:
-            add("person", person)
+    # Cheap anchor checks decide which patterns can match at all; most titles and
+    # excerpts skip the expensive organization and person scans entirely.
+    lowered = normalized.lower()
+    has_digit = DIGIT_PATTERN.search(normalized) is not None
+
+    if has_digit and any(month in lowered for month in MONTH_NAMES):
+        for m in _anchored_finditer(DATE_PATTERN, DATE_TAIL_ANCHOR, normalized, _date_window_start):
+            add("date", m.group(0))
+    if has_digit:
+        for m in ZIP_PATTERN.finditer(normalized):
+            add("zip_code", m.group(0))
+
+        for m in ADDRESS_PATTERN.finditer(normalized):
+            candidate = m.group(0)
+            # Guard against ordinance/resolution tails like "... 2026-14 for 10841 Douglas Avenue"
+            # by re-anchoring to the last street-number phrase inside the matched span.
+            if re.search(r"\bfor\s+\d", candidate, re.IGNORECASE):
+                parts = re.split(r"\bfor\b", candidate, flags=re.IGNORECASE)
+                if parts:
+                    maybe = parts[-1].strip()
+                    if re.match(r"^\d{1,6}\b", maybe):
+                        candidate = maybe
+            add("address", candidate)
+
+        if "ordinance" in lowered:
+            for m in ORDINANCE_PATTERN.finditer(normalized):
+                add("ordinance_number", m.group(1))
+
+        if "resolution" in lowered:
+            for m in RESOLUTION_PATTERN.finditer(normalized):
+                add("resolution_number", m.group(1))
+
+    if any(suffix in normalized for suffix in ORG_SUFFIX_ANCHORS):
+        for m in _anchored_finditer(ORG_PATTERN, ORG_SUFFIX_ANCHOR, normalized, _org_window_start):
+            add("organization", m.group(1))
+
+    if any(title in lowered for title in PERSON_TITLE_ANCHORS):
+        for m in PERSON_PREFIX_TITLED_PATTERN.finditer(normalized):
+            person = _clean_person_name(m.group(1))
+            if person.count(" ") >= 1:
+                add("person", person)
+        for m in PERSON_SUFFIX_TITLED_PATTERN.finditer(normalized):
+            person = _clean_person_name(m.group(1))
+            if person.count(" ") >= 1:
+                add("person", person)
 
     return found
 
 
-def _upsert_entity(db: Session, entity_type: str, display_value: str, normalized_value: str) -> Entity:
-    row = (
-        db.query(Entity)
-        .filter(Entity.entity_type == entity_type, Entity.normalized_value == normalized_value)
-        .one_or_none()
-    )
-    if not row:
-        row = Entity(entity_type=entity_type, display_value=display_value, normalized_value=normalized_value)
-        db.add(row)
-        db.flush()
-    elif not row.display_value:
-        row.display_value = display_value
-    if entity_type == "person":
-        _upsert_entity_alias(
-            db,
-            entity_id=row.id,
-            alias_text=row.display_value or display_value,
-            source="person_seed",
-            confidence=1.0,
-        )
-    _upsert_entity_kind_record(db, row)
-    return row
+def extract_entities_from_text(text: str) -> list[dict[str, str]]:
+    normalized = normalize_text(text)
+    if not normalized:
+        return []
+    return _extract_from_normalized(normalized)
+
+
+def extract_entities_from_texts(texts: list[str]) -> list[list[dict[str, str]]]:
+    """
+    Batch form of `extract_entities_from_text`, one result list per input text.
+
+    Texts that normalize to the same string (repeated attachment titles such as
+    "Staff Report") are scanned once and share one result list, so callers must
+    not mutate the returned lists.
+    """
+    by_text: dict[str, list[dict[str, str]]] = {}
+    results: list[list[dict[str, str]]] = []
+    for text in texts:
+        normalized = normalize_text(text)
+        if normalized not in by_text:
+            by_text[normalized] = _extract_from_normalized(normalized) if normalized else []
+        results.append(by_text[normalized])
+    return results
+
+
+def _entity_key(ent: dict[str, str]) -> tuple[str, str]:
+    return (ent["entity_type"], ent["normalized_value"])
 
 
-def _upsert_entity_kind_record(db: Session, entity: Entity) -> None:
-    etype = (entity.entity_type or "").lower()
-    display = normalize_text(entity.display_value or "")
+def _entity_kind_values(entity_id: int, entity_type: str, display_value: str, normalized_value: str):
+    """Return `(kind model, desired row values)` for types that carry a kind row, else None."""
+    etype = (entity_type or "").lower()
+    display = normalize_text(display_value or "")
 
     if etype == "person":
         parts = display.split()
-        first_name = parts[0] if parts else ""
-        last_name = parts[-1] if len(parts) >= 2 else ""
-        row = db.query(EntityPerson).filter(EntityPerson.entity_id == entity.id).one_or_none()
-        if not row:
-            row = EntityPerson(entity_id=entity.id)
-            db.add(row)
-        row.full_name = display
-        row.first_name = first_name
-        row.last_name = last_name
-        return
-
+        return EntityPerson, {
+            "entity_id": entity_id,
+            "full_name": display,
+            "first_name": parts[0] if parts else "",
+            "last_name": parts[-1] if len(parts) >= 2 else "",
+        }
     if etype == "address":
-        row = db.query(EntityPlace).filter(EntityPlace.entity_id == entity.id).one_or_none()
-        if not row:
-            row = EntityPlace(entity_id=entity.id)
-            db.add(row)
-        row.address_text = display
-        if not row.state_hint:
-            row.state_hint = "Iowa"
-        return
-
+        # state_hint is filled in below, keeping any hint already on the row.
+        return EntityPlace, {"entity_id": entity_id, "address_text": display}
     if etype == "organization":
-        row = db.query(EntityOrganization).filter(EntityOrganization.entity_id == entity.id).one_or_none()
-        if not row:
-            row = EntityOrganization(entity_id=entity.id)
-            db.add(row)
-        row.name_text = display
         suffix_match = re.search(r"\b(LLC|Inc\.?|Company|Corp\.?|Corporation)\b$", display, re.IGNORECASE)
-        row.legal_suffix = suffix_match.group(1) if suffix_match else ""
-        return
-
+        return EntityOrganization, {
+            "entity_id": entity_id,
+            "name_text": display,
+            "legal_suffix": suffix_match.group(1) if suffix_match else "",
+        }
     if etype == "date":
-        row = db.query(EntityDateValue).filter(EntityDateValue.entity_id == entity.id).one_or_none()
-        if not row:
-            row = EntityDateValue(entity_id=entity.id)
-            db.add(row)
-        row.date_iso = normalize_text(entity.normalized_value or "")
-        row.label_text = display
+        return EntityDateValue, {
+            "entity_id": entity_id,
+            "date_iso": normalize_text(normalized_value or ""),
+            "label_text": display,
+        }
+    return None
+
+
+def _in_chunks(values: list, size: int = UPSERT_BATCH_ROWS):
+    for start in range(0, len(values), size):
+        yield values[start : start + size]
+
+
+class EntityResolver:
+    """
+    Ingest-scoped identity map from `(entity_type, normalized_value)` to entity id.
+
+    Each distinct entity is looked up once per session; new entities, person seed
+    aliases and kind rows are written with set-based upserts, and kind rows are
+    only rewritten when their values change. Use `entity_resolver(db)` to get the
+    session's instance; it is dropped when the session rolls back.
+    """
+
+    def __init__(self) -> None:
+        self._ids: dict[tuple[str, str], int] = {}
+
+    def resolve(self, db: Session, entities: list[dict[str, str]]) -> dict[tuple[str, str], int]:
+        wanted: dict[tuple[str, str], str] = {}
+        for ent in entities:
+            key = _entity_key(ent)
+            if key not in self._ids and key not in wanted:
+                wanted[key] = ent["display_value"]
+        if wanted:
+            self._load(db, wanted)
+        return {_entity_key(ent): self._ids[_entity_key(ent)] for ent in entities}
+
+    def _select(self, db: Session, keys: list[tuple[str, str]]) -> dict[tuple[str, str], tuple[int, str]]:
+        by_type: dict[str, list[str]] = {}
+        for entity_type, normalized_value in keys:
+            by_type.setdefault(entity_type, []).append(normalized_value)
+        found: dict[tuple[str, str], tuple[int, str]] = {}
+        for entity_type, values in by_type.items():
+            for chunk in _in_chunks(values):
+                rows = db.execute(
+                    select(Entity.id, Entity.normalized_value, Entity.display_value).where(
+                        Entity.entity_type == entity_type, Entity.normalized_value.in_(chunk)
+                    )
+                )
+                for entity_id, normalized_value, display_value in rows:
+                    found[(entity_type, normalized_value)] = (entity_id, display_value or "")
+        return found
+
+    def _load(self, db: Session, wanted: dict[tuple[str, str], str]) -> None:
+        found = self._select(db, list(wanted))
+        missing = [key for key in wanted if key not in found]
+        if missing:
+            upsert_rows(
+                db,
+                Entity,
+                [
+                    {"entity_type": etype, "display_value": wanted[(etype, value)], "normalized_value": value}
+                    for etype, value in missing
+                ],
+                conflict_columns=["entity_type", "normalized_value"],
+                update_columns=[],
+            )
+            found.update(self._select(db, missing))
+
+        entities: list[tuple[int, str, str, str]] = []
+        for key, (entity_id, display_value) in found.items():
+            if not display_value and wanted[key]:
+                display_value = wanted[key]
+                db.execute(update(Entity).where(Entity.id == entity_id).values(display_value=display_value))
+                mark_entity_values_changed(db, [entity_id])
+            entities.append((entity_id, key[0], display_value, key[1]))
+            self._ids[key] = entity_id
+
+        _sync_person_seed_aliases(db, entities)
+        sync_entity_kind_records(db, entities)
+
+
+def _sync_person_seed_aliases(db: Session, entities: list[tuple[int, str, str, str]]) -> None:
+    """Register each person's display name as a confirmed alias for later snowball matching."""
+    seeds: dict[tuple[int, str], str] = {}
+    for entity_id, entity_type, display_value, _normalized in entities:
+        alias_text = normalize_text(display_value)
+        if entity_type == "person" and alias_text:
+            seeds[(entity_id, alias_text.lower())] = alias_text
+    if not seeds:
         return
+    existing: set[tuple[int, str]] = set()
+    for chunk in _in_chunks(sorted({entity_id for entity_id, _alias in seeds})):
+        rows = db.execute(
+            select(EntityAlias.entity_id, EntityAlias.normalized_alias).where(EntityAlias.entity_id.in_(chunk))
+        )
+        existing.update((entity_id, normalized_alias) for entity_id, normalized_alias in rows)
+    new_aliases = [
+        {
+            "entity_id": entity_id,
+            "alias_text": alias_text,
+            "normalized_alias": normalized_alias,
+            "source": "person_seed",
+            "confidence": 1.0,
+        }
+        for (entity_id, normalized_alias), alias_text in seeds.items()
+        if (entity_id, normalized_alias) not in existing
+    ]
+    upsert_rows(db, EntityAlias, new_aliases, conflict_columns=["entity_id", "normalized_alias"], update_columns=[])
+    matcher = db.info.get("person_alias_matcher")
+    if matcher is not None:
+        for alias in new_aliases:
+            matcher.add(alias["entity_id"], alias["alias_text"])
+
+
+def sync_entity_kind_records(db: Session, entities: list[tuple[int, str, str, str]]) -> int:
+    """
+    Bring kind rows (people, places, organizations, dates) in line with their entities.
+
+    `entities` holds `(entity_id, entity_type, display_value, normalized_value)`.
+    Existing kind rows are read once per kind table and only rows whose values
+    differ are upserted. Returns the number of rows written.
+    """
+    desired: dict[type, dict[int, dict]] = {}
+    for entity_id, entity_type, display_value, normalized_value in entities:
+        kind = _entity_kind_values(entity_id, entity_type, display_value, normalized_value)
+        if kind is not None:
+            model, values = kind
+            desired.setdefault(model, {})[entity_id] = values
+
+    written = 0
+    for model, by_entity in desired.items():
+        columns = [col for col in model.__table__.c.keys() if col not in ("id", "entity_id")]
+        existing: dict[int, dict] = {}
+        for chunk in _in_chunks(sorted(by_entity)):
+            rows = db.execute(select(model.__table__).where(model.__table__.c.entity_id.in_(chunk)))
+            for row in rows.mappings():
+                existing[row["entity_id"]] = dict(row)
+
+        changed: list[dict] = []
+        for entity_id, values in by_entity.items():
+            current = existing.get(entity_id)
+            if model is EntityPlace:
+                values["state_hint"] = (current or {}).get("state_hint") or "Iowa"
+            if current is not None and all(current.get(col) == value for col, value in values.items()):
+                continue
+            changed.append(values)
+        update_columns = [col for col in columns if changed and col in changed[0]]
+        upsert_rows(db, model, changed, conflict_columns=["entity_id"], update_columns=update_columns)
+        written += len(changed)
+    return written
+
+
+def entity_resolver(db: Session) -> EntityResolver:
+    resolver = db.info.get("entity_resolver")
+    if resolver is None:
+        resolver = db.info["entity_resolver"] = EntityResolver()
+    return resolver
+
+
+class PersonAliasMatcher:
+    """
+    All known person aliases compiled into one case-insensitive alternation.
+
+    The alternation finds every word boundary where some alias starts, so a text
+    is scanned once however many aliases exist. At each such start, every alias
+    length is checked, so aliases that share a start ("John Smith Jr" and "John
+    Smith") are all reported. New aliases mark the pattern stale and it is
+    recompiled on the next scan.
+    """
+
+    def __init__(self) -> None:
+        self._aliases: dict[str, dict[int, str]] = {}  # lowercased alias -> {entity_id: alias_text}
+        self._lengths: list[int] = []  # distinct alias lengths, longest first
+        self._pattern: re.Pattern | None = None
+        self._stale = False
+
+    def __len__(self) -> int:
+        return sum(len(entities) for entities in self._aliases.values())
+
+    def add(self, entity_id: int, alias_text: str) -> None:
+        alias_text = normalize_text(alias_text)
+        if not alias_text:
+            return
+        entities = self._aliases.setdefault(alias_text.lower(), {})
+        if entity_id not in entities:
+            entities[entity_id] = alias_text
+            self._stale = True
+
+    def _compiled(self) -> re.Pattern | None:
+        if self._stale or (self._pattern is None and self._aliases):
+            alternation = "|".join(re.escape(alias) for alias in sorted(self._aliases, key=lambda a: (-len(a), a)))
+            # Zero-width lookahead so matches may overlap (e.g. "Robert D. Andeweg" and "D. Andeweg").
+            self._pattern = re.compile(rf"(?=\b({alternation})\b)", re.IGNORECASE)
+            self._lengths = sorted({len(alias) for alias in self._aliases}, reverse=True)
+            self._stale = False
+        return self._pattern
+
+    def find(self, text: str) -> list[tuple[int, str]]:
+        """Return `(entity_id, alias_text)` for each alias found in `text`, in order of first occurrence."""
+        pattern = self._compiled()
+        if pattern is None or not text:
+            return []
+        found: dict[tuple[int, str], None] = {}
+        for match in pattern.finditer(text):
+            start = match.start()
+            # The match is the longest alias starting here; shorter ones may also end on a word boundary.
+            for length in self._lengths:
+                entities = self._aliases.get(text[start : start + length].lower())
+                if entities and WORD_BOUNDARY.match(text, start + length):
+                    for entity_id, alias_text in entities.items():
+                        found.setdefault((entity_id, alias_text), None)
+        return list(found)
+
+
+def person_alias_matcher(db: Session) -> PersonAliasMatcher:
+    """The session's alias matcher, loaded from the database on first use and kept current by new seeds."""
+    matcher = db.info.get("person_alias_matcher")
+    if matcher is None:
+        matcher = PersonAliasMatcher()
+        rows = db.execute(
+            select(EntityAlias.entity_id, EntityAlias.alias_text)
+            .join(Entity, Entity.id == EntityAlias.entity_id)
+            .where(Entity.entity_type == "person")
+        )
+        for entity_id, alias_text in rows:
+            matcher.add(entity_id, alias_text)
+        db.info["person_alias_matcher"] = matcher
+    return matcher
 
 
-def _upsert_entity_alias(
-    db: Session,
-    *,
-    entity_id: int,
-    alias_text: str,
-    source: str,
-    confidence: float,
-) -> EntityAlias | None:
-    alias_text = normalize_text(alias_text)
-    if not alias_text:
-        return None
-    normalized_alias = alias_text.lower()
-    row = (
-        db.query(EntityAlias)
-        .filter(EntityAlias.entity_id == entity_id, EntityAlias.normalized_alias == normalized_alias)
-        .one_or_none()
-    )
-    if not row:
-        row = EntityAlias(
-            entity_id=entity_id,
-            alias_text=alias_text,
-            normalized_alias=normalized_alias,
-            source=source,
-            confidence=confidence,
-        )
-        db.add(row)
-    return row
+@event.listens_for(Session, "after_soft_rollback")
+def _drop_entity_caches(session: Session, _previous_transaction) -> None:
+    # Ids and aliases cached during the rolled-back transaction may belong to rows that were never committed.
+    session.info.pop("entity_resolver", None)
+    session.info.pop("person_alias_matcher", None)
 
 
 def _add_person_alias_mentions(
@@ -256,12 +515,9 @@ def _add_person_alias_mentions(
     if not text:
         return []
 
-    aliases = (
-        db.query(EntityAlias, Entity)
-        .join(Entity, Entity.id == EntityAlias.entity_id)
-        .filter(Entity.entity_type == "person")
-        .all()
-    )
+    matches = person_alias_matcher(db).find(text)
+    if not matches:
+        return []
     mentions: list[EntityMention] = []
     existing_keys = set(existing_keys or set())
     existing_keys.update(
@@ -274,17 +530,12 @@ def _add_person_alias_mentions(
         )
         }
     )
-    for alias, entity in aliases:
-        alias_text = normalize_text(alias.alias_text)
-        if not alias_text:
-            continue
-        if not re.search(rf"\b{re.escape(alias_text)}\b", text, re.IGNORECASE):
-            continue
-        key = (entity.id, alias_text.lower())
+    for entity_id, alias_text in matches:
+        key = (entity_id, alias_text.lower())
         if key in existing_keys:
             continue
         mention = EntityMention(
-            entity_id=entity.id,
+            entity_id=entity_id,
             meeting_id=meeting_id,
             agenda_item_id=agenda_item_id,
             document_id=document_id,
@@ -311,6 +562,7 @@ def replace_entity_mentions_for_source(
     agenda_item_id: int | None = None,
     document_id: int | None = None,
 ) -> list[EntityMention]:
+    mark_graph_changed(db)
     (
         db.query(EntityMention)
         .filter(EntityMention.source_type == source_type, EntityMention.source_id == source_id)
@@ -320,19 +572,15 @@ def replace_entity_mentions_for_source(
     mentions: list[EntityMention] = []
     context = normalize_text(context_text)[:2000]
     current_source_keys: set[tuple[int, str]] = set()
+    entity_ids = entity_resolver(db).resolve(db, entities)
     for ent in entities:
-        entity = _upsert_entity(
-            db,
-            entity_type=ent["entity_type"],
-            display_value=ent["display_value"],
-            normalized_value=ent["normalized_value"],
-        )
+        entity_id = entity_ids[_entity_key(ent)]
         mention_text = normalize_text(ent["mention_text"])
-        key = (entity.id, mention_text.lower())
+        key = (entity_id, mention_text.lower())
         if key in current_source_keys:
             continue
         mention = EntityMention(
-            entity_id=entity.id,
+            entity_id=entity_id,
             meeting_id=meeting_id,
             agenda_item_id=agenda_item_id,
             document_id=document_id,
@@ -367,7 +615,9 @@ def backfill_entity_kind_records(db: Session, *, limit: int | None = None) -> di
     if limit is not None and int(limit) > 0:
         q = q.limit(int(limit))
     rows = q.all()
-    for entity in rows:
-        _upsert_entity_kind_record(db, entity)
+    upserted = sync_entity_kind_records(
+        db,
+        [(row.id, row.entity_type, row.display_value, row.normalized_value) for row in rows],
+    )
     db.commit()
-    return {"processed": len(rows), "upserted": len(rows)}
+    return {"processed": len(rows), "upserted": upserted}
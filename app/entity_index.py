@@ -0,0 +1,293 @@
+"""
+In-memory trigram and prefix index over entity display values and aliases.
+
+`/entities/suggest` and `/entities/search` used to scan entity rows (the 5,000
+newest, or the whole table through an unindexable `LIKE`). They now read one
+index per database holding every display value and alias: trigram posting
+lists for fuzzy and substring matching, and a sorted list of texts for prefix
+matching. Suggest counts the shared trigrams of every candidate by merging the
+query's posting lists, so only the best `SUGGEST_POOL` candidates are scored
+with the full fuzzy score.
+
+The index is updated incrementally. Each read first picks up entities and
+aliases with ids above the index's watermarks. Writers that change the display
+value of an existing entity flag it with `mark_entity_values_changed`, and
+their commit queues those entities for re-indexing.
+"""
+from __future__ import annotations
+
+import bisect
+import difflib
+import heapq
+import threading
+import weakref
+from array import array
+from collections import Counter
+
+from sqlalchemy import event, select
+from sqlalchemy.orm import Session
+
+from .db import UPSERT_BATCH_ROWS, SessionLocal
+from .models import Entity, EntityAlias
+from .utils.text import normalize_text
+
+# Candidates by shared trigrams that get the full fuzzy score.
+SUGGEST_POOL = 300
+SUGGEST_MIN_SCORE = 0.4
+
+_build_lock = threading.Lock()
+_indexes: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()  # engine -> EntityTextIndex
+
+
+def _trigrams(padded: str) -> set[str]:
+    return {padded[i : i + 3] for i in range(len(padded) - 2)}
+
+
+def _index_key(value: str) -> str:
+    return normalize_text(value or "").lower()
+
+
+def suggest_score(needle: str, tokens: list[str], text: str) -> float:
+    """The suggest score of one lowercased text: prefix, substring, token and fuzzy-ratio terms."""
+    ratio = difflib.SequenceMatcher(None, needle, text).ratio()
+    starts = 1.0 if text.startswith(needle) else 0.0
+    contains = 1.0 if needle in text else 0.0
+    token_hits = sum(1 for t in tokens if t in text) / max(len(tokens), 1)
+    return (starts * 2.0) + (contains * 1.5) + (token_hits * 1.2) + ratio
+
+
+class EntityTextIndex:
+    """
+    Entries are lowercased texts (one per display value and alias) in flat arrays.
+
+    Posting lists map each trigram of `"  " + text + " "` to the entries holding
+    it. Re-indexing an entity retires its entries and appends new ones; the index
+    is rebuilt once retired entries outnumber live ones.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.entity_watermark = 0
+        self.alias_watermark = 0
+        self._changed: set[int] = set()
+        self._reset()
+
+    def _reset(self) -> None:
+        self.entity_type: dict[int, str] = {}
+        self.display_value: dict[int, str] = {}
+        self._aliases: dict[int, list[str]] = {}
+        self._entries_of: dict[int, list[int]] = {}
+        self._texts: list[str] = []
+        self._entry_entity = array("q")
+        self._live = array("b")
+        self._retired = 0
+        self._postings: dict[str, array] = {}
+        self._sorted: list[tuple[str, int]] = []
+
+    def __len__(self) -> int:
+        return len(self._texts) - self._retired
+
+    def _add_entry(self, entity_id: int, text: str, sorted_insert: bool) -> None:
+        if not text:
+            return
+        entry = len(self._texts)
+        self._texts.append(text)
+        self._entry_entity.append(entity_id)
+        self._live.append(1)
+        self._entries_of.setdefault(entity_id, []).append(entry)
+        for gram in _trigrams(f"  {text} "):
+            postings = self._postings.get(gram)
+            if postings is None:
+                postings = self._postings[gram] = array("q")
+            postings.append(entry)
+        if sorted_insert:
+            bisect.insort(self._sorted, (text, entry))
+        else:
+            self._sorted.append((text, entry))
+
+    def _index_entity(self, entity_id: int, sorted_insert: bool) -> None:
+        for entry in self._entries_of.pop(entity_id, ()):
+            self._live[entry] = 0
+            self._retired += 1
+        texts = {_index_key(self.display_value.get(entity_id, ""))}
+        texts.update(_index_key(alias) for alias in self._aliases.get(entity_id, ()))
+        for text in sorted(texts):
+            self._add_entry(entity_id, text, sorted_insert)
+
+    def note_changed(self, entity_ids: set[int]) -> None:
+        with self.lock:
+            self._changed.update(entity_ids)
+
+    def refresh(self, db: Session) -> None:
+        """Index entities and aliases added since the last refresh, and entities flagged as changed."""
+        initial = not self._texts
+        touched: set[int] = set()
+        for entity_id, entity_type, display_value in db.execute(
+            select(Entity.id, Entity.entity_type, Entity.display_value)
+            .where(Entity.id > self.entity_watermark)
+            .order_by(Entity.id)
+        ):
+            self.entity_type[entity_id] = entity_type or ""
+            self.display_value[entity_id] = display_value or ""
+            self.entity_watermark = entity_id
+            touched.add(entity_id)
+        for alias_id, entity_id, alias_text in db.execute(
+            select(EntityAlias.id, EntityAlias.entity_id, EntityAlias.alias_text)
+            .where(EntityAlias.id > self.alias_watermark)
+            .order_by(EntityAlias.id)
+        ):
+            self._aliases.setdefault(entity_id, []).append(alias_text or "")
+            self.alias_watermark = alias_id
+            if entity_id in self.entity_type:
+                touched.add(entity_id)
+
+        changed = sorted(self._changed - touched)
+        self._changed.clear()
+        for start in range(0, len(changed), UPSERT_BATCH_ROWS):
+            for entity_id, entity_type, display_value in db.execute(
+                select(Entity.id, Entity.entity_type, Entity.display_value).where(
+                    Entity.id.in_(changed[start : start + UPSERT_BATCH_ROWS])
+                )
+            ):
+                if self.display_value.get(entity_id) != (display_value or ""):
+                    self.entity_type[entity_id] = entity_type or ""
+                    self.display_value[entity_id] = display_value or ""
+                    touched.add(entity_id)
+
+        if not touched:
+            return
+        # Bulk loads sort once instead of inserting each text into the sorted list.
+        if initial or self._retired > len(self) or len(touched) > len(self.entity_type) // 4:
+            self._rebuild()
+            return
+        for entity_id in sorted(touched):
+            self._index_entity(entity_id, sorted_insert=True)
+
+    def _rebuild(self) -> None:
+        entity_type, display_value, aliases = self.entity_type, self.display_value, self._aliases
+        self._reset()
+        self.entity_type, self.display_value, self._aliases = entity_type, display_value, aliases
+        for entity_id in sorted(entity_type):
+            self._index_entity(entity_id, sorted_insert=False)
+        self._sorted.sort()
+
+    def _prefix_entries(self, needle: str, limit: int) -> list[int]:
+        found: list[int] = []
+        pos = bisect.bisect_left(self._sorted, (needle, -1))
+        while pos < len(self._sorted) and len(found) < limit:
+            text, entry = self._sorted[pos]
+            if not text.startswith(needle):
+                break
+            if self._live[entry]:
+                found.append(entry)
+            pos += 1
+        return found
+
+    def _type_ok(self, entry: int, entity_type: str) -> bool:
+        return not entity_type or self.entity_type.get(self._entry_entity[entry], "").lower() == entity_type
+
+    def suggest(self, q: str, *, entity_type: str = "", limit: int = 10) -> list[tuple[float, int]]:
+        """`(score, entity_id)` of the best matches, best first, each entity scored by its best text."""
+        needle = _index_key(q)
+        tokens = [t for t in needle.replace(",", " ").split() if t]
+        if not needle:
+            return []
+        with self.lock:
+            return self._suggest(needle, tokens, entity_type, limit)
+
+    def _suggest(self, needle: str, tokens: list[str], entity_type: str, limit: int) -> list[tuple[float, int]]:
+        # No trailing pad on the query, so its last word also matches as a prefix. Parts too
+        # short for a trigram of their own match every trigram that contains them.
+        grams = list(_trigrams(f" {needle}"))
+        short = {part for part in [needle, *tokens] if len(part) < 3}
+        if short:
+            grams.extend(gram for gram in self._postings if any(part in gram for part in short))
+        shared: Counter = Counter()
+        for gram in grams:
+            postings = self._postings.get(gram)
+            if postings is not None:
+                shared.update(postings)
+        live, texts, type_ok = self._live, self._texts, self._type_ok
+        # Closer lengths first among equal overlaps: the fuzzy ratio favors them.
+        pool = heapq.nlargest(
+            SUGGEST_POOL,
+            (entry for entry in shared if live[entry] and type_ok(entry, entity_type)),
+            key=lambda entry: (shared[entry], -abs(len(texts[entry]) - len(needle))),
+        )
+        pool.extend(entry for entry in self._prefix_entries(needle, SUGGEST_POOL) if type_ok(entry, entity_type))
+
+        best: dict[int, float] = {}
+        for entry in set(pool):
+            entity_id = self._entry_entity[entry]
+            score = suggest_score(needle, tokens, self._texts[entry])
+            if score >= SUGGEST_MIN_SCORE and score > best.get(entity_id, 0.0):
+                best[entity_id] = score
+        # Newest first among ties, as when candidates were read newest first.
+        ranked = sorted(best.items(), key=lambda item: (-item[1], self.display_value[item[0]].lower(), -item[0]))
+        return [(score, entity_id) for entity_id, score in ranked[:limit]]
+
+    def search(self, q: str, *, entity_type: str = "", limit: int = 50) -> list[int]:
+        """Ids of the first `limit` entities whose display value or an alias contains `q`, by type, then display value."""
+        needle = _index_key(q)
+        if not needle:
+            return []
+        with self.lock:
+            return self._search(needle, entity_type, limit)
+
+    def _search(self, needle: str, entity_type: str, limit: int) -> list[int]:
+        grams = sorted(_trigrams(needle), key=lambda gram: len(self._postings.get(gram, ())))
+        if grams:
+            entries = set(self._postings.get(grams[0], ()))
+            for gram in grams[1:]:
+                if not entries:
+                    break
+                entries.intersection_update(self._postings.get(gram, ()))
+        else:
+            entries = range(len(self._texts))
+        matched = {
+            self._entry_entity[entry]
+            for entry in entries
+            if self._live[entry] and needle in self._texts[entry] and self._type_ok(entry, entity_type)
+        }
+        return heapq.nsmallest(
+            limit, matched, key=lambda entity_id: (self.entity_type[entity_id], self.display_value[entity_id], entity_id)
+        )
+
+
+def mark_entity_values_changed(db: Session, entity_ids) -> None:
+    """Flag entities whose display value the session may have changed; its commit re-indexes them."""
+    db.info.setdefault("entity_values_changed", set()).update(int(entity_id) for entity_id in entity_ids)
+
+
+@event.listens_for(Session, "after_commit")
+def _queue_changed_entities(session: Session) -> None:
+    changed = session.info.pop("entity_values_changed", None)
+    if changed:
+        index = _indexes.get(session.get_bind())
+        if index is not None:
+            index.note_changed(changed)
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _drop_changed_entities(session: Session, _previous_transaction) -> None:
+    session.info.pop("entity_values_changed", None)
+
+
+def get_entity_index(db: Session) -> EntityTextIndex:
+    """The database's index, brought up to date with committed entities and aliases."""
+    bind = db.get_bind()
+    index = _indexes.get(bind)
+    if index is None:
+        with _build_lock:
+            index = _indexes.get(bind)
+            if index is None:
+                index = _indexes[bind] = EntityTextIndex()
+    with index.lock:
+        index.refresh(db)
+    return index
+
+
+def warm_entity_index() -> int:
+    """Load the app database's index ahead of the first suggest; runs on its own session."""
+    with SessionLocal() as db:
+        return len(get_entity_index(db))
@@ -0,0 +1,185 @@
+"""
+Stored topic masks of graph evidence sources.
+
+A topic-filtered `/entities/{id}/connections` keeps an edge when the text of its
+evidence source (the source's latest mention plus the source row's own fields)
+classifies under the topic. That text used to be rebuilt and classified per
+request. Now each `(evidence_source_type, evidence_source_id)` has its mask in
+`evidence_source_topics`, tagged with the `TAXONOMY_VERSION` it was made under,
+and the graph snapshot filters edges with a bitwise test. Graph rebuilds
+classify their meeting's sources; sources never classified, or classified under
+an older taxonomy, are picked up by the background topic reclassification
+(`ensure_evidence_topics`). Until then reads treat them as mask 0.
+"""
+from __future__ import annotations
+
+from sqlalchemy import and_, or_, select
+from sqlalchemy.orm import Session
+
+from .classifiers.topics import TAXONOMY_VERSION, classify_topics_batch
+from .db import UPSERT_BATCH_ROWS, upsert_rows
+from .graph_cache import mark_graph_changed
+from .models import (
+    AgendaItem,
+    Document,
+    DocumentTextExtraction,
+    EntityConnection,
+    EntityMention,
+    EvidenceSourceTopic,
+    Meeting,
+    MeetingMinutesMetadata,
+)
+from .utils.text import normalize_text
+
+CLASSIFY_BATCH_SOURCES = 500
+
+
+def _rows_by_id(db: Session, id_column, columns: list, ids: set[int]) -> dict[int, tuple]:
+    found: dict[int, tuple] = {}
+    ordered = sorted(ids)
+    for start in range(0, len(ordered), UPSERT_BATCH_ROWS):
+        rows = db.execute(select(id_column, *columns).where(id_column.in_(ordered[start : start + UPSERT_BATCH_ROWS])))
+        found.update((row_id, tuple(values)) for row_id, *values in rows)
+    return found
+
+
+def _latest_mentions(db: Session, ids_by_type: dict[str, set[int]]) -> dict[tuple[str, int], tuple[str, str]]:
+    latest: dict[tuple[str, int], tuple[str, str]] = {}
+    for source_type, ids in ids_by_type.items():
+        ordered = sorted(ids)
+        for start in range(0, len(ordered), UPSERT_BATCH_ROWS):
+            rows = db.execute(
+                select(EntityMention.source_id, EntityMention.context_text, EntityMention.mention_text)
+                .where(
+                    EntityMention.source_type == source_type,
+                    EntityMention.source_id.in_(ordered[start : start + UPSERT_BATCH_ROWS]),
+                )
+                .order_by(EntityMention.id.asc())
+            )
+            for source_id, context_text, mention_text in rows:
+                latest[(source_type, source_id)] = (context_text or "", mention_text or "")
+    return latest
+
+
+def evidence_source_texts(db: Session, sources: set[tuple[str, int]]) -> dict[tuple[str, int], str]:
+    """The text each evidence source is classified by, loaded with a few IN queries per table."""
+    normalized = {(source_type, source_id): normalize_text(source_type or "") for source_type, source_id in sources}
+    mention_ids: dict[str, set[int]] = {}
+    ids_for: dict[str, set[int]] = {
+        "agenda": set(),
+        "document": set(),
+        "extraction": set(),
+        "minutes": set(),
+        "meeting": set(),
+    }
+    for (_raw, source_id), source_type in normalized.items():
+        if not source_type or source_id <= 0:
+            continue
+        if source_type != "documents":
+            mention_ids.setdefault(source_type, set()).add(source_id)
+        if source_type in {"agenda_item_title", "agenda_items"}:
+            ids_for["agenda"].add(source_id)
+        elif source_type in {"document_title", "documents"}:
+            ids_for["document"].add(source_id)
+        elif source_type == "document_content":
+            ids_for["extraction"].add(source_id)
+        elif source_type == "minutes_excerpt":
+            ids_for["minutes"].add(source_id)
+        elif source_type == "meeting_metadata":
+            ids_for["meeting"].add(source_id)
+
+    mentions = _latest_mentions(db, mention_ids)
+    docs = _rows_by_id(db, Document.id, [Document.title, Document.agenda_item_id], ids_for["document"])
+    ids_for["agenda"].update(int(agenda_id) for _title, agenda_id in docs.values() if agenda_id)
+    agenda = _rows_by_id(db, AgendaItem.id, [AgendaItem.title, AgendaItem.section, AgendaItem.item_key], ids_for["agenda"])
+    extractions = _rows_by_id(
+        db, DocumentTextExtraction.id, [DocumentTextExtraction.title, DocumentTextExtraction.text_excerpt], ids_for["extraction"]
+    )
+    minutes = _rows_by_id(
+        db, MeetingMinutesMetadata.id, [MeetingMinutesMetadata.title, MeetingMinutesMetadata.text_excerpt], ids_for["minutes"]
+    )
+    meetings = _rows_by_id(
+        db, Meeting.meeting_id, [Meeting.name, Meeting.location, Meeting.date, Meeting.time], ids_for["meeting"]
+    )
+
+    texts: dict[tuple[str, int], str] = {}
+    for key, source_type in normalized.items():
+        source_id = key[1]
+        parts: list[str] = []
+        if source_type and source_id > 0 and source_type != "documents":
+            parts.extend(mentions.get((source_type, source_id), ()))
+        if source_id > 0:
+            if source_type in {"agenda_item_title", "agenda_items"}:
+                parts.extend(agenda.get(source_id, ()))
+            elif source_type in {"document_title", "documents"} and source_id in docs:
+                title, agenda_id = docs[source_id]
+                parts.append(title or "")
+                if agenda_id and int(agenda_id) in agenda:
+                    parts.append(agenda[int(agenda_id)][0] or "")
+            elif source_type == "document_content":
+                parts.extend(extractions.get(source_id, ()))
+            elif source_type == "minutes_excerpt":
+                parts.extend(minutes.get(source_id, ()))
+            elif source_type == "meeting_metadata":
+                parts.extend(meetings.get(source_id, ()))
+        texts[key] = normalize_text(" ".join(p for p in parts if p).strip())
+    return texts
+
+
+def classify_evidence_sources(db: Session, sources: set[tuple[str, int]]) -> int:
+    """(Re)classify the given evidence sources and store their masks; the caller commits."""
+    if not sources:
+        return 0
+    texts = evidence_source_texts(db, sources)
+    keys = sorted(texts)
+    masks = classify_topics_batch([texts[key] for key in keys])
+    upsert_rows(
+        db,
+        EvidenceSourceTopic,
+        [
+            {
+                "source_type": source_type,
+                "source_id": source_id,
+                "taxonomy_version": TAXONOMY_VERSION,
+                "topic_mask": mask,
+            }
+            for (source_type, source_id), mask in zip(keys, masks)
+        ],
+        conflict_columns=["source_type", "source_id"],
+        update_columns=["taxonomy_version", "topic_mask"],
+    )
+    # Snapshots carry the masks, so a commit of new masks must reload them.
+    mark_graph_changed(db)
+    return len(keys)
+
+
+def _unclassified_sources():
+    source_type = EntityConnection.evidence_source_type
+    source_id = EntityConnection.evidence_source_id
+    return (
+        select(source_type, source_id)
+        .outerjoin(
+            EvidenceSourceTopic,
+            and_(EvidenceSourceTopic.source_type == source_type, EvidenceSourceTopic.source_id == source_id),
+        )
+        .where(
+            or_(
+                EvidenceSourceTopic.id.is_(None),
+                EvidenceSourceTopic.taxonomy_version != TAXONOMY_VERSION,
+            )
+        )
+        .distinct()
+        .order_by(source_type, source_id)
+        .limit(CLASSIFY_BATCH_SOURCES)
+    )
+
+
+def ensure_evidence_topics(db: Session) -> int:
+    """Classify every source that is missing or stale, committing per batch."""
+    total = 0
+    while True:
+        pending = {(source_type, int(source_id)) for source_type, source_id in db.execute(_unclassified_sources())}
+        if not pending:
+            return total
+        total += classify_evidence_sources(db, pending)
+        db.commit()
@@ -19,7 +19,7 @@ FROM_TO_PATTERN = re.compile(rf"\bfrom\s+({ZONE_TOKEN})\s+to\s+({ZONE_TOKEN})\b"
 REZONE_TO_PATTERN = re.compile(rf"\brezone(?:d|s|ing)?\b.*?\b({ZONE_TOKEN})\s+to\s+({ZONE_TOKEN})\b", re.IGNORECASE)
 
 
-def _clean_zone(zone: str | None) -> str | None:
+def clean_zone(zone: str | None) -> str | None:
     if not zone:
         return None
     zone = normalize_text(zone)
@@ -43,13 +43,13 @@ def extract_zoning_signals(title: str, body: str | None = None) -> dict[str, str
 
     from_to_match = FROM_TO_PATTERN.search(text)
     if from_to_match:
-        from_zone = _clean_zone(from_to_match.group(1))
-        to_zone = _clean_zone(from_to_match.group(2))
+        from_zone = clean_zone(from_to_match.group(1))
+        to_zone = clean_zone(from_to_match.group(2))
     else:
         rezone_to_match = REZONE_TO_PATTERN.search(text)
         if rezone_to_match:
-            from_zone = _clean_zone(rezone_to_match.group(1))
-            to_zone = _clean_zone(rezone_to_match.group(2))
+            from_zone = clean_zone(rezone_to_match.group(1))
+            to_zone = clean_zone(rezone_to_match.group(2))
 
     ordinance_number = _first_match(ORDINANCE_PATTERNS, text)
     reading_stage = None
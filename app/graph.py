@@ -1,10 +1,17 @@
 from __future__ import annotations
 
+import time
 from datetime import datetime, timezone
 
+from sqlalchemy import delete, select
 from sqlalchemy.orm import Session
 
-from .models import Document, Entity, EntityBinding, EntityConnection, EntityMention, Meeting
+from .cooccurrence import mark_cooccurrences_stale
+from .db import UPSERT_BATCH_ROWS, upsert_rows
+from .evidence_topics import classify_evidence_sources
+from .entity_index import mark_entity_values_changed
+from .graph_cache import mark_graph_changed
+from .models import Document, Entity, EntityBinding, EntityConnection, EntityMention, GraphPendingMeeting, Meeting
 from .utils.text import normalize_text
 
 
@@ -12,92 +19,9 @@ def _utcnow_iso() -> str:
     return datetime.now(timezone.utc).replace(microsecond=0).isoformat().replace("+00:00", "Z")
 
 
-def _upsert_entity_node(db: Session, *, entity_type: str, display_value: str, normalized_value: str) -> Entity:
-    row = (
-        db.query(Entity)
-        .filter(Entity.entity_type == entity_type, Entity.normalized_value == normalized_value)
-        .one_or_none()
-    )
-    if not row:
-        row = Entity(
-            entity_type=entity_type,
-            display_value=normalize_text(display_value),
-            normalized_value=normalized_value,
-        )
-        db.add(row)
-        db.flush()
-    elif display_value and (not row.display_value or row.display_value != display_value):
-        row.display_value = normalize_text(display_value)
-    return row
-
-
-def upsert_entity_binding(
-    db: Session,
-    *,
-    entity_id: int,
-    source_table: str,
-    source_id: int,
-) -> EntityBinding:
-    row = (
-        db.query(EntityBinding)
-        .filter(EntityBinding.source_table == source_table, EntityBinding.source_id == int(source_id))
-        .one_or_none()
-    )
-    if not row:
-        row = EntityBinding(entity_id=entity_id, source_table=source_table, source_id=int(source_id))
-        db.add(row)
-        db.flush()
-    elif row.entity_id != entity_id:
-        row.entity_id = entity_id
-    return row
-
-
-def upsert_entity_connection(
-    db: Session,
-    *,
-    from_entity_id: int,
-    to_entity_id: int,
-    relation_type: str,
-    meeting_id: int | None,
-    document_id: int | None,
-    evidence_source_type: str,
-    evidence_source_id: int,
-    strength: float = 1.0,
-) -> EntityConnection:
-    row = (
-        db.query(EntityConnection)
-        .filter(
-            EntityConnection.from_entity_id == int(from_entity_id),
-            EntityConnection.to_entity_id == int(to_entity_id),
-            EntityConnection.relation_type == relation_type,
-            EntityConnection.evidence_source_type == evidence_source_type,
-            EntityConnection.evidence_source_id == int(evidence_source_id),
-        )
-        .one_or_none()
-    )
-    if not row:
-        row = EntityConnection(
-            from_entity_id=int(from_entity_id),
-            to_entity_id=int(to_entity_id),
-            relation_type=relation_type,
-            meeting_id=int(meeting_id) if meeting_id is not None else None,
-            document_id=int(document_id) if document_id is not None else None,
-            evidence_source_type=evidence_source_type,
-            evidence_source_id=int(evidence_source_id),
-            strength=float(strength),
-            evidence_count=1,
-            last_seen_at=_utcnow_iso(),
-        )
-        db.add(row)
-        db.flush()
-        return row
-
-    row.meeting_id = int(meeting_id) if meeting_id is not None else row.meeting_id
-    row.document_id = int(document_id) if document_id is not None else row.document_id
-    row.strength = float(strength or row.strength or 1.0)
-    row.evidence_count = max(1, int(row.evidence_count or 1))
-    row.last_seen_at = _utcnow_iso()
-    return row
+# Columns an existing edge takes from a rebuild; document_id is kept when the new evidence has none.
+EDGE_KEY_COLUMNS = ["from_entity_id", "to_entity_id", "relation_type", "evidence_source_type", "evidence_source_id"]
+EDGE_UPDATE_COLUMNS = ["meeting_id", "document_id", "strength", "last_seen_at"]
 
 
 def _meeting_entity_values(meeting: Meeting) -> tuple[str, str]:
@@ -113,48 +37,95 @@ def _document_entity_values(doc: Document) -> tuple[str, str]:
     return label, f"document:{int(doc.meeting_id)}:{int(doc.document_id)}"
 
 
-def ensure_meeting_entity(db: Session, meeting: Meeting) -> Entity:
-    display_value, normalized_value = _meeting_entity_values(meeting)
-    entity = _upsert_entity_node(
+def _upsert_entity_nodes(db: Session, entity_type: str, nodes: dict[str, str]) -> dict[str, int]:
+    """Upsert `{normalized_value: display_value}` nodes of one type and return their ids."""
+    if not nodes:
+        return {}
+    upsert_rows(
         db,
-        entity_type="meeting",
-        display_value=display_value,
-        normalized_value=normalized_value,
+        Entity,
+        [
+            {"entity_type": entity_type, "display_value": normalize_text(display), "normalized_value": normalized}
+            for normalized, display in nodes.items()
+        ],
+        conflict_columns=["entity_type", "normalized_value"],
+        update_columns=["display_value"],
     )
-    upsert_entity_binding(db, entity_id=entity.id, source_table="meetings", source_id=int(meeting.meeting_id))
-    return entity
+    rows = db.execute(
+        select(Entity.normalized_value, Entity.id).where(
+            Entity.entity_type == entity_type, Entity.normalized_value.in_(list(nodes))
+        )
+    )
+    ids = {normalized: entity_id for normalized, entity_id in rows}
+    mark_entity_values_changed(db, ids.values())
+    return ids
 
 
-def ensure_document_entity(db: Session, doc: Document) -> Entity:
-    display_value, normalized_value = _document_entity_values(doc)
-    entity = _upsert_entity_node(
+def _upsert_entity_bindings(db: Session, source_table: str, entity_by_source_id: dict[int, int]) -> None:
+    upsert_rows(
         db,
-        entity_type="document",
-        display_value=display_value,
-        normalized_value=normalized_value,
+        EntityBinding,
+        [
+            {"entity_id": entity_id, "source_table": source_table, "source_id": int(source_id)}
+            for source_id, entity_id in entity_by_source_id.items()
+        ],
+        conflict_columns=["source_table", "source_id"],
+        update_columns=["entity_id"],
     )
-    # Bind to local documents.id PK (not CivicWeb document_id) to keep bindings aligned to source table PK.
-    upsert_entity_binding(db, entity_id=entity.id, source_table="documents", source_id=int(doc.id))
-    return entity
 
 
-def _meeting_relation_for_mention(mention: EntityMention, mentioned_entity: Entity) -> str:
-    if mention.source_type == "meeting_metadata":
-        if mentioned_entity.entity_type == "date":
+def _upsert_entity_connections(db: Session, edges: dict[tuple, dict]) -> None:
+    """
+    Write edges keyed by `EDGE_KEY_COLUMNS` values in batched upserts.
+
+    New edges start with evidence_count 1; changed ones keep their count and
+    take the new meeting, strength and last_seen_at (and document, when known).
+    """
+    with_document = [edge for edge in edges.values() if edge["document_id"] is not None]
+    without_document = [edge for edge in edges.values() if edge["document_id"] is None]
+    upsert_rows(
+        db,
+        EntityConnection,
+        with_document,
+        conflict_columns=EDGE_KEY_COLUMNS,
+        update_columns=EDGE_UPDATE_COLUMNS,
+    )
+    upsert_rows(
+        db,
+        EntityConnection,
+        without_document,
+        conflict_columns=EDGE_KEY_COLUMNS,
+        update_columns=[col for col in EDGE_UPDATE_COLUMNS if col != "document_id"],
+    )
+
+
+def _meeting_relation_for_mention(source_type: str, entity_type: str) -> str:
+    if source_type == "meeting_metadata":
+        if entity_type == "date":
             return "occurs_on"
-        if mentioned_entity.entity_type in {"address", "zip_code"}:
+        if entity_type in {"address", "zip_code"}:
             return "occurs_at"
     return "mentions"
 
 
 def rebuild_graph_for_meeting(db: Session, meeting_id: int) -> dict[str, int]:
+    """
+    Refresh a meeting's graph: its meeting and document nodes, their bindings, and
+    edges from those nodes to every mentioned entity, with a handful of bulk reads
+    and batched upserts. Only the edge delta is written: edges whose evidence
+    source no longer yields them are deleted, unchanged edges are left alone.
+    The caller commits.
+    """
     meeting = db.get(Meeting, int(meeting_id))
     if not meeting:
         return {"meeting_entities": 0, "document_entities": 0, "connections": 0}
 
     db.flush()
-    meeting_entity = ensure_meeting_entity(db, meeting)
-    connection_count = 0
+    mark_graph_changed(db)
+    now = _utcnow_iso()
+    meeting_label, meeting_key = _meeting_entity_values(meeting)
+    meeting_entity_id = _upsert_entity_nodes(db, "meeting", {meeting_key: meeting_label})[meeting_key]
+    _upsert_entity_bindings(db, "meetings", {int(meeting.meeting_id): meeting_entity_id})
 
     docs = (
         db.query(Document)
@@ -162,74 +133,148 @@ def rebuild_graph_for_meeting(db: Session, meeting_id: int) -> dict[str, int]:
         .order_by(Document.id.asc())
         .all()
     )
+    doc_nodes = {key: label for label, key in (_document_entity_values(doc) for doc in docs)}
+    doc_entity_ids = _upsert_entity_nodes(db, "document", doc_nodes)
+    # Bind to local documents.id PK (not CivicWeb document_id) to keep bindings aligned to source table PK.
+    _upsert_entity_bindings(
+        db, "documents", {int(doc.id): doc_entity_ids[_document_entity_values(doc)[1]] for doc in docs}
+    )
+
+    edges: dict[tuple, dict] = {}
+    connection_count = 0
+
+    def add_edge(from_id: int, to_id: int, relation_type: str, document_id, source_type: str, source_id: int, strength: float):
+        nonlocal connection_count
+        key = (int(from_id), int(to_id), relation_type, source_type, int(source_id))
+        # Later evidence for the same edge wins, as with the old row-at-a-time upserts.
+        edges[key] = {
+            **dict(zip(EDGE_KEY_COLUMNS, key)),
+            "meeting_id": int(meeting.meeting_id),
+            "document_id": int(document_id) if document_id is not None else None,
+            "strength": float(strength),
+            "evidence_count": 1,
+            "last_seen_at": now,
+        }
+        connection_count += 1
+
     doc_entity_by_civic_doc_id: dict[int, int] = {}
     for doc in docs:
-        if getattr(doc, "id", None) is None:
-            db.flush()
-        doc_entity = ensure_document_entity(db, doc)
-        doc_entity_by_civic_doc_id[int(doc.document_id)] = int(doc_entity.id)
-        upsert_entity_connection(
-            db,
-            from_entity_id=meeting_entity.id,
-            to_entity_id=doc_entity.id,
-            relation_type="contains_document",
-            meeting_id=meeting.meeting_id,
-            document_id=doc.document_id,
-            evidence_source_type="documents",
-            evidence_source_id=int(doc.id),
-            strength=1.0,
+        doc_entity_id = doc_entity_ids[_document_entity_values(doc)[1]]
+        doc_entity_by_civic_doc_id[int(doc.document_id)] = doc_entity_id
+        add_edge(meeting_entity_id, doc_entity_id, "contains_document", doc.document_id, "documents", doc.id, 1.0)
+
+    mentions = db.execute(
+        select(
+            EntityMention.entity_id,
+            Entity.entity_type,
+            EntityMention.document_id,
+            EntityMention.source_type,
+            EntityMention.source_id,
+            EntityMention.confidence,
         )
-        connection_count += 1
-
-    mentions = (
-        db.query(EntityMention)
-        .filter(EntityMention.meeting_id == meeting.meeting_id)
+        .join(Entity, Entity.id == EntityMention.entity_id)
+        .where(EntityMention.meeting_id == meeting.meeting_id)
         .order_by(EntityMention.id.asc())
-        .all()
     )
-    for mention in mentions:
-        mentioned_entity = db.get(Entity, int(mention.entity_id))
-        if not mentioned_entity:
-            continue
+    for entity_id, entity_type, document_id, source_type, source_id, confidence in mentions:
+        source_type = source_type or "unknown"
+        source_id = int(source_id or 0)
+        strength = float(confidence or 1.0)
 
         # Meeting-level relation for any mention in the meeting.
-        upsert_entity_connection(
-            db,
-            from_entity_id=meeting_entity.id,
-            to_entity_id=mentioned_entity.id,
-            relation_type=_meeting_relation_for_mention(mention, mentioned_entity),
-            meeting_id=meeting.meeting_id,
-            document_id=mention.document_id,
-            evidence_source_type=mention.source_type or "unknown",
-            evidence_source_id=int(mention.source_id or 0),
-            strength=float(mention.confidence or 1.0),
-        )
-        connection_count += 1
+        relation = _meeting_relation_for_mention(source_type, entity_type)
+        add_edge(meeting_entity_id, entity_id, relation, document_id, source_type, source_id, strength)
 
         # Document-level relation if evidence is attached to a document.
-        if mention.document_id is not None:
-            doc_entity_id = doc_entity_by_civic_doc_id.get(int(mention.document_id))
+        if document_id is not None:
+            doc_entity_id = doc_entity_by_civic_doc_id.get(int(document_id))
             if doc_entity_id:
-                upsert_entity_connection(
-                    db,
-                    from_entity_id=doc_entity_id,
-                    to_entity_id=mentioned_entity.id,
-                    relation_type="mentions",
-                    meeting_id=meeting.meeting_id,
-                    document_id=mention.document_id,
-                    evidence_source_type=mention.source_type or "unknown",
-                    evidence_source_id=int(mention.source_id or 0),
-                    strength=float(mention.confidence or 1.0),
-                )
-                connection_count += 1
-
+                add_edge(doc_entity_id, entity_id, "mentions", document_id, source_type, source_id, strength)
+
+    classify_evidence_sources(db, {(key[3], key[4]) for key in edges})
+    mentioned = {key[1] for key in edges if key[2] != "contains_document"}
+    stale_ids, previously_mentioned = _diff_meeting_edges(db, int(meeting.meeting_id), edges)
+    # Every entity in the meeting, before or after, may have gained or lost co-occurrences.
+    mark_cooccurrences_stale(db, mentioned | previously_mentioned)
+    for start in range(0, len(stale_ids), UPSERT_BATCH_ROWS):
+        db.execute(delete(EntityConnection).where(EntityConnection.id.in_(stale_ids[start : start + UPSERT_BATCH_ROWS])))
+    _upsert_entity_connections(db, edges)
     return {
         "meeting_entities": 1,
         "document_entities": len(docs),
         "connections": connection_count,
+        "connections_removed": len(stale_ids),
     }
 
 
+def _diff_meeting_edges(db: Session, meeting_id: int, edges: dict[tuple, dict]) -> tuple[list[int], set[int]]:
+    """
+    Compare a meeting's stored edges with the rebuilt set, keyed by evidence source.
+
+    Edges whose evidence is gone are returned for deletion, along with the entities
+    the stored edges say were mentioned; edges stored exactly as rebuilt are dropped
+    from `edges` so only new and changed ones get written.
+    """
+    stale_ids: list[int] = []
+    mentioned: set[int] = set()
+    rows = db.execute(
+        select(
+            EntityConnection.id,
+            *(getattr(EntityConnection, col) for col in EDGE_KEY_COLUMNS),
+            EntityConnection.document_id,
+            EntityConnection.strength,
+        ).where(EntityConnection.meeting_id == meeting_id)
+    )
+    for edge_id, *key, document_id, strength in rows:
+        if key[2] != "contains_document":
+            mentioned.add(key[1])
+        edge = edges.get(tuple(key))
+        if edge is None:
+            stale_ids.append(edge_id)
+        elif edge["strength"] == strength and edge["document_id"] in (None, document_id):
+            del edges[tuple(key)]
+    return stale_ids, mentioned
+
+
+def mark_graph_pending(db: Session, meeting_id: int) -> None:
+    """Record that a meeting's graph is out of date; `rebuild_pending_graphs` applies it. The caller commits."""
+    upsert_rows(
+        db,
+        GraphPendingMeeting,
+        [{"meeting_id": int(meeting_id), "marked_at": time.time()}],
+        conflict_columns=["meeting_id"],
+        update_columns=["marked_at"],
+    )
+
+
+def rebuild_pending_graphs(db: Session) -> dict[str, int]:
+    """
+    Rebuild every meeting marked pending, in one pass, and clear the marks.
+
+    Ingest jobs defer graph work to this pass at their end. Marks left by an
+    interrupted job are picked up by the next pass, and a mark renewed while the
+    pass runs (another job re-ingested the meeting) is kept. The caller commits.
+    """
+    pending = db.execute(
+        select(GraphPendingMeeting.meeting_id, GraphPendingMeeting.marked_at).order_by(GraphPendingMeeting.meeting_id)
+    ).all()
+    meetings = 0
+    connections = 0
+    removed = 0
+    for meeting_id, marked_at in pending:
+        stats = rebuild_graph_for_meeting(db, meeting_id)
+        meetings += int(stats["meeting_entities"])
+        connections += int(stats["connections"])
+        removed += int(stats.get("connections_removed") or 0)
+        db.execute(
+            delete(GraphPendingMeeting).where(
+                GraphPendingMeeting.meeting_id == meeting_id,
+                GraphPendingMeeting.marked_at <= marked_at,
+            )
+        )
+    return {"meetings": meetings, "connections": connections, "connections_removed": removed}
+
+
 def backfill_graph_entities_and_connections(
     db: Session,
     *,
@@ -246,15 +291,18 @@ def backfill_graph_entities_and_connections(
     processed = 0
     total_connections = 0
     total_documents = 0
+    total_removed = 0
     for m in meetings:
         stats = rebuild_graph_for_meeting(db, m.meeting_id)
         processed += 1
         total_connections += int(stats.get("connections") or 0)
         total_documents += int(stats.get("document_entities") or 0)
+        total_removed += int(stats.get("connections_removed") or 0)
     db.commit()
     return {
         "processed_meetings": processed,
         "document_entities_seen": total_documents,
         "connections_written": total_connections,
+        "connections_removed": total_removed,
     }
 
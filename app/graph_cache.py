@@ -0,0 +1,286 @@
+"""
+In-memory adjacency of the entity graph.
+
+`/entities/{id}/connections` reads from a snapshot of the whole graph held in
+compact CSR arrays (per-node offsets into flat neighbor, relation, meeting,
+evidence and topic-mask arrays) instead of querying edges on every call, and
+the co-occurrence matrix behind `/entities/{id}/related` is computed from the
+snapshot's mention incidence (see `app.cooccurrence`). Sessions that write
+edges, mentions or evidence topic masks flag themselves with
+`mark_graph_changed`; their commit bumps a process-wide generation counter, and
+the next read after a bump loads a fresh snapshot.
+"""
+from __future__ import annotations
+
+import threading
+import weakref
+from array import array
+from typing import NamedTuple
+
+from sqlalchemy import and_, event, select
+from sqlalchemy.orm import Session
+
+from .classifiers.topics import TAXONOMY_VERSION
+from .models import EntityConnection, EntityMention, EvidenceSourceTopic
+
+# Newest incident edges an entity's connections are computed from, as the SQL version did.
+CONNECTION_SCAN_LIMIT = 5000
+
+_generation = 0
+_generation_lock = threading.Lock()
+_build_lock = threading.Lock()
+_snapshots: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()  # engine -> GraphSnapshot
+
+
+class IncidentEdge(NamedTuple):
+    other_id: int
+    relation_type: str
+    outgoing: bool
+    meeting_id: int | None
+    evidence_count: int
+    evidence_source_type: str
+    evidence_source_id: int
+    topic_mask: int
+
+
+def _csr_offsets(row_of: array, rows: int) -> array:
+    offsets = array("q", bytes(8 * (rows + 1)))
+    for row in row_of:
+        offsets[row + 1] += 1
+    for row in range(rows):
+        offsets[row + 1] += offsets[row]
+    return offsets
+
+
+def _csr_fill(row_of: array, offsets: array) -> array:
+    """Positions of each entry in its row, keeping the entries' input order within a row."""
+    cursor = array("q", offsets[:-1])
+    positions = array("q", bytes(8 * len(row_of)))
+    for i, row in enumerate(row_of):
+        positions[i] = cursor[row]
+        cursor[row] += 1
+    return positions
+
+
+class _Incidence:
+    """
+    Mention incidence between entities and one kind of container (meetings or agenda items).
+
+    Column rows list the entity of every mention in a container, repeats included;
+    entity rows list the distinct containers an entity is mentioned in.
+    """
+
+    def __init__(self):
+        self.column_ids = array("q")
+        self._column_index: dict[int, int] = {}
+        self.entity_index: dict[int, int] = {}
+        self._pairs: set[tuple[int, int]] | None = set()
+        self._mention_column = array("q")
+        self._mention_entity = array("q")
+        self._pair_entity = array("q")
+        self._pair_column = array("q")
+
+    def add(self, entity_id: int, column_id: int) -> None:
+        column = self._column_index.get(column_id)
+        if column is None:
+            column = self._column_index[column_id] = len(self.column_ids)
+            self.column_ids.append(column_id)
+        self._mention_column.append(column)
+        self._mention_entity.append(entity_id)
+        entity = self.entity_index.setdefault(entity_id, len(self.entity_index))
+        if (entity, column) not in self._pairs:
+            self._pairs.add((entity, column))
+            self._pair_entity.append(entity)
+            self._pair_column.append(column)
+
+    def freeze(self) -> None:
+        self.column_offsets = _csr_offsets(self._mention_column, len(self.column_ids))
+        self.column_entities = array("q", bytes(8 * len(self._mention_entity)))
+        for i, pos in enumerate(_csr_fill(self._mention_column, self.column_offsets)):
+            self.column_entities[pos] = self._mention_entity[i]
+
+        self.entity_offsets = _csr_offsets(self._pair_entity, len(self.entity_index))
+        self.entity_columns = array("q", bytes(8 * len(self._pair_column)))
+        for i, pos in enumerate(_csr_fill(self._pair_entity, self.entity_offsets)):
+            self.entity_columns[pos] = self._pair_column[i]
+        self._pairs = None
+        del self._mention_column, self._mention_entity, self._pair_entity, self._pair_column
+
+    def cooccurrences(self, entity_id: int) -> dict[int, tuple[int, int]]:
+        # One row of (B x A^T) and (B x B^T), with A the mention-count and B the 0/1 incidence matrix.
+        row = self.entity_index.get(entity_id)
+        if row is None:
+            return {}
+        counts: dict[int, int] = {}
+        shared: dict[int, int] = {}
+        for column in self.entity_columns[self.entity_offsets[row] : self.entity_offsets[row + 1]]:
+            seen: set[int] = set()
+            for other_id in self.column_entities[self.column_offsets[column] : self.column_offsets[column + 1]]:
+                if other_id == entity_id:
+                    continue
+                counts[other_id] = counts.get(other_id, 0) + 1
+                if other_id not in seen:
+                    seen.add(other_id)
+                    shared[other_id] = shared.get(other_id, 0) + 1
+        return {other_id: (count, shared[other_id]) for other_id, count in counts.items()}
+
+
+class GraphSnapshot:
+    """Read-only CSR view of `entity_connections` and `entity_mentions` at one generation."""
+
+    def __init__(self, db: Session, generation: int):
+        self.generation = generation
+        self._load_edges(db)
+        self._load_mentions(db)
+
+    def _load_edges(self, db: Session) -> None:
+        self.relation_names: list[str] = []
+        self.source_type_names: list[str] = []
+        relation_codes: dict[str, int] = {}
+        source_type_codes: dict[str, int] = {}
+        self.node_index: dict[int, int] = {}
+
+        # One entry per edge endpoint (one for a self-loop), newest edge first.
+        entry_node = array("q")
+        neighbors = array("q")
+        relations = array("I")
+        outgoing = array("b")
+        meetings = array("q")  # 0: no meeting
+        evidence = array("q")
+        source_types = array("I")
+        source_ids = array("q")
+        topic_masks = array("q")
+        rows = db.execute(
+            select(
+                EntityConnection.from_entity_id,
+                EntityConnection.to_entity_id,
+                EntityConnection.relation_type,
+                EntityConnection.meeting_id,
+                EntityConnection.evidence_count,
+                EntityConnection.evidence_source_type,
+                EntityConnection.evidence_source_id,
+                EvidenceSourceTopic.topic_mask,
+            )
+            .outerjoin(
+                EvidenceSourceTopic,
+                and_(
+                    EvidenceSourceTopic.source_type == EntityConnection.evidence_source_type,
+                    EvidenceSourceTopic.source_id == EntityConnection.evidence_source_id,
+                    EvidenceSourceTopic.taxonomy_version == TAXONOMY_VERSION,
+                ),
+            )
+            .order_by(EntityConnection.id.desc())
+        )
+        for from_id, to_id, relation_type, meeting_id, evidence_count, source_type, source_id, topic_mask in rows:
+            relation = relation_codes.setdefault(relation_type or "", len(relation_codes))
+            source_type_code = source_type_codes.setdefault(source_type or "", len(source_type_codes))
+            ends = ((from_id, to_id, 1),) if from_id == to_id else ((from_id, to_id, 1), (to_id, from_id, 0))
+            for node, other, is_outgoing in ends:
+                entry_node.append(self.node_index.setdefault(int(node), len(self.node_index)))
+                neighbors.append(int(other))
+                relations.append(relation)
+                outgoing.append(is_outgoing)
+                meetings.append(int(meeting_id or 0))
+                evidence.append(int(evidence_count or 1))
+                source_types.append(source_type_code)
+                source_ids.append(int(source_id or 0))
+                topic_masks.append(int(topic_mask or 0))
+        self.relation_names = list(relation_codes)
+        self.source_type_names = list(source_type_codes)
+
+        self.edge_offsets = _csr_offsets(entry_node, len(self.node_index))
+        positions = _csr_fill(entry_node, self.edge_offsets)
+        size = len(entry_node)
+        self.edge_neighbors = array("q", bytes(8 * size))
+        self.edge_relations = array("I", bytes(4 * size))
+        self.edge_outgoing = array("b", bytes(size))
+        self.edge_meetings = array("q", bytes(8 * size))
+        self.edge_evidence = array("q", bytes(8 * size))
+        self.edge_source_types = array("I", bytes(4 * size))
+        self.edge_source_ids = array("q", bytes(8 * size))
+        self.edge_topic_masks = array("q", bytes(8 * size))
+        for i, pos in enumerate(positions):
+            self.edge_neighbors[pos] = neighbors[i]
+            self.edge_relations[pos] = relations[i]
+            self.edge_outgoing[pos] = outgoing[i]
+            self.edge_meetings[pos] = meetings[i]
+            self.edge_evidence[pos] = evidence[i]
+            self.edge_source_types[pos] = source_types[i]
+            self.edge_source_ids[pos] = source_ids[i]
+            self.edge_topic_masks[pos] = topic_masks[i]
+
+    def _load_mentions(self, db: Session) -> None:
+        meetings = _Incidence()
+        agenda_items = _Incidence()
+        rows = db.execute(
+            select(EntityMention.entity_id, EntityMention.meeting_id, EntityMention.agenda_item_id).order_by(EntityMention.id)
+        )
+        for entity_id, meeting_id, agenda_item_id in rows:
+            meetings.add(int(entity_id), int(meeting_id))
+            if agenda_item_id is not None:
+                agenda_items.add(int(entity_id), int(agenda_item_id))
+        meetings.freeze()
+        agenda_items.freeze()
+        self.mentions = {"meeting": meetings, "agenda_item": agenda_items}
+
+    def incident_edges(self, entity_id: int, limit: int = CONNECTION_SCAN_LIMIT) -> list[IncidentEdge]:
+        """The entity's newest `limit` edges in either direction."""
+        row = self.node_index.get(int(entity_id))
+        if row is None:
+            return []
+        start = self.edge_offsets[row]
+        end = min(self.edge_offsets[row + 1], start + max(int(limit), 0))
+        return [
+            IncidentEdge(
+                other_id=self.edge_neighbors[pos],
+                relation_type=self.relation_names[self.edge_relations[pos]],
+                outgoing=bool(self.edge_outgoing[pos]),
+                meeting_id=self.edge_meetings[pos] or None,
+                evidence_count=self.edge_evidence[pos],
+                evidence_source_type=self.source_type_names[self.edge_source_types[pos]],
+                evidence_source_id=self.edge_source_ids[pos],
+                topic_mask=self.edge_topic_masks[pos],
+            )
+            for pos in range(start, end)
+        ]
+
+    def cooccurrences(self, entity_id: int, granularity: str = "meeting") -> dict[int, tuple[int, int]]:
+        """`{other_entity_id: (cooccurrence_count, shared_count)}` over the entity's meetings or agenda items."""
+        return self.mentions[granularity].cooccurrences(int(entity_id))
+
+
+def graph_generation() -> int:
+    return _generation
+
+
+def mark_graph_changed(db: Session) -> None:
+    """Flag the session's transaction as writing edges or mentions; its commit invalidates snapshots."""
+    db.info["graph_changed"] = True
+
+
+@event.listens_for(Session, "after_commit")
+def _bump_generation(session: Session) -> None:
+    global _generation
+    if session.info.pop("graph_changed", False):
+        with _generation_lock:
+            _generation += 1
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _drop_graph_changed(session: Session, _previous_transaction) -> None:
+    session.info.pop("graph_changed", None)
+
+
+def get_graph_snapshot(db: Session) -> GraphSnapshot:
+    """The current snapshot for the session's database, reloaded if a commit changed the graph since."""
+    bind = db.get_bind()
+    snapshot = _snapshots.get(bind)
+    if snapshot is not None and snapshot.generation == _generation:
+        return snapshot
+    with _build_lock:
+        snapshot = _snapshots.get(bind)
+        generation = _generation  # read before loading: a commit during the load forces another reload
+        if snapshot is None or snapshot.generation != generation:
+            snapshot = GraphSnapshot(db, generation)
+            _snapshots[bind] = snapshot
+    return snapshot
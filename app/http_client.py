@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+import threading
+
+import httpx
+
+from .config import settings
+
+_sync_client: httpx.Client | None = None
+_async_client: httpx.AsyncClient | None = None
+_lock = threading.Lock()
+
+
+def _http2_available() -> bool:
+    if not settings.http2_enabled:
+        return False
+    try:
+        import h2  # noqa: F401  optional dependency
+    except Exception:
+        return False
+    return True
+
+
+def _client_kwargs() -> dict:
+    return {
+        "http2": _http2_available(),
+        "follow_redirects": True,
+        "timeout": httpx.Timeout(
+            settings.http_timeout_seconds,
+            connect=settings.http_connect_timeout_seconds,
+        ),
+        "limits": httpx.Limits(
+            max_connections=settings.http_max_connections,
+            max_keepalive_connections=settings.http_max_keepalive_connections,
+            keepalive_expiry=settings.http_keepalive_expiry_seconds,
+        ),
+    }
+
+
+def get_sync_client() -> httpx.Client:
+    """Process-wide pooled client for blocking fetch paths (ingest threads, scripts)."""
+    global _sync_client
+    if _sync_client is None:
+        with _lock:
+            if _sync_client is None:
+                _sync_client = httpx.Client(**_client_kwargs())
+    return _sync_client
+
+
+def get_async_client() -> httpx.AsyncClient:
+    """Process-wide pooled client for async fetch paths; bound to the app event loop."""
+    global _async_client
+    if _async_client is None:
+        with _lock:
+            if _async_client is None:
+                _async_client = httpx.AsyncClient(**_client_kwargs())
+    return _async_client
+
+
+def http_get(url: str, *, timeout: float | None = None, headers: dict[str, str] | None = None) -> httpx.Response:
+    kwargs: dict = {}
+    if timeout is not None:
+        kwargs["timeout"] = timeout
+    if headers:
+        kwargs["headers"] = headers
+    return get_sync_client().get(url, **kwargs)
+
+
+def start_http_clients() -> None:
+    get_sync_client()
+    get_async_client()
+
+
+async def close_http_clients() -> None:
+    global _sync_client, _async_client
+    with _lock:
+        sync_client, _sync_client = _sync_client, None
+        async_client, _async_client = _async_client, None
+    if sync_client is not None:
+        sync_client.close()
+    if async_client is not None:
+        await async_client.aclose()
@@ -1,24 +1,46 @@
+import hashlib
 import json
+from concurrent.futures import Executor, Future, ThreadPoolExecutor
 from datetime import date, datetime, timedelta, timezone
 from typing import Callable
 
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 from . import civicweb_client as cw
-from .document_text import upsert_document_text_extraction_from_document
-from .entities import extract_entities_from_text, replace_entity_mentions_for_source
-from .graph import rebuild_graph_for_meeting
-from .minutes import upsert_minutes_metadata_from_document
+from .config import settings
+from .cooccurrence import ensure_cooccurrences
+from .db import upsert_rows
+from .discovery_cache import DiscoveryPlan, plan_discovery, resolve_discovery
+from .document_fetch import FetchedDocument, fetch_document
+from .document_text import document_text_values, extract_document_text
+from .entities import (
+    entity_resolver,
+    extract_entities_from_text,
+    extract_entities_from_texts,
+    replace_entity_mentions_for_source,
+)
+from .graph import mark_graph_pending, rebuild_graph_for_meeting, rebuild_pending_graphs
+from .minutes import extract_minutes_metadata, minutes_metadata_values
 from .parser import parse_agenda_html
+from .topic_index import classify_meeting_topics
 from .models import (
     Meeting,
     AgendaItem,
     Document,
     DocumentTextExtraction,
     MeetingMinutesMetadata,
+    MeetingIngestState,
     MeetingRawData,
-    MeetingRangeDiscoveryCache,
 )
 
+# Extraction outcomes worth retrying on the next incremental pass (network or load, not content).
+RETRYABLE_EXTRACTION_STATUSES = {"download_failed", "pdf_timeout"}
+
+
+def _utcnow_iso() -> str:
+    return datetime.now(timezone.utc).replace(microsecond=0).isoformat().replace("+00:00", "Z")
+
+
 def upsert_meeting(db: Session, meeting_id: int, meeting_data: dict):
     m = db.get(Meeting, meeting_id)
     if not m:
@@ -47,8 +69,213 @@ def upsert_meeting_raw_data(db: Session, meeting_id: int, meeting_data: dict, me
     return raw
 
 
-def ingest_meeting(db: Session, meeting_id: int, store_raw: bool = True):
+def payload_fingerprint(meeting_data: dict, meeting_documents: list[dict]) -> str:
+    # Same canonical JSON encoding as `upsert_meeting_raw_data`, so equal payloads hash equally.
+    canonical = json.dumps(
+        {"meeting_data": meeting_data or {}, "meeting_documents": meeting_documents or []},
+        ensure_ascii=True,
+        sort_keys=True,
+    )
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def _get_meeting_ingest_state(db: Session, meeting_id: int) -> MeetingIngestState | None:
+    return db.query(MeetingIngestState).filter(MeetingIngestState.meeting_id == meeting_id).one_or_none()
+
+
+def _known_fingerprints(db: Session, meeting_ids: list[int]) -> dict[int, str]:
+    if not meeting_ids:
+        return {}
+    rows = (
+        db.query(MeetingIngestState.meeting_id, MeetingIngestState.payload_fingerprint)
+        .filter(MeetingIngestState.meeting_id.in_(meeting_ids))
+        .all()
+    )
+    return {int(mid): fp for mid, fp in rows if fp}
+
+
+def _record_meeting_ingest_state(db: Session, meeting_id: int, fingerprint: str, *, ingested: bool) -> None:
+    state = _get_meeting_ingest_state(db, meeting_id)
+    if not state:
+        state = MeetingIngestState(meeting_id=meeting_id)
+        db.add(state)
+    now = _utcnow_iso()
+    state.last_checked_at = now
+    if ingested:
+        state.payload_fingerprint = fingerprint
+        state.last_ingested_at = now
+
+
+def _find_agenda_html(docs: list[dict]) -> str | None:
+    for d in docs:
+        if int(d.get("DocumentType") or 0) == 1 and d.get("Html"):
+            return d["Html"]
+    return None
+
+
+def _attachments_by_document_id(parsed_items: list[dict]) -> dict[int, dict]:
+    attachments: dict[int, dict] = {}
+    for it in parsed_items:
+        for att in it.get("attachments", []):
+            attachments[att["document_id"]] = att
+    return attachments
+
+
+def _extract_attachment(att: dict, fetched: FetchedDocument) -> dict:
+    # Both extractors read the same download (and, for PDFs, the same parse).
+    title = att.get("title", "") or ""
+    url = att.get("url", "") or ""
+    return {
+        "minutes": extract_minutes_metadata(title=title, url=url, fetched=fetched),
+        "text": extract_document_text(title=title, url=url, fetched=fetched),
+    }
+
+
+def _fetch_attachment_extractions(att: dict) -> dict:
+    return _extract_attachment(att, fetch_document(att.get("url", "") or ""))
+
+
+def _meeting_payload(
+    meeting_id: int,
+    *,
+    fingerprint: str,
+    meeting_data: dict,
+    docs: list[dict],
+    agenda_html: str | None,
+    parsed_items: list[dict],
+    extractions: dict[int, dict],
+) -> dict:
+    return {
+        "meeting_id": meeting_id,
+        "fingerprint": fingerprint,
+        "unchanged": False,
+        "meeting_data": meeting_data,
+        "documents": docs,
+        "has_agenda_html": bool(agenda_html),
+        "items": parsed_items,
+        "extractions": extractions,
+    }
+
+
+def fetch_meeting_payload(
+    meeting_id: int,
+    *,
+    attachment_executor: Executor | None = None,
+    known_fingerprint: str | None = None,
+) -> dict:
+    """
+    Network stage of a meeting ingest: CivicWeb API calls, agenda parsing and
+    attachment downloads. Touches no database state, so it is safe to run on
+    worker threads while the session stays on the calling thread.
+
+    When `known_fingerprint` matches the fetched payload, parsing and attachment
+    downloads are skipped and the payload is flagged `unchanged`.
+    """
     meeting_data = cw.get_meeting_data(meeting_id)
+    docs = cw.get_meeting_documents(meeting_id)
+    fingerprint = payload_fingerprint(meeting_data, docs)
+    if known_fingerprint and known_fingerprint == fingerprint:
+        return {"meeting_id": meeting_id, "fingerprint": fingerprint, "unchanged": True}
+
+    agenda_html = _find_agenda_html(docs)
+    parsed_items = parse_agenda_html(agenda_html) if agenda_html else []
+    attachments = _attachments_by_document_id(parsed_items)
+
+    if attachment_executor is not None and len(attachments) > 1:
+        futures = {
+            document_id: attachment_executor.submit(_fetch_attachment_extractions, att)
+            for document_id, att in attachments.items()
+        }
+        extractions = {document_id: f.result() for document_id, f in futures.items()}
+    else:
+        extractions = {
+            document_id: _fetch_attachment_extractions(att) for document_id, att in attachments.items()
+        }
+
+    return _meeting_payload(
+        meeting_id,
+        fingerprint=fingerprint,
+        meeting_data=meeting_data,
+        docs=docs,
+        agenda_html=agenda_html,
+        parsed_items=parsed_items,
+        extractions=extractions,
+    )
+
+
+def _sync_meeting_rows(
+    db: Session,
+    model,
+    meeting_id: int,
+    key_column: str,
+    values: dict,
+    update_columns: list[str],
+) -> dict:
+    """
+    Write one meeting's child rows in bulk and return `{key: row id}`.
+
+    Existing rows are prefetched in one query and compared in memory; only new or
+    changed rows go to a batched INSERT ... ON CONFLICT, and only rows that were
+    just inserted need a second query for their ids.
+    """
+    table = model.__table__
+    existing = {
+        row._mapping[key_column]: row
+        for row in db.execute(
+            select(table.c.id, table.c[key_column], *[table.c[col] for col in update_columns]).where(
+                table.c.meeting_id == meeting_id
+            )
+        )
+    }
+    changed = [
+        row
+        for key, row in values.items()
+        if key not in existing or any(existing[key]._mapping[col] != row[col] for col in update_columns)
+    ]
+    upsert_rows(db, model, changed, conflict_columns=["meeting_id", key_column], update_columns=update_columns)
+
+    ids = {key: existing[key].id for key in values if key in existing}
+    inserted = [key for key in values if key not in ids]
+    if inserted:
+        rows = db.execute(
+            select(table.c[key_column], table.c.id).where(
+                table.c.meeting_id == meeting_id,
+                table.c[key_column].in_(inserted),
+            )
+        )
+        ids.update((key, row_id) for key, row_id in rows)
+    return ids
+
+
+def _refresh_graph(db: Session, meeting_id: int, defer_graph: bool) -> None:
+    if defer_graph:
+        mark_graph_pending(db, meeting_id)
+    else:
+        rebuild_graph_for_meeting(db, meeting_id)
+
+
+def apply_meeting_payload(db: Session, payload: dict, store_raw: bool = True, defer_graph: bool = False):
+    """
+    Database stage of a meeting ingest; see `fetch_meeting_payload`.
+
+    With `defer_graph`, the meeting is only marked for the graph pass that range
+    ingests run once at the end (`rebuild_pending_graphs`).
+    """
+    meeting_id = payload["meeting_id"]
+    if payload.get("unchanged"):
+        _record_meeting_ingest_state(db, meeting_id, payload["fingerprint"], ingested=False)
+        db.commit()
+        return {"meeting_id": meeting_id, "status": "unchanged"}
+
+    # A failed download or timed-out parse would otherwise be skipped forever by incremental re-syncs.
+    fingerprint = payload["fingerprint"]
+    if any(
+        (ext.get("text") or {}).get("status") in RETRYABLE_EXTRACTION_STATUSES
+        for ext in payload["extractions"].values()
+    ):
+        fingerprint = ""
+
+    meeting_data = payload["meeting_data"]
     meeting = upsert_meeting(db, meeting_id, meeting_data)
     meeting_context = " ".join(
         [
@@ -66,128 +293,167 @@ def ingest_meeting(db: Session, meeting_id: int, store_raw: bool = True):
         entities=extract_entities_from_text(meeting_context),
     )
 
-    docs = cw.get_meeting_documents(meeting_id)
+    docs = payload["documents"]
     if store_raw:
         upsert_meeting_raw_data(db, meeting_id, meeting_data, docs)
 
-    # Find agenda html doc container
-    agenda_html = None
-    for d in docs:
-        if int(d.get("DocumentType") or 0) == 1 and d.get("Html"):
-            agenda_html = d["Html"]
-            break
-
-    if not agenda_html:
-        rebuild_graph_for_meeting(db, meeting_id)
+    if not payload["has_agenda_html"]:
+        _refresh_graph(db, meeting_id, defer_graph)
+        _record_meeting_ingest_state(db, meeting_id, fingerprint, ingested=True)
         db.commit()
         return {"meeting_id": meeting_id, "status": "no_agenda_html"}
 
-    parsed_items = parse_agenda_html(agenda_html)
+    parsed_items = payload["items"]
+    extractions = payload["extractions"]
 
-    # Upsert agenda items + documents
-    for it in parsed_items:
-        item = db.query(AgendaItem).filter(
-            AgendaItem.meeting_id == meeting_id,
-            AgendaItem.item_key == it["item_key"]
-        ).one_or_none()
-
-        if not item:
-            item = AgendaItem(meeting_id=meeting_id, item_key=it["item_key"])
-            db.add(item)
-
-        item.section = it.get("section", "") or ""
-        item.title = it.get("title", "") or ""
-
-        db.flush()  # to get item.id
-
-        replace_entity_mentions_for_source(
-            db,
-            meeting_id=meeting_id,
-            agenda_item_id=item.id,
-            source_type="agenda_item_title",
-            source_id=item.id,
-            context_text=item.title,
-            entities=extract_entities_from_text(item.title),
-        )
+    # The meeting row must exist before its children are written with Core statements.
+    db.flush()
+
+    # Later duplicates win, matching the old row-at-a-time upserts.
+    item_values = {
+        it["item_key"]: {
+            "meeting_id": meeting_id,
+            "item_key": it["item_key"],
+            "section": it.get("section", "") or "",
+            "title": it.get("title", "") or "",
+        }
+        for it in parsed_items
+    }
+    item_ids = _sync_meeting_rows(db, AgendaItem, meeting_id, "item_key", item_values, ["section", "title"])
 
+    doc_values: dict[int, dict] = {}
+    minutes_values: dict[int, dict] = {}
+    text_values: dict[int, dict] = {}
+    for it in parsed_items:
         for att in it.get("attachments", []):
-            doc = db.query(Document).filter(
-                Document.meeting_id == meeting_id,
-                Document.document_id == att["document_id"]
-            ).one_or_none()
-
-            if not doc:
-                doc = Document(meeting_id=meeting_id, document_id=att["document_id"])
-                db.add(doc)
-
-            doc.agenda_item_id = item.id
-            doc.title = att.get("title", "") or ""
-            doc.url = att.get("url", "") or ""
-            doc.handle = att.get("handle", "") or ""
-
-            upsert_minutes_metadata_from_document(
-                db=db,
-                meeting_id=meeting_id,
-                document_id=doc.document_id,
-                title=doc.title,
-                url=doc.url,
-            )
-            doc_text = upsert_document_text_extraction_from_document(
-                db=db,
+            document_id = att["document_id"]
+            title = att.get("title", "") or ""
+            url = att.get("url", "") or ""
+            doc_values[document_id] = {
+                "meeting_id": meeting_id,
+                "document_id": document_id,
+                "agenda_item_id": item_ids[it["item_key"]],
+                "title": title,
+                "url": url,
+                "handle": att.get("handle", "") or "",
+            }
+            prefetched = extractions.get(document_id) or {}
+            minutes = minutes_metadata_values(meeting_id, document_id, title, url, prefetched.get("minutes"))
+            if minutes is not None:
+                minutes_values[document_id] = minutes
+            text_values[document_id] = document_text_values(
                 meeting_id=meeting_id,
-                document_id=doc.document_id,
-                title=doc.title,
-                url=doc.url,
+                document_id=document_id,
+                title=title,
+                url=url,
+                extracted=prefetched.get("text"),
             )
-            replace_entity_mentions_for_source(
-                db,
-                meeting_id=meeting_id,
-                agenda_item_id=item.id,
-                document_id=doc.document_id,
-                source_type="document_title",
-                source_id=doc.id if getattr(doc, "id", None) is not None else doc.document_id,
-                context_text=doc.title,
-                entities=extract_entities_from_text(doc.title),
+    doc_ids = _sync_meeting_rows(
+        db, Document, meeting_id, "document_id", doc_values, ["agenda_item_id", "title", "url", "handle"]
+    )
+    _sync_meeting_rows(
+        db,
+        MeetingMinutesMetadata,
+        meeting_id,
+        "document_id",
+        minutes_values,
+        ["title", "url", "detected_date", "page_count", "text_excerpt", "status"],
+    )
+    text_ids = _sync_meeting_rows(
+        db,
+        DocumentTextExtraction,
+        meeting_id,
+        "document_id",
+        text_values,
+        ["title", "url", "content_type", "text_excerpt", "text_length", "status"],
+    )
+
+    classify_meeting_topics(db, meeting_id)
+
+    # One mention source per title/excerpt, in the order mentions were always written.
+    sources: list[dict] = []
+    for it in parsed_items:
+        item_id = item_ids[it["item_key"]]
+        sources.append(
+            {
+                "agenda_item_id": item_id,
+                "source_type": "agenda_item_title",
+                "source_id": item_id,
+                "context_text": item_values[it["item_key"]]["title"],
+            }
+        )
+        for att in it.get("attachments", []):
+            document_id = att["document_id"]
+            sources.append(
+                {
+                    "agenda_item_id": item_id,
+                    "document_id": document_id,
+                    "source_type": "document_title",
+                    "source_id": doc_ids[document_id],
+                    "context_text": doc_values[document_id]["title"],
+                }
             )
-            if doc_text and doc_text.text_excerpt:
-                db.flush()
-                replace_entity_mentions_for_source(
-                    db,
-                    meeting_id=meeting_id,
-                    agenda_item_id=item.id,
-                    document_id=doc.document_id,
-                    source_type="document_content",
-                    source_id=doc_text.id,
-                    context_text=doc_text.text_excerpt,
-                    entities=extract_entities_from_text(doc_text.text_excerpt),
+            excerpt = text_values[document_id]["text_excerpt"]
+            if excerpt:
+                sources.append(
+                    {
+                        "agenda_item_id": item_id,
+                        "document_id": document_id,
+                        "source_type": "document_content",
+                        "source_id": text_ids[document_id],
+                        "context_text": excerpt,
+                    }
                 )
-
-    db.flush()
-    minutes_rows = (
-        db.query(MeetingMinutesMetadata)
-        .filter(MeetingMinutesMetadata.meeting_id == meeting_id)
-        .all()
+    minutes_rows = db.execute(
+        select(MeetingMinutesMetadata.id, MeetingMinutesMetadata.document_id, MeetingMinutesMetadata.text_excerpt)
+        .where(MeetingMinutesMetadata.meeting_id == meeting_id)
+        .order_by(MeetingMinutesMetadata.id)
     )
-    for m in minutes_rows:
-        replace_entity_mentions_for_source(
-            db,
-            meeting_id=meeting_id,
-            document_id=m.document_id,
-            source_type="minutes_excerpt",
-            source_id=m.id,
-            context_text=m.text_excerpt,
-            entities=extract_entities_from_text(m.text_excerpt),
+    for minutes_id, document_id, excerpt in minutes_rows:
+        sources.append(
+            {
+                "document_id": document_id,
+                "source_type": "minutes_excerpt",
+                "source_id": minutes_id,
+                "context_text": excerpt,
+            }
         )
 
-    rebuild_graph_for_meeting(db, meeting_id)
+    extracted = extract_entities_from_texts([source["context_text"] for source in sources])
+    entity_resolver(db).resolve(db, [ent for entities in extracted for ent in entities])
+    for source, entities in zip(sources, extracted):
+        replace_entity_mentions_for_source(db, meeting_id=meeting_id, entities=entities, **source)
+
+    _refresh_graph(db, meeting_id, defer_graph)
+    _record_meeting_ingest_state(db, meeting_id, fingerprint, ingested=True)
     db.commit()
     return {"meeting_id": meeting_id, "status": "ok", "agenda_items": len(parsed_items)}
 
+
+def ingest_meeting(db: Session, meeting_id: int, store_raw: bool = True, incremental: bool = False):
+    known_fingerprint = None
+    if incremental:
+        known_fingerprint = _known_fingerprints(db, [meeting_id]).get(meeting_id)
+    payload = fetch_meeting_payload(meeting_id, known_fingerprint=known_fingerprint)
+    result = apply_meeting_payload(db, payload, store_raw=store_raw)
+    if result.get("status") != "unchanged":
+        result["cooccurrence"] = _refresh_cooccurrences(db)
+    return result
+
+
+def _refresh_cooccurrences(db: Session) -> dict:
+    """End-of-ingest co-occurrence pass for a single meeting; on failure the stale marks stay."""
+    try:
+        return {"status": "ok", "entities": ensure_cooccurrences(db)}
+    except Exception as exc:
+        db.rollback()
+        return {"status": "error", "error": str(exc)}
+
 def _parse_iso_date(s: str) -> date:
     return datetime.strptime(s, "%Y-%m-%d").date()
 
 
-def _collect_meeting_ids(from_date: str, to_date: str, chunk_days: int = 31) -> list[int]:
+def _date_windows(from_date: str, to_date: str, chunk_days: int) -> list[tuple[str, str]]:
     start = _parse_iso_date(from_date)
     end = _parse_iso_date(to_date)
     if end < start:
@@ -196,118 +462,146 @@ def _collect_meeting_ids(from_date: str, to_date: str, chunk_days: int = 31) ->
     if chunk_days < 1:
         raise ValueError("chunk_days must be at least 1")
 
-    ids: list[int] = []
-    seen: set[int] = set()
-
+    windows: list[tuple[str, str]] = []
     cursor = start
     while cursor <= end:
         window_end = min(cursor + timedelta(days=chunk_days - 1), end)
-        meetings = cw.list_meetings(cursor.isoformat(), window_end.isoformat())
+        windows.append((cursor.isoformat(), window_end.isoformat()))
+        cursor = window_end + timedelta(days=1)
+    return windows
 
+
+def _unique_meeting_ids(meeting_lists: list[list[dict]]) -> list[int]:
+    ids: list[int] = []
+    seen: set[int] = set()
+    for meetings in meeting_lists:
         for m in meetings:
             mid = m.get("Id")
             if isinstance(mid, int) and mid not in seen:
                 seen.add(mid)
                 ids.append(mid)
-
-        cursor = window_end + timedelta(days=1)
-
     return ids
 
 
-def _utcnow_iso() -> str:
-    return datetime.now(timezone.utc).replace(microsecond=0).isoformat().replace("+00:00", "Z")
+def _list_windows(windows: list[tuple[str, str]], concurrency: int | None = None) -> list[list[dict]]:
+    workers = min(max(int(concurrency or settings.ingest_discovery_concurrency), 1), len(windows))
+    if workers <= 1:
+        return [cw.list_meetings(w_from, w_to) for w_from, w_to in windows]
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="ingest-discovery") as executor:
+        # map() yields in window order, so ID order matches the serial crawl.
+        return list(executor.map(lambda w: cw.list_meetings(*w), windows))
 
 
-def _get_range_discovery_cache(
-    db: Session,
-    *,
+def _collect_meeting_ids(
     from_date: str,
     to_date: str,
-    crawl: bool,
-    chunk_days: int,
-) -> MeetingRangeDiscoveryCache | None:
-    return (
-        db.query(MeetingRangeDiscoveryCache)
-        .filter(
-            MeetingRangeDiscoveryCache.from_date == from_date,
-            MeetingRangeDiscoveryCache.to_date == to_date,
-            MeetingRangeDiscoveryCache.crawl == (1 if crawl else 0),
-            MeetingRangeDiscoveryCache.chunk_days == int(chunk_days),
-        )
-        .one_or_none()
-    )
+    chunk_days: int = 31,
+    *,
+    concurrency: int | None = None,
+) -> list[int]:
+    windows = _date_windows(from_date, to_date, chunk_days)
+    return _unique_meeting_ids(_list_windows(windows, concurrency))
 
 
-def _read_cached_meeting_ids(
-    db: Session,
+def _gap_windows(gaps: list[tuple[str, str]], crawl: bool, chunk_days: int) -> list[tuple[str, str]]:
+    """Network windows for the uncovered parts of a range: `chunk_days` slices when crawling."""
+    if not crawl:
+        return list(gaps)
+    return [w for gap_from, gap_to in gaps for w in _date_windows(gap_from, gap_to, chunk_days)]
+
+
+def _fetched_windows(windows: list[tuple[str, str]], meeting_lists: list[list[dict]]) -> list[tuple[str, str, list[int]]]:
+    return [(w_from, w_to, _unique_meeting_ids([meetings])) for (w_from, w_to), meetings in zip(windows, meeting_lists)]
+
+
+def _checkpoint_offset(ids: list[int], resume_after_meeting_id: int | None) -> int:
+    """How many leading IDs a resumed run has already applied (0 if the checkpoint is unknown)."""
+    if resume_after_meeting_id is None or resume_after_meeting_id not in ids:
+        return 0
+    return ids.index(resume_after_meeting_id) + 1
+
+
+def _progress_event(
+    stage: str,
     *,
-    from_date: str,
-    to_date: str,
-    crawl: bool,
-    chunk_days: int,
-    cache_ttl_minutes: int,
-) -> tuple[list[int], MeetingRangeDiscoveryCache] | tuple[None, MeetingRangeDiscoveryCache | None]:
-    row = _get_range_discovery_cache(
-        db,
-        from_date=from_date,
-        to_date=to_date,
-        crawl=crawl,
-        chunk_days=chunk_days,
-    )
-    if not row or not row.last_fetched_at:
-        return (None, row)
+    discovered: int,
+    processed: int,
+    current_meeting_id: int | None,
+    discovery_source: str,
+    cache_hit: bool,
+    **extra,
+) -> dict:
+    return {
+        "stage": stage,
+        "discovered": discovered,
+        "processed": processed,
+        "current_meeting_id": current_meeting_id,
+        **extra,
+        "discovery_source": discovery_source,
+        "cache_hit": cache_hit,
+    }
 
-    try:
-        fetched_at = datetime.fromisoformat(row.last_fetched_at.replace("Z", "+00:00"))
-    except ValueError:
-        return (None, row)
 
-    age = datetime.now(fetched_at.tzinfo) - fetched_at
-    if age > timedelta(minutes=max(cache_ttl_minutes, 0)):
-        return (None, row)
+def _count_result(counts: dict[str, int], result: dict) -> None:
+    status = result.get("status")
+    if status in {"ok", "no_agenda_html", "unchanged"}:
+        counts["succeeded"] += 1
+        if status == "unchanged":
+            counts["unchanged"] += 1
+    else:
+        counts["failed"] += 1
+
 
+def _rebuild_deferred_graphs(db: Session) -> dict:
+    """End-of-job graph and co-occurrence pass; on failure the marks stay for the next pass."""
     try:
-        ids_raw = json.loads(row.meeting_ids_json or "[]")
-    except json.JSONDecodeError:
-        return (None, row)
-    ids = [mid for mid in ids_raw if isinstance(mid, int)]
-    row.last_used_at = _utcnow_iso()
-    return (ids, row)
+        stats = rebuild_pending_graphs(db)
+        db.commit()
+        stats["cooccurrence_entities"] = ensure_cooccurrences(db)
+    except Exception as exc:
+        db.rollback()
+        return {"status": "error", "error": str(exc)}
+    return {"status": "ok", **stats}
 
 
-def _write_cached_meeting_ids(
-    db: Session,
+def _range_summary(
     *,
     from_date: str,
     to_date: str,
     crawl: bool,
     chunk_days: int,
-    meeting_ids: list[int],
-) -> MeetingRangeDiscoveryCache:
-    row = _get_range_discovery_cache(
-        db,
-        from_date=from_date,
-        to_date=to_date,
-        crawl=crawl,
-        chunk_days=chunk_days,
-    )
-    if not row:
-        row = MeetingRangeDiscoveryCache(
-            from_date=from_date,
-            to_date=to_date,
-            crawl=1 if crawl else 0,
-            chunk_days=int(chunk_days),
-        )
-        db.add(row)
-
-    now = _utcnow_iso()
-    row.meeting_ids_json = json.dumps(meeting_ids, ensure_ascii=True)
-    row.discovered_count = len(meeting_ids)
-    row.last_fetched_at = now
-    row.last_used_at = now
-    db.flush()
-    return row
+    use_recent_cache: bool,
+    cache_ttl_minutes: int,
+    plan: DiscoveryPlan,
+    ids: list[int],
+    skipped: int,
+    resume_after_meeting_id: int | None,
+    results: list[dict],
+    counts: dict[str, int],
+    graph: dict,
+) -> dict:
+    return {
+        "from_date": from_date,
+        "to_date": to_date,
+        "crawl": crawl,
+        "chunk_days": chunk_days,
+        "use_recent_cache": use_recent_cache,
+        "cache_ttl_minutes": cache_ttl_minutes,
+        "cache_hit": not plan.gaps,
+        "discovery_source": plan.discovery_source,
+        "cache_last_fetched_at": plan.last_fetched_at,
+        "cached_windows": len(plan.cached_windows),
+        "uncovered_ranges": [{"from_date": f, "to_date": t} for f, t in plan.gaps],
+        "discovered": skipped + len(ids),
+        "resumed_after_meeting_id": resume_after_meeting_id,
+        "skipped": skipped,
+        "ingested": len(results),
+        "succeeded": counts["succeeded"],
+        "failed": counts["failed"],
+        "unchanged": counts["unchanged"],
+        "graph": graph,
+        "results": results,
+    }
 
 
 def ingest_range(
@@ -320,130 +614,131 @@ def ingest_range(
     store_raw: bool = True,
     use_recent_cache: bool = True,
     cache_ttl_minutes: int = 60,
+    concurrency: int = 1,
+    incremental: bool = False,
     progress_callback: Callable[[dict], None] | None = None,
+    resume_after_meeting_id: int | None = None,
 ):
-    cache_hit = False
-    discovery_source = "network"
-    cached_row: MeetingRangeDiscoveryCache | None = None
-    ids: list[int]
-    if use_recent_cache:
-        cached_ids, cached_row = _read_cached_meeting_ids(
-            db,
-            from_date=from_date,
-            to_date=to_date,
-            crawl=crawl,
-            chunk_days=chunk_days,
-            cache_ttl_minutes=cache_ttl_minutes,
-        )
-        if cached_ids is not None:
-            ids = cached_ids
-            cache_hit = True
-            discovery_source = "cache"
-        else:
-            ids = []
-    else:
-        ids = []
-
-    if not cache_hit:
-        if crawl:
-            ids = _collect_meeting_ids(from_date=from_date, to_date=to_date, chunk_days=chunk_days)
-        else:
-            meetings = cw.list_meetings(from_date, to_date)
-            ids = []
-            seen: set[int] = set()
-            for m in meetings:
-                mid = m.get("Id")
-                if isinstance(mid, int) and mid not in seen:
-                    seen.add(mid)
-                    ids.append(mid)
-        cached_row = _write_cached_meeting_ids(
-            db,
-            from_date=from_date,
-            to_date=to_date,
-            crawl=crawl,
-            chunk_days=chunk_days,
-            meeting_ids=ids,
-        )
-        db.commit()
+    plan = plan_discovery(
+        db,
+        from_date,
+        to_date,
+        cache_ttl_minutes=cache_ttl_minutes,
+        use_cache=use_recent_cache,
+    )
+    windows = _gap_windows(plan.gaps, crawl, chunk_days)
+    ids = resolve_discovery(
+        db,
+        plan,
+        _fetched_windows(windows, _list_windows(windows)),
+        crawl=crawl,
+        chunk_days=chunk_days,
+    )
+    db.commit()
 
     ids = ids[: max(limit, 0)]
+    # A resumed job skips everything up to its checkpoint; counts stay relative to the full list.
+    skipped = _checkpoint_offset(ids, resume_after_meeting_id)
+    ids = ids[skipped:]
+    total = skipped + len(ids)
+    progress = dict(discovery_source=plan.discovery_source, cache_hit=not plan.gaps)
     if progress_callback:
         progress_callback(
-            {
-                "stage": "discovered",
-                "discovered": len(ids),
-                "processed": 0,
-                "current_meeting_id": None,
-                "discovery_source": discovery_source,
-                "cache_hit": cache_hit,
-            }
+            _progress_event("discovered", discovered=total, processed=skipped, current_meeting_id=None, **progress)
         )
 
     results = []
-    succeeded = 0
-    failed = 0
-    for i, mid in enumerate(ids, start=1):
-        if progress_callback:
-            progress_callback(
-                {
-                    "stage": "ingesting",
-                    "discovered": len(ids),
-                    "processed": i - 1,
-                    "current_meeting_id": mid,
-                    "discovery_source": discovery_source,
-                    "cache_hit": cache_hit,
-                }
-            )
-        try:
-            result = ingest_meeting(db, mid, store_raw=store_raw)
+    counts = {"succeeded": 0, "failed": 0, "unchanged": 0}
+    known_fingerprints = _known_fingerprints(db, ids) if incremental else {}
+
+    # Fetch up to `concurrency` meetings ahead of the one being written; the session is
+    # only ever used from this thread, in discovery order.
+    concurrency = max(int(concurrency or 1), 1)
+    meeting_pool: ThreadPoolExecutor | None = None
+    attachment_pool: ThreadPoolExecutor | None = None
+    pending: dict[int, Future] = {}
+    if concurrency > 1:
+        meeting_pool = ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="ingest-meeting")
+        attachment_pool = ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="ingest-attachment")
+
+    try:
+        for i, mid in enumerate(ids, start=1):
+            if meeting_pool is not None:
+                for ahead in range(i - 1, min(i - 1 + concurrency, len(ids))):
+                    if ahead not in pending:
+                        pending[ahead] = meeting_pool.submit(
+                            fetch_meeting_payload,
+                            ids[ahead],
+                            attachment_executor=attachment_pool,
+                            known_fingerprint=known_fingerprints.get(ids[ahead]),
+                        )
+
+            if progress_callback:
+                progress_callback(
+                    _progress_event("ingesting", discovered=total, processed=skipped + i - 1, current_meeting_id=mid, **progress)
+                )
+            try:
+                if meeting_pool is not None:
+                    payload = pending.pop(i - 1).result()
+                else:
+                    payload = fetch_meeting_payload(mid, known_fingerprint=known_fingerprints.get(mid))
+                result = apply_meeting_payload(db, payload, store_raw=store_raw, defer_graph=True)
+            except Exception as exc:
+                db.rollback()
+                result = {"meeting_id": mid, "status": "error", "error": str(exc)}
             results.append(result)
-            if result.get("status") in {"ok", "no_agenda_html"}:
-                succeeded += 1
-            else:
-                failed += 1
-        except Exception as exc:
-            failed += 1
-            results.append({"meeting_id": mid, "status": "error", "error": str(exc)})
-
-        if progress_callback:
-            progress_callback(
-                {
-                    "stage": "ingesting",
-                    "discovered": len(ids),
-                    "processed": i,
-                    "current_meeting_id": mid,
-                    "discovery_source": discovery_source,
-                    "cache_hit": cache_hit,
-                }
-            )
+            _count_result(counts, result)
+
+            if progress_callback:
+                progress_callback(
+                    _progress_event(
+                        "ingesting",
+                        discovered=total,
+                        processed=skipped + i,
+                        current_meeting_id=mid,
+                        completed_meeting_id=mid,
+                        **progress,
+                    )
+                )
+    finally:
+        for future in pending.values():
+            future.cancel()
+        if meeting_pool is not None:
+            meeting_pool.shutdown(wait=True)
+        if attachment_pool is not None:
+            attachment_pool.shutdown(wait=True)
 
     if progress_callback:
         progress_callback(
-            {
-                "stage": "completed",
-                "discovered": len(ids),
-                "processed": len(ids),
-                "current_meeting_id": None,
-                "succeeded": succeeded,
-                "failed": failed,
-                "discovery_source": discovery_source,
-                "cache_hit": cache_hit,
-            }
+            _progress_event("graph", discovered=total, processed=total, current_meeting_id=None, **progress)
         )
+    graph = _rebuild_deferred_graphs(db)
 
-    return {
-        "from_date": from_date,
-        "to_date": to_date,
-        "crawl": crawl,
-        "chunk_days": chunk_days,
-        "use_recent_cache": use_recent_cache,
-        "cache_ttl_minutes": cache_ttl_minutes,
-        "cache_hit": cache_hit,
-        "discovery_source": discovery_source,
-        "cache_last_fetched_at": (cached_row.last_fetched_at if cached_row else ""),
-        "discovered": len(ids),
-        "ingested": len(results),
-        "succeeded": succeeded,
-        "failed": failed,
-        "results": results,
-    }
+    if progress_callback:
+        progress_callback(
+            _progress_event(
+                "completed",
+                discovered=total,
+                processed=total,
+                current_meeting_id=None,
+                succeeded=counts["succeeded"],
+                failed=counts["failed"],
+                **progress,
+            )
+        )
+
+    return _range_summary(
+        from_date=from_date,
+        to_date=to_date,
+        crawl=crawl,
+        chunk_days=chunk_days,
+        use_recent_cache=use_recent_cache,
+        cache_ttl_minutes=cache_ttl_minutes,
+        plan=plan,
+        ids=ids,
+        skipped=skipped,
+        resume_after_meeting_id=resume_after_meeting_id,
+        results=results,
+        counts=counts,
+        graph=graph,
+    )
@@ -0,0 +1,300 @@
+"""
+Asyncio-native ingest engine.
+
+Mirrors `app.ingest.ingest_range`, but every CivicWeb call and attachment download
+goes through the shared async HTTP client, so one event loop can hold many fetches
+in flight. CPU-bound work (agenda HTML parsing, PDF/HTML text extraction) and all
+SQLAlchemy session work run in worker threads via `asyncio.to_thread`; the session
+is still only touched by one thread at a time, in discovery order. Session work
+goes through `session_to_thread`, which lets a started call finish even when the
+ingest is cancelled, so the caller never closes the session under it.
+"""
+from __future__ import annotations
+
+import asyncio
+from typing import Any, Callable
+
+from sqlalchemy.orm import Session
+
+from .config import settings
+from .discovery_cache import DiscoveryPlan, plan_discovery, resolve_discovery
+from .document_fetch import fetch_document_async
+from .ingest import (
+    _attachments_by_document_id,
+    _checkpoint_offset,
+    _count_result,
+    _date_windows,
+    _extract_attachment,
+    _fetched_windows,
+    _find_agenda_html,
+    _gap_windows,
+    _known_fingerprints,
+    _meeting_payload,
+    _progress_event,
+    _range_summary,
+    _rebuild_deferred_graphs,
+    _unique_meeting_ids,
+    apply_meeting_payload,
+    payload_fingerprint,
+)
+from .leases import (
+    acquire_meeting_lease_async,
+    release_meeting_lease,
+    renew_meeting_leases_async,
+    try_acquire_meeting_lease,
+)
+from .parser import parse_agenda_html
+from .services.civicweb_client import CivicWebClient
+
+
+async def session_to_thread(func: Callable[..., Any], /, *args: Any, **kwargs: Any) -> Any:
+    """`asyncio.to_thread` for work on a shared session; cancellation waits for the thread to finish."""
+    work = asyncio.ensure_future(asyncio.to_thread(func, *args, **kwargs))
+    try:
+        return await asyncio.shield(work)
+    except asyncio.CancelledError:
+        await asyncio.wait({work})
+        raise
+
+
+def _default_client() -> CivicWebClient:
+    return CivicWebClient(base_url=settings.civicweb_base_url)
+
+
+async def _list_windows_async(
+    client: CivicWebClient,
+    windows: list[tuple[str, str]],
+    concurrency: int | None = None,
+) -> list[list[dict]]:
+    sem = asyncio.Semaphore(max(int(concurrency or settings.ingest_discovery_concurrency), 1))
+
+    async def _list(window: tuple[str, str]) -> list[dict]:
+        async with sem:
+            return await client.list_meetings(date_from=window[0], date_to=window[1])
+
+    # gather() keeps window order, so ID order matches the serial crawl.
+    return list(await asyncio.gather(*(_list(w) for w in windows)))
+
+
+async def collect_meeting_ids_async(
+    client: CivicWebClient,
+    from_date: str,
+    to_date: str,
+    chunk_days: int = 31,
+    *,
+    concurrency: int | None = None,
+) -> list[int]:
+    windows = _date_windows(from_date, to_date, chunk_days)
+    return _unique_meeting_ids(await _list_windows_async(client, windows, concurrency))
+
+
+async def _fetch_attachment_async(att: dict, sem: asyncio.Semaphore) -> dict:
+    async with sem:
+        fetched = await fetch_document_async(att.get("url", "") or "")
+    return await asyncio.to_thread(_extract_attachment, att, fetched)
+
+
+async def fetch_meeting_payload_async(
+    client: CivicWebClient,
+    meeting_id: int,
+    *,
+    attachment_sem: asyncio.Semaphore,
+    known_fingerprint: str | None = None,
+) -> dict:
+    """Async counterpart of `app.ingest.fetch_meeting_payload`; same payload shape."""
+    meeting_data, docs = await asyncio.gather(
+        client.get_meeting_data(meeting_id),
+        client.get_meeting_documents(meeting_id),
+    )
+    fingerprint = payload_fingerprint(meeting_data, docs)
+    if known_fingerprint and known_fingerprint == fingerprint:
+        return {"meeting_id": meeting_id, "fingerprint": fingerprint, "unchanged": True}
+
+    agenda_html = _find_agenda_html(docs)
+    parsed_items = await asyncio.to_thread(parse_agenda_html, agenda_html) if agenda_html else []
+    attachments = _attachments_by_document_id(parsed_items)
+    results = await asyncio.gather(
+        *(_fetch_attachment_async(att, attachment_sem) for att in attachments.values())
+    )
+    return _meeting_payload(
+        meeting_id,
+        fingerprint=fingerprint,
+        meeting_data=meeting_data,
+        docs=docs,
+        agenda_html=agenda_html,
+        parsed_items=parsed_items,
+        extractions=dict(zip(attachments.keys(), results)),
+    )
+
+
+def _resolve_and_commit(db: Session, plan: DiscoveryPlan, fetched, **kwargs) -> list[int]:
+    ids = resolve_discovery(db, plan, fetched, **kwargs)
+    db.commit()
+    return ids
+
+
+async def ingest_range_async(
+    db: Session,
+    from_date: str,
+    to_date: str,
+    limit: int = 50,
+    crawl: bool = True,
+    chunk_days: int = 31,
+    store_raw: bool = True,
+    use_recent_cache: bool = True,
+    cache_ttl_minutes: int = 60,
+    concurrency: int = 1,
+    incremental: bool = False,
+    progress_callback: Callable[[dict], None] | None = None,
+    resume_after_meeting_id: int | None = None,
+    lease_holder: str | None = None,
+    client: CivicWebClient | None = None,
+):
+    client = client or _default_client()
+    concurrency = max(int(concurrency or 1), 1)
+
+    plan = await session_to_thread(
+        plan_discovery,
+        db,
+        from_date,
+        to_date,
+        cache_ttl_minutes=cache_ttl_minutes,
+        use_cache=use_recent_cache,
+    )
+    windows = _gap_windows(plan.gaps, crawl, chunk_days)
+    meeting_lists = await _list_windows_async(client, windows)
+    ids = await session_to_thread(
+        _resolve_and_commit,
+        db,
+        plan,
+        _fetched_windows(windows, meeting_lists),
+        crawl=crawl,
+        chunk_days=chunk_days,
+    )
+
+    ids = ids[: max(limit, 0)]
+    # A resumed job skips everything up to its checkpoint; counts stay relative to the full list.
+    skipped = _checkpoint_offset(ids, resume_after_meeting_id)
+    ids = ids[skipped:]
+    total = skipped + len(ids)
+    progress = dict(discovery_source=plan.discovery_source, cache_hit=not plan.gaps)
+    if progress_callback:
+        progress_callback(
+            _progress_event("discovered", discovered=total, processed=skipped, current_meeting_id=None, **progress)
+        )
+
+    known_fingerprints = await session_to_thread(_known_fingerprints, db, ids) if incremental else {}
+    attachment_sem = asyncio.Semaphore(concurrency)
+    results: list[dict] = []
+    counts = {"succeeded": 0, "failed": 0, "unchanged": 0}
+    pending: dict[int, asyncio.Task] = {}
+    bind = db.get_bind()
+    held: set[int] = set()  # meeting ids whose leases this call holds, renewed while it runs
+    renewer = asyncio.create_task(renew_meeting_leases_async(bind, held, lease_holder)) if lease_holder else None
+
+    async def _lease(index: int, *, wait: bool) -> bool:
+        if lease_holder is None:
+            return True
+        if wait:
+            await acquire_meeting_lease_async(bind, ids[index], lease_holder)
+        elif not await asyncio.to_thread(try_acquire_meeting_lease, bind, ids[index], lease_holder):
+            return False
+        held.add(ids[index])
+        return True
+
+    async def _release(index: int) -> None:
+        if lease_holder is not None:
+            held.discard(ids[index])
+            await asyncio.to_thread(release_meeting_lease, bind, ids[index], lease_holder)
+
+    try:
+        for i, mid in enumerate(ids, start=1):
+            # Keep up to `concurrency` meetings fetching ahead of the one being written. Prefetched
+            # leases are taken without waiting and stop at the first busy meeting, so `pending` is
+            # always a contiguous run from the current meeting: a job only ever blocks on a lease
+            # while holding none, which rules out deadlock between overlapping jobs.
+            for ahead in range(i - 1, min(i - 1 + concurrency, len(ids))):
+                if ahead in pending:
+                    continue
+                if not await _lease(ahead, wait=ahead == i - 1):
+                    break
+                pending[ahead] = asyncio.create_task(
+                    fetch_meeting_payload_async(
+                        client,
+                        ids[ahead],
+                        attachment_sem=attachment_sem,
+                        known_fingerprint=known_fingerprints.get(ids[ahead]),
+                    )
+                )
+
+            if progress_callback:
+                progress_callback(
+                    _progress_event("ingesting", discovered=total, processed=skipped + i - 1, current_meeting_id=mid, **progress)
+                )
+            try:
+                payload = await pending.pop(i - 1)
+                result = await session_to_thread(apply_meeting_payload, db, payload, store_raw, True)
+            except Exception as exc:
+                await session_to_thread(db.rollback)
+                result = {"meeting_id": mid, "status": "error", "error": str(exc)}
+            finally:
+                await _release(i - 1)
+            results.append(result)
+            _count_result(counts, result)
+
+            if progress_callback:
+                progress_callback(
+                    _progress_event(
+                        "ingesting",
+                        discovered=total,
+                        processed=skipped + i,
+                        current_meeting_id=mid,
+                        completed_meeting_id=mid,
+                        **progress,
+                    )
+                )
+    finally:
+        for task in pending.values():
+            task.cancel()
+        if pending:
+            await asyncio.gather(*pending.values(), return_exceptions=True)
+        for index in pending:
+            await _release(index)
+        if renewer is not None:
+            renewer.cancel()
+            await asyncio.gather(renewer, return_exceptions=True)
+
+    if progress_callback:
+        progress_callback(
+            _progress_event("graph", discovered=total, processed=total, current_meeting_id=None, **progress)
+        )
+    graph = await session_to_thread(_rebuild_deferred_graphs, db)
+
+    if progress_callback:
+        progress_callback(
+            _progress_event(
+                "completed",
+                discovered=total,
+                processed=total,
+                current_meeting_id=None,
+                succeeded=counts["succeeded"],
+                failed=counts["failed"],
+                **progress,
+            )
+        )
+
+    return _range_summary(
+        from_date=from_date,
+        to_date=to_date,
+        crawl=crawl,
+        chunk_days=chunk_days,
+        use_recent_cache=use_recent_cache,
+        cache_ttl_minutes=cache_ttl_minutes,
+        plan=plan,
+        ids=ids,
+        skipped=skipped,
+        resume_after_meeting_id=resume_after_meeting_id,
+        results=results,
+        counts=counts,
+        graph=graph,
+    )
@@ -1,112 +1,397 @@
 from __future__ import annotations
 
+import asyncio
+import heapq
+import json
 import threading
 import time
 import uuid
 from typing import Any
 
+from sqlalchemy.orm import Session
+
+from .config import settings
 from .db import SessionLocal
-from .ingest import ingest_range
+from .ingest import ingest_meeting
+from .ingest_async import ingest_range_async, session_to_thread
+from .leases import meeting_lease
+from .models import IngestJob, IngestJobSchedule
+
+ACTIVE_STATUSES = ("queued", "running")
+FINISHED_STATUSES = ("completed", "failed")
 
+# Lower runs first. Interactive single-meeting refreshes jump ahead of bulk range backfills.
+PRIORITY_INTERACTIVE = 0
+PRIORITY_BULK = 10
 
-_jobs: dict[str, dict[str, Any]] = {}
-_lock = threading.Lock()
+_tasks: set[asyncio.Task] = set()
 
 
 def _now() -> float:
     return time.time()
 
 
-def create_ingest_job(params: dict[str, Any]) -> str:
+def _session() -> Session:
+    return SessionLocal()
+
+
+def _loads(raw: str, default: Any) -> Any:
+    try:
+        return json.loads(raw) if raw else default
+    except json.JSONDecodeError:
+        return default
+
+
+def _job_dict(row: IngestJob, schedule: IngestJobSchedule | None) -> dict[str, Any]:
+    return {
+        "job_id": row.job_id,
+        "kind": (schedule.kind if schedule else "") or "range",
+        "priority": int(schedule.priority) if schedule and schedule.priority is not None else PRIORITY_BULK,
+        "status": row.status,
+        "created_at": row.created_at,
+        "updated_at": row.updated_at,
+        "params": _loads(row.params_json, {}),
+        "progress": _loads(row.progress_json, {}),
+        "result": _loads(row.result_json, None),
+        "error": row.error or None,
+        "checkpoint_meeting_id": row.checkpoint_meeting_id,
+        "attempts": int(row.attempts or 0),
+    }
+
+
+def create_ingest_job(params: dict[str, Any], *, kind: str = "range", priority: int = PRIORITY_BULK) -> str:
     job_id = uuid.uuid4().hex
-    with _lock:
-        _jobs[job_id] = {
-            "job_id": job_id,
-            "status": "queued",
-            "created_at": _now(),
-            "updated_at": _now(),
-            "params": params,
-            "progress": {
-                "stage": "queued",
-                "discovered": 0,
-                "processed": 0,
-                "current_meeting_id": None,
-                "succeeded": 0,
-                "failed": 0,
-            },
-            "result": None,
-            "error": None,
-        }
+    now = _now()
+    with _session() as db:
+        db.add(
+            IngestJob(
+                job_id=job_id,
+                status="queued",
+                params_json=json.dumps(params, ensure_ascii=True, sort_keys=True),
+                progress_json=json.dumps(
+                    {
+                        "stage": "queued",
+                        "discovered": 0,
+                        "processed": 0,
+                        "current_meeting_id": None,
+                        "succeeded": 0,
+                        "failed": 0,
+                    }
+                ),
+                created_at=now,
+                updated_at=now,
+            )
+        )
+        db.add(IngestJobSchedule(job_id=job_id, kind=kind, priority=int(priority)))
+        purge_finished_jobs(db)
+        db.commit()
     return job_id
 
 
 def get_job(job_id: str) -> dict[str, Any] | None:
-    with _lock:
-        job = _jobs.get(job_id)
-        if not job:
-            return None
-        return dict(job)
+    with _session() as db:
+        row = db.get(IngestJob, job_id)
+        return _job_dict(row, db.get(IngestJobSchedule, job_id)) if row else None
 
 
-def count_active_jobs() -> int:
-    with _lock:
-        return sum(1 for job in _jobs.values() if job.get("status") in {"queued", "running"})
+def _jobs_of_kind(db: Session, kind: str | None):
+    query = db.query(IngestJob)
+    if kind is None:
+        return query
+    query = query.outerjoin(IngestJobSchedule, IngestJobSchedule.job_id == IngestJob.job_id)
+    if kind == "range":
+        return query.filter((IngestJobSchedule.kind == "range") | (IngestJobSchedule.job_id.is_(None)))
+    return query.filter(IngestJobSchedule.kind == kind)
 
 
-def most_recent_job_created_at() -> float | None:
-    with _lock:
-        created = [float(job.get("created_at", 0.0) or 0.0) for job in _jobs.values()]
-    if not created:
-        return None
-    return max(created)
+def count_active_jobs(kind: str | None = None) -> int:
+    with _session() as db:
+        return _jobs_of_kind(db, kind).filter(IngestJob.status.in_(ACTIVE_STATUSES)).count()
+
+
+def most_recent_job_created_at(kind: str | None = None) -> float | None:
+    with _session() as db:
+        row = _jobs_of_kind(db, kind).order_by(IngestJob.created_at.desc()).first()
+        return float(row.created_at) if row else None
 
 
 def _update_job(job_id: str, **fields: Any) -> None:
-    with _lock:
-        job = _jobs.get(job_id)
-        if not job:
+    with _session() as db:
+        row = db.get(IngestJob, job_id)
+        if not row:
             return
-        job.update(fields)
-        job["updated_at"] = _now()
+        if "progress" in fields:
+            row.progress_json = json.dumps(fields.pop("progress"), ensure_ascii=True)
+        if "result" in fields:
+            row.result_json = json.dumps(fields.pop("result"), ensure_ascii=True)
+        for key, value in fields.items():
+            setattr(row, key, value)
+        row.updated_at = _now()
+        db.commit()
+
+
+def purge_finished_jobs(db: Session, *, retention_hours: float | None = None) -> int:
+    """Delete completed/failed jobs last updated more than the retention period ago; caller commits."""
+    hours = settings.ingest_job_retention_hours if retention_hours is None else retention_hours
+    cutoff = _now() - max(hours, 0) * 3600
+    expired = [
+        job_id
+        for (job_id,) in db.query(IngestJob.job_id)
+        .filter(IngestJob.status.in_(FINISHED_STATUSES), IngestJob.updated_at < cutoff)
+        .all()
+    ]
+    if not expired:
+        return 0
+    db.query(IngestJobSchedule).filter(IngestJobSchedule.job_id.in_(expired)).delete(synchronize_session=False)
+    return db.query(IngestJob).filter(IngestJob.job_id.in_(expired)).delete(synchronize_session=False)
+
+
+def resume_interrupted_jobs() -> list[str]:
+    """
+    Requeue jobs a previous process left queued or running and start them again.
+
+    Called once at startup, before any new job can be created, so every active row
+    belongs to a dead process. Each resumed job continues after its checkpoint.
+    """
+    resumed: list[str] = []
+    with _session() as db:
+        purge_finished_jobs(db)
+        rows = db.query(IngestJob).filter(IngestJob.status.in_(ACTIVE_STATUSES)).order_by(IngestJob.created_at).all()
+        for row in rows:
+            if int(row.attempts or 0) >= settings.ingest_job_max_attempts:
+                row.status = "failed"
+                row.error = "interrupted_too_many_times"
+            else:
+                row.status = "queued"
+                progress = _loads(row.progress_json, {})
+                progress["stage"] = "resuming"
+                row.progress_json = json.dumps(progress, ensure_ascii=True)
+                resumed.append(row.job_id)
+            row.updated_at = _now()
+        db.commit()
+    for job_id in resumed:
+        start_ingest_job(job_id)
+    return resumed
+
+
+class JobScheduler:
+    """
+    Priority dispatcher over a fixed number of job slots on the app's event loop.
+
+    Queued jobs run lowest `priority` first (FIFO within a priority). Bulk jobs may
+    fill at most `workers - interactive_reserve` slots, so an interactive job always
+    has a slot to start in even while long backfills are running.
+    """
+
+    def __init__(self, workers: int, interactive_reserve: int):
+        self.workers = max(int(workers), 1)
+        self.bulk_slots = max(self.workers - max(int(interactive_reserve), 0), 1)
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._heap: list[tuple[int, float, int, str]] = []
+        self._seq = 0
+        self._running: dict[str, tuple[asyncio.Task, bool]] = {}
+
+    def start(self) -> None:
+        self._loop = asyncio.get_running_loop()
+
+    async def stop(self) -> None:
+        self._heap.clear()  # queued jobs stay `queued` in the database
+        tasks = [task for task, _bulk in self._running.values()]
+        for task in tasks:
+            task.cancel()
+        if tasks:
+            # Cancelled jobs stay `running` in the database and resume on the next start.
+            await asyncio.gather(*tasks, return_exceptions=True)
+        self._loop = None
+
+    @property
+    def started(self) -> bool:
+        return self._loop is not None
+
+    def submit(self, job_id: str, priority: int, created_at: float) -> None:
+        assert self._loop is not None
+        self._loop.call_soon_threadsafe(self._push, job_id, priority, created_at)
+
+    def _push(self, job_id: str, priority: int, created_at: float) -> None:
+        self._seq += 1
+        heapq.heappush(self._heap, (int(priority), float(created_at), self._seq, job_id))
+        self._dispatch()
+
+    def _dispatch(self) -> None:
+        while self._heap and len(self._running) < self.workers:
+            priority, _created, _seq, job_id = self._heap[0]
+            bulk = priority >= PRIORITY_BULK
+            if bulk and sum(1 for _task, is_bulk in self._running.values() if is_bulk) >= self.bulk_slots:
+                # Everything still queued is bulk too (the heap is priority ordered).
+                return
+            heapq.heappop(self._heap)
+            task = self._loop.create_task(_run_ingest_job(job_id))
+            self._running[job_id] = (task, bulk)
+            task.add_done_callback(lambda _t, job_id=job_id: self._finished(job_id))
+
+    def _finished(self, job_id: str) -> None:
+        self._running.pop(job_id, None)
+        if self._loop is not None:
+            self._dispatch()
+
+    def snapshot(self) -> dict[str, Any]:
+        return {
+            "workers": self.workers,
+            "bulk_slots": self.bulk_slots,
+            "running": sorted(self._running),
+            "queued": [job_id for _p, _c, _s, job_id in sorted(self._heap)],
+        }
+
+
+_scheduler: JobScheduler | None = None
+
+
+def start_job_scheduler() -> JobScheduler:
+    global _scheduler
+    _scheduler = JobScheduler(settings.ingest_job_workers, settings.ingest_job_interactive_reserve)
+    _scheduler.start()
+    return _scheduler
+
+
+async def stop_job_scheduler() -> None:
+    global _scheduler
+    scheduler, _scheduler = _scheduler, None
+    if scheduler is not None:
+        await scheduler.stop()
 
 
 def start_ingest_job(job_id: str) -> None:
-    thread = threading.Thread(target=_run_ingest_job, args=(job_id,), daemon=True)
-    thread.start()
+    """Queue the job on the app scheduler; without one, run it directly on the caller's loop."""
+    if _scheduler is not None and _scheduler.started:
+        job = get_job(job_id)
+        if job:
+            _scheduler.submit(job_id, job["priority"], job["created_at"])
+        return
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        # No loop (scripts, shells): run the same coroutine to completion in a helper thread.
+        threading.Thread(target=asyncio.run, args=(_run_ingest_job(job_id),), daemon=True).start()
+        return
+    task = loop.create_task(_run_ingest_job(job_id))
+    _tasks.add(task)
+    task.add_done_callback(_tasks.discard)
+
+
+class _ProgressWriter:
+    """
+    Writes one job's progress updates in order from a single task, off the event loop.
 
+    Updates that arrive while a write is in flight are merged into the next write. A
+    failed write (say, a locked database) is retried merged with the next update
+    rather than failing the job; `close` makes the final write.
+    """
 
-def _run_ingest_job(job_id: str) -> None:
-    job = get_job(job_id)
+    def __init__(self, job_id: str):
+        self.job_id = job_id
+        self._pending: dict[str, Any] | None = None
+        self._wake = asyncio.Event()
+        self._closed = False
+        self._task = asyncio.get_running_loop().create_task(self._run())
+
+    def put(self, **fields: Any) -> None:
+        self._pending = {**(self._pending or {}), **fields}
+        self._wake.set()
+
+    async def _run(self) -> None:
+        while True:
+            if not self._closed:
+                await self._wake.wait()
+            self._wake.clear()
+            fields, self._pending = self._pending, None
+            if fields:
+                try:
+                    await asyncio.to_thread(_update_job, self.job_id, **fields)
+                except Exception:
+                    if not self._closed:
+                        self._pending = {**fields, **(self._pending or {})}
+            if self._closed and self._pending is None:
+                return
+
+    async def close(self) -> None:
+        self._closed = True
+        self._wake.set()
+        await self._task
+
+
+def _ingest_meeting_leased(db: Session, job_id: str, params: dict[str, Any]) -> dict:
+    meeting_id = int(params["meeting_id"])
+    with meeting_lease(db.get_bind(), meeting_id, job_id):
+        return ingest_meeting(
+            db,
+            meeting_id,
+            store_raw=params.get("store_raw", True),
+            incremental=params.get("incremental", False),
+        )
+
+
+async def _run_ingest_job(job_id: str) -> None:
+    job = await asyncio.to_thread(get_job, job_id)
     if not job:
         return
 
     params = job["params"]
-    _update_job(job_id, status="running", progress={**job["progress"], "stage": "running"})
+    progress_state = {**job["progress"], "stage": "running"}
+    checkpoint = job["checkpoint_meeting_id"]
+    await asyncio.to_thread(
+        _update_job,
+        job_id,
+        status="running",
+        attempts=job["attempts"] + 1,
+        progress=progress_state,
+    )
+
+    writer = _ProgressWriter(job_id)
 
     def progress_callback(progress: dict[str, Any]) -> None:
-        current = get_job(job_id)
-        if not current:
-            return
-        merged = dict(current["progress"])
-        merged.update(progress)
-        _update_job(job_id, progress=merged)
+        progress_state.update(progress)
+        fields: dict[str, Any] = {"progress": dict(progress_state)}
+        if progress.get("completed_meeting_id") is not None:
+            fields["checkpoint_meeting_id"] = progress["completed_meeting_id"]
+        writer.put(**fields)
 
     db = SessionLocal()
     try:
-        result = ingest_range(
-            db=db,
-            from_date=params["from_date"],
-            to_date=params["to_date"],
-            limit=params.get("limit", 50),
-            crawl=params.get("crawl", True),
-            chunk_days=params.get("chunk_days", 31),
-            store_raw=params.get("store_raw", True),
-            use_recent_cache=params.get("use_recent_cache", True),
-            cache_ttl_minutes=params.get("cache_ttl_minutes", 60),
-            progress_callback=progress_callback,
-        )
-        _update_job(job_id, status="completed", result=result)
+        if job["kind"] == "meeting":
+            result = await session_to_thread(_ingest_meeting_leased, db, job_id, params)
+            progress_callback(
+                {
+                    "stage": "completed",
+                    "discovered": 1,
+                    "processed": 1,
+                    "current_meeting_id": None,
+                    "completed_meeting_id": result.get("meeting_id"),
+                }
+            )
+        else:
+            result = await ingest_range_async(
+                db=db,
+                from_date=params["from_date"],
+                to_date=params["to_date"],
+                limit=params.get("limit", 50),
+                crawl=params.get("crawl", True),
+                chunk_days=params.get("chunk_days", 31),
+                store_raw=params.get("store_raw", True),
+                use_recent_cache=params.get("use_recent_cache", True),
+                cache_ttl_minutes=params.get("cache_ttl_minutes", 60),
+                concurrency=params.get("concurrency", 1),
+                incremental=params.get("incremental", False),
+                progress_callback=progress_callback,
+                resume_after_meeting_id=checkpoint,
+                lease_holder=job_id,
+            )
     except Exception as exc:
-        _update_job(job_id, status="failed", error=str(exc))
+        outcome: dict[str, Any] = {"status": "failed", "error": str(exc)}
+    else:
+        outcome = {"status": "completed", "result": result}
     finally:
-        db.close()
+        # Progress (and the checkpoint) is written before the final status, and also when cancelled.
+        await writer.close()
+        # session_to_thread has let any session call already running finish, even when cancelled.
+        await asyncio.to_thread(db.close)
+    await asyncio.to_thread(_update_job, job_id, **outcome)
@@ -0,0 +1,130 @@
+"""
+Per-meeting ingest leases.
+
+A lease row says "this job (or request) is ingesting this meeting until
+`expires_at`". Overlapping jobs take a meeting's lease before fetching it and
+release it after the write commits, so two jobs never ingest one meeting at the
+same time. Leases expire on their own, so a crashed holder can't block a meeting
+forever; a live holder renews its leases every third of `meeting_lease_seconds`,
+so a long fetch never outlasts its lease. Each call uses its own short session
+on the caller's engine, separate from the ingest session.
+"""
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from contextlib import contextmanager
+from typing import Iterable, Iterator
+
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from .config import settings
+from .models import MeetingIngestLease
+
+LEASE_POLL_SECONDS = 0.5
+
+
+def try_acquire_meeting_lease(bind: Engine, meeting_id: int, holder: str) -> bool:
+    """Take (or renew) the lease unless another holder has an unexpired one."""
+    now = time.time()
+    expires_at = now + settings.meeting_lease_seconds
+    with Session(bind=bind) as db:
+        taken = (
+            db.query(MeetingIngestLease)
+            .filter(
+                MeetingIngestLease.meeting_id == meeting_id,
+                (MeetingIngestLease.holder == holder) | (MeetingIngestLease.expires_at < now),
+            )
+            .update({"holder": holder, "expires_at": expires_at}, synchronize_session=False)
+        )
+        if taken:
+            db.commit()
+            return True
+        db.add(MeetingIngestLease(meeting_id=meeting_id, holder=holder, expires_at=expires_at))
+        try:
+            db.commit()
+        except IntegrityError:
+            db.rollback()
+            return False  # someone else holds it
+        return True
+
+
+def release_meeting_lease(bind: Engine, meeting_id: int, holder: str) -> None:
+    with Session(bind=bind) as db:
+        db.query(MeetingIngestLease).filter(
+            MeetingIngestLease.meeting_id == meeting_id,
+            MeetingIngestLease.holder == holder,
+        ).delete(synchronize_session=False)
+        db.commit()
+
+
+def renew_meeting_leases(bind: Engine, meeting_ids: Iterable[int], holder: str) -> None:
+    """Push back the expiry of whichever of these leases `holder` still has."""
+    meeting_ids = list(meeting_ids)
+    if not meeting_ids:
+        return
+    with Session(bind=bind) as db:
+        db.query(MeetingIngestLease).filter(
+            MeetingIngestLease.meeting_id.in_(meeting_ids),
+            MeetingIngestLease.holder == holder,
+        ).update({"expires_at": time.time() + settings.meeting_lease_seconds}, synchronize_session=False)
+        db.commit()
+
+
+def _renew_interval() -> float:
+    return settings.meeting_lease_seconds / 3
+
+
+async def renew_meeting_leases_async(bind: Engine, meeting_ids: set[int], holder: str) -> None:
+    """Renew the leases in `meeting_ids`, a set the caller keeps current, until cancelled."""
+    while True:
+        await asyncio.sleep(_renew_interval())
+        try:
+            await asyncio.to_thread(renew_meeting_leases, bind, tuple(meeting_ids), holder)
+        except Exception:
+            pass  # a busy database; the next renewal is still well before expiry
+
+
+def _renew_until(stop: threading.Event, bind: Engine, meeting_id: int, holder: str) -> None:
+    while not stop.wait(_renew_interval()):
+        try:
+            renew_meeting_leases(bind, (meeting_id,), holder)
+        except Exception:
+            pass  # a busy database; the next renewal is still well before expiry
+
+
+async def acquire_meeting_lease_async(bind: Engine, meeting_id: int, holder: str) -> None:
+    while not await asyncio.to_thread(try_acquire_meeting_lease, bind, meeting_id, holder):
+        await asyncio.sleep(LEASE_POLL_SECONDS)
+
+
+@contextmanager
+def meeting_lease(
+    bind: Engine, meeting_id: int, holder: str, *, wait_seconds: float | None = None
+) -> Iterator[None]:
+    """
+    Blocking variant for synchronous callers such as `/ingest/meeting/{id}`.
+
+    Raises `TimeoutError` when another holder keeps the lease for longer than
+    `wait_seconds` (None waits indefinitely). The lease is renewed from a helper
+    thread while the block runs.
+    """
+    deadline = None if wait_seconds is None else time.monotonic() + wait_seconds
+    while not try_acquire_meeting_lease(bind, meeting_id, holder):
+        if deadline is not None and time.monotonic() >= deadline:
+            raise TimeoutError(f"meeting {meeting_id} is being ingested by another holder")
+        time.sleep(LEASE_POLL_SECONDS)
+    stop = threading.Event()
+    renewer = threading.Thread(
+        target=_renew_until, args=(stop, bind, meeting_id, holder), name=f"lease-{meeting_id}", daemon=True
+    )
+    renewer.start()
+    try:
+        yield
+    finally:
+        stop.set()
+        renewer.join()
+        release_meeting_lease(bind, meeting_id, holder)
@@ -1,3 +1,5 @@
+import uuid
+from contextlib import ExitStack, asynccontextmanager
 from datetime import datetime
 
 from fastapi import FastAPI, Depends, HTTPException
@@ -6,20 +8,40 @@ from fastapi.staticfiles import StaticFiles
 from sqlalchemy.orm import Session
 
 from .api.routes import router as api_router
+from . import content_search  # noqa: F401  registers the FTS5 index with create_all below
+from .catchup import start_startup_catchup
+from .config import settings
 from .db import Base, engine, get_db
-from .ingest import ingest_meeting, ingest_range
-from .jobs import create_ingest_job, get_job, start_ingest_job, count_active_jobs, most_recent_job_created_at
+from .http_client import close_http_clients, start_http_clients
+from .ingest import ingest_meeting
+from .ingest_async import ingest_range_async
+from .jobs import (
+    PRIORITY_INTERACTIVE,
+    create_ingest_job,
+    get_job,
+    start_ingest_job,
+    count_active_jobs,
+    most_recent_job_created_at,
+    resume_interrupted_jobs,
+    start_job_scheduler,
+    stop_job_scheduler,
+)
+from .leases import meeting_lease
+from .pdf_worker import shutdown_pdf_workers
 
 MAX_INGEST_RANGE_DAYS = 180
+# Range jobs queue behind each other on the scheduler; these only bound the backlog.
 INGEST_JOB_COOLDOWN_SECONDS = 10
-MAX_ACTIVE_INGEST_JOBS = 1
+MAX_ACTIVE_INGEST_JOBS = 4
+MAX_ACTIVE_MEETING_JOBS = 20
+MAX_INGEST_CONCURRENCY = 8
 
 
 def _parse_iso_date(s: str):
     return datetime.strptime(s, "%Y-%m-%d").date()
 
 
-def _validate_ingest_range_request(from_date: str, to_date: str):
+def _validate_ingest_range_request(from_date: str, to_date: str, concurrency: int = 1):
     try:
         start = _parse_iso_date(from_date)
         end = _parse_iso_date(to_date)
@@ -30,13 +52,15 @@ def _validate_ingest_range_request(from_date: str, to_date: str):
     span = (end - start).days + 1
     if span > MAX_INGEST_RANGE_DAYS:
         raise HTTPException(status_code=400, detail=f"date_range_too_large_max_{MAX_INGEST_RANGE_DAYS}_days")
+    if concurrency < 1 or concurrency > MAX_INGEST_CONCURRENCY:
+        raise HTTPException(status_code=400, detail=f"concurrency_must_be_between_1_and_{MAX_INGEST_CONCURRENCY}")
 
 
 def _enforce_ingest_job_throttle():
-    active = count_active_jobs()
+    active = count_active_jobs(kind="range")
     if active >= MAX_ACTIVE_INGEST_JOBS:
         raise HTTPException(status_code=429, detail="ingest_job_limit_reached_try_again_later")
-    latest = most_recent_job_created_at()
+    latest = most_recent_job_created_at(kind="range")
     if latest is not None:
         delta = datetime.now().timestamp() - float(latest)
         if delta < INGEST_JOB_COOLDOWN_SECONDS:
@@ -47,7 +71,22 @@ def _enforce_ingest_job_throttle():
 
 Base.metadata.create_all(bind=engine)
 
-app = FastAPI(title="CivicWatch (Urbandale)")
+
+@asynccontextmanager
+async def lifespan(_app: FastAPI):
+    start_http_clients()
+    start_job_scheduler()
+    resume_interrupted_jobs()
+    start_startup_catchup()
+    try:
+        yield
+    finally:
+        await stop_job_scheduler()
+        await close_http_clients()
+        shutdown_pdf_workers()
+
+
+app = FastAPI(title="CivicWatch (Urbandale)", lifespan=lifespan)
 app.include_router(api_router)
 app.mount("/static", StaticFiles(directory="app/static"), name="static")
 
@@ -62,11 +101,46 @@ def ui_app():
     return FileResponse("app/static/index.html")
 
 @app.post("/ingest/meeting/{meeting_id}")
-def ingest_one(meeting_id: int, store_raw: bool = True, db: Session = Depends(get_db)):
-    return ingest_meeting(db, meeting_id, store_raw=store_raw)
+def ingest_one(
+    meeting_id: int,
+    store_raw: bool = True,
+    incremental: bool = False,
+    db: Session = Depends(get_db),
+):
+    with ExitStack() as stack:
+        try:
+            stack.enter_context(
+                meeting_lease(
+                    db.get_bind(),
+                    meeting_id,
+                    f"request-{uuid.uuid4().hex}",
+                    wait_seconds=settings.meeting_lease_wait_seconds,
+                )
+            )
+        except TimeoutError:
+            # A job is ingesting this meeting; don't hold a worker thread until it finishes.
+            raise HTTPException(status_code=409, detail="meeting_ingest_in_progress")
+        return ingest_meeting(db, meeting_id, store_raw=store_raw, incremental=incremental)
+
+
+@app.post("/ingest/meeting/{meeting_id}/job")
+def ingest_meeting_job(
+    meeting_id: int,
+    store_raw: bool = True,
+    incremental: bool = False,
+):
+    if count_active_jobs(kind="meeting") >= MAX_ACTIVE_MEETING_JOBS:
+        raise HTTPException(status_code=429, detail="ingest_job_limit_reached_try_again_later")
+    job_id = create_ingest_job(
+        {"meeting_id": meeting_id, "store_raw": store_raw, "incremental": incremental},
+        kind="meeting",
+        priority=PRIORITY_INTERACTIVE,
+    )
+    start_ingest_job(job_id)
+    return {"job_id": job_id, "status": "queued"}
 
 @app.post("/ingest/range")
-def ingest_dates(
+async def ingest_dates(
     from_date: str,
     to_date: str,
     limit: int = 50,
@@ -75,10 +149,12 @@ def ingest_dates(
     store_raw: bool = True,
     use_recent_cache: bool = True,
     cache_ttl_minutes: int = 60,
+    concurrency: int = 1,
+    incremental: bool = False,
     db: Session = Depends(get_db),
 ):
-    _validate_ingest_range_request(from_date, to_date)
-    return ingest_range(
+    _validate_ingest_range_request(from_date, to_date, concurrency)
+    return await ingest_range_async(
         db,
         from_date,
         to_date,
@@ -88,6 +164,8 @@ def ingest_dates(
         store_raw=store_raw,
         use_recent_cache=use_recent_cache,
         cache_ttl_minutes=cache_ttl_minutes,
+        concurrency=concurrency,
+        incremental=incremental,
     )
 
 
@@ -101,8 +179,10 @@ def ingest_range_job(
     store_raw: bool = True,
     use_recent_cache: bool = True,
     cache_ttl_minutes: int = 60,
+    concurrency: int = 1,
+    incremental: bool = False,
 ):
-    _validate_ingest_range_request(from_date, to_date)
+    _validate_ingest_range_request(from_date, to_date, concurrency)
     _enforce_ingest_job_throttle()
     job_id = create_ingest_job(
         {
@@ -114,6 +194,8 @@ def ingest_range_job(
             "store_raw": store_raw,
             "use_recent_cache": use_recent_cache,
             "cache_ttl_minutes": cache_ttl_minutes,
+            "concurrency": concurrency,
+            "incremental": incremental,
         }
     )
     start_ingest_job(job_id)
@@ -1,11 +1,11 @@
-import io
 import re
 from datetime import datetime
 
-import requests
 from sqlalchemy.orm import Session
 
+from .document_fetch import FetchedDocument, fetch_document
 from .models import MeetingMinutesMetadata
+from .pdf_worker import PdfSummary
 from .utils.text import normalize_text
 
 MINUTES_PATTERN = re.compile(r"\b(meeting\s+minutes?|minutes?)\b", re.IGNORECASE)
@@ -13,13 +13,14 @@ DATE_PATTERN = re.compile(
     r"\b(January|February|March|April|May|June|July|August|September|October|November|December)\s+\d{1,2},\s+\d{4}\b",
     re.IGNORECASE,
 )
+MINUTES_EXCERPT_PAGES = 2
 
 
 def is_minutes_document(title: str) -> bool:
     return bool(MINUTES_PATTERN.search(normalize_text(title)))
 
 
-def _extract_date_from_text(text: str) -> str:
+def extract_date_from_text(text: str) -> str:
     m = DATE_PATTERN.search(normalize_text(text))
     if not m:
         return ""
@@ -29,27 +30,18 @@ def _extract_date_from_text(text: str) -> str:
         return ""
 
 
-def _extract_pdf_page_count_and_excerpt(pdf_bytes: bytes) -> tuple[int | None, str, str]:
-    try:
-        from pypdf import PdfReader  # optional dependency
-    except Exception:
-        return None, "", "pdf_parser_unavailable"
+def _extract_pdf_page_count_and_excerpt(pdf: PdfSummary) -> tuple[int | None, str, str]:
+    if not pdf.pages_ok(MINUTES_EXCERPT_PAGES):
+        return None, "", pdf.status if pdf.status != "ok" else "pdf_parse_failed"
+    excerpt = normalize_text(" ".join(txt for txt in pdf.page_texts[:MINUTES_EXCERPT_PAGES] if txt))[:1200]
+    return pdf.page_count, excerpt, "ok"
 
-    try:
-        reader = PdfReader(io.BytesIO(pdf_bytes))
-        page_count = len(reader.pages)
-        excerpt_parts = []
-        for page in reader.pages[:2]:
-            txt = normalize_text(page.extract_text() or "")
-            if txt:
-                excerpt_parts.append(txt)
-        excerpt = normalize_text(" ".join(excerpt_parts))[:1200]
-        return page_count, excerpt, "ok"
-    except Exception:
-        return None, "", "pdf_parse_failed"
-
-
-def extract_minutes_metadata(title: str, url: str) -> dict[str, str | int | None]:
+
+def extract_minutes_metadata(
+    title: str,
+    url: str,
+    fetched: FetchedDocument | None = None,
+) -> dict[str, str | int | None]:
     normalized_title = normalize_text(title)
     normalized_url = normalize_text(url)
 
@@ -63,27 +55,26 @@ def extract_minutes_metadata(title: str, url: str) -> dict[str, str | int | None
 
     if ".pdf" not in normalized_url.lower():
         return {
-            "detected_date": _extract_date_from_text(normalized_title),
+            "detected_date": extract_date_from_text(normalized_title),
             "page_count": None,
             "text_excerpt": "",
             "status": "minutes_non_pdf",
         }
 
-    try:
-        response = requests.get(normalized_url, timeout=20)
-        response.raise_for_status()
-    except Exception:
+    if fetched is None:
+        fetched = fetch_document(normalized_url)
+    if not fetched.ok:
         return {
-            "detected_date": _extract_date_from_text(normalized_title),
+            "detected_date": extract_date_from_text(normalized_title),
             "page_count": None,
             "text_excerpt": "",
             "status": "download_failed",
         }
 
-    page_count, excerpt, status = _extract_pdf_page_count_and_excerpt(response.content)
-    detected_date = _extract_date_from_text(normalized_title)
+    page_count, excerpt, status = _extract_pdf_page_count_and_excerpt(fetched.pdf())
+    detected_date = extract_date_from_text(normalized_title)
     if not detected_date and excerpt:
-        detected_date = _extract_date_from_text(excerpt)
+        detected_date = extract_date_from_text(excerpt)
 
     return {
         "detected_date": detected_date,
@@ -93,14 +84,40 @@ def extract_minutes_metadata(title: str, url: str) -> dict[str, str | int | None
     }
 
 
+def minutes_metadata_values(
+    meeting_id: int,
+    document_id: int,
+    title: str,
+    url: str,
+    extracted: dict[str, str | int | None] | None = None,
+) -> dict | None:
+    """Column values for a `MeetingMinutesMetadata` row, or None if the document isn't minutes."""
+    if not is_minutes_document(title):
+        return None
+    if extracted is None:
+        extracted = extract_minutes_metadata(title=title, url=url)
+    return {
+        "meeting_id": meeting_id,
+        "document_id": document_id,
+        "title": normalize_text(title),
+        "url": normalize_text(url),
+        "detected_date": str(extracted.get("detected_date") or ""),
+        "page_count": extracted.get("page_count") if isinstance(extracted.get("page_count"), int) else None,
+        "text_excerpt": str(extracted.get("text_excerpt") or ""),
+        "status": str(extracted.get("status") or "unknown"),
+    }
+
+
 def upsert_minutes_metadata_from_document(
     db: Session,
     meeting_id: int,
     document_id: int,
     title: str,
     url: str,
+    extracted: dict[str, str | int | None] | None = None,
 ) -> MeetingMinutesMetadata | None:
-    if not is_minutes_document(title):
+    values = minutes_metadata_values(meeting_id, document_id, title, url, extracted)
+    if values is None:
         return None
 
     meta = db.query(MeetingMinutesMetadata).filter(
@@ -112,13 +129,6 @@ def upsert_minutes_metadata_from_document(
         meta = MeetingMinutesMetadata(meeting_id=meeting_id, document_id=document_id)
         db.add(meta)
 
-    extracted = extract_minutes_metadata(title=title, url=url)
-
-    meta.title = normalize_text(title)
-    meta.url = normalize_text(url)
-    meta.detected_date = str(extracted.get("detected_date") or "")
-    meta.page_count = extracted.get("page_count") if isinstance(extracted.get("page_count"), int) else None
-    meta.text_excerpt = str(extracted.get("text_excerpt") or "")
-    meta.status = str(extracted.get("status") or "unknown")
-
+    for key, value in values.items():
+        setattr(meta, key, value)
     return meta
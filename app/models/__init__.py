@@ -1,5 +1,5 @@
 
-from sqlalchemy import String, Integer, Date, Time, ForeignKey, Text, UniqueConstraint
+from sqlalchemy import String, Integer, Float, Date, Time, ForeignKey, Text, UniqueConstraint
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from ..db import Base
 
@@ -55,6 +55,50 @@ class Document(Base):
 	agenda_item = relationship("AgendaItem", back_populates="documents")
 
 
+class AgendaItemClassification(Base):
+	__tablename__ = "agenda_item_classifications"
+
+	agenda_item_id: Mapped[int] = mapped_column(ForeignKey("agenda_items.id"), primary_key=True)
+	meeting_id: Mapped[int] = mapped_column(ForeignKey("meetings.meeting_id"), index=True)
+	taxonomy_version: Mapped[str] = mapped_column(String, index=True, default="")  # TAXONOMY_VERSION when classified
+	title_topic_mask: Mapped[int] = mapped_column(Integer, default=0)  # topics of the item title alone
+	topic_mask: Mapped[int] = mapped_column(Integer, default=0)        # title plus attachment titles
+
+	agenda_item = relationship("AgendaItem")
+
+
+class AgendaItemTopic(Base):
+	__tablename__ = "agenda_item_topics"  # one row per title topic, for GROUP BY queries
+	__table_args__ = (
+		UniqueConstraint("agenda_item_id", "topic", name="uq_agenda_item_topic"),
+	)
+
+	id: Mapped[int] = mapped_column(Integer, primary_key=True)
+	agenda_item_id: Mapped[int] = mapped_column(ForeignKey("agenda_items.id"), index=True)
+	meeting_id: Mapped[int] = mapped_column(ForeignKey("meetings.meeting_id"), index=True)
+	topic: Mapped[str] = mapped_column(String, index=True)
+
+	agenda_item = relationship("AgendaItem")
+
+
+class ZoningEvent(Base):
+	__tablename__ = "zoning_events"  # one row per zoning agenda item, extracted at ingest
+
+	id: Mapped[int] = mapped_column(Integer, primary_key=True)
+	agenda_item_id: Mapped[int] = mapped_column(ForeignKey("agenda_items.id"), unique=True)
+	meeting_id: Mapped[int] = mapped_column(ForeignKey("meetings.meeting_id"), index=True)
+	meeting_date: Mapped[str] = mapped_column(String, index=True, default="")  # YYYY-MM-DD when known
+	item_key: Mapped[str] = mapped_column(String, default="")
+	title: Mapped[str] = mapped_column(Text, default="")
+	ordinance_number: Mapped[str | None] = mapped_column(String, nullable=True, index=True)
+	from_zone: Mapped[str | None] = mapped_column(String, nullable=True, index=True)
+	to_zone: Mapped[str | None] = mapped_column(String, nullable=True, index=True)
+	reading_stage: Mapped[str | None] = mapped_column(String, nullable=True)
+	address: Mapped[str | None] = mapped_column(String, nullable=True, index=True)
+
+	agenda_item = relationship("AgendaItem")
+
+
 class MeetingRawData(Base):
 	__tablename__ = "meeting_raw_data"
 	__table_args__ = (
@@ -69,29 +113,78 @@ class MeetingRawData(Base):
 	meeting = relationship("Meeting")
 
 
-class MeetingRangeDiscoveryCache(Base):
-	__tablename__ = "meeting_range_discovery_cache"
+class MeetingIngestState(Base):
+	__tablename__ = "meeting_ingest_state"
 	__table_args__ = (
-		UniqueConstraint(
-			"from_date",
-			"to_date",
-			"crawl",
-			"chunk_days",
-			name="uq_range_discovery_cache_key",
-		),
+		UniqueConstraint("meeting_id", name="uq_meeting_ingest_state_meeting_id"),
+	)
+
+	id: Mapped[int] = mapped_column(Integer, primary_key=True)
+	meeting_id: Mapped[int] = mapped_column(ForeignKey("meetings.meeting_id"), index=True)
+	payload_fingerprint: Mapped[str] = mapped_column(String, default="")  # sha256 of meetingData + meetingDocuments
+	last_ingested_at: Mapped[str] = mapped_column(String, default="")
+	last_checked_at: Mapped[str] = mapped_column(String, default="")
+
+	meeting = relationship("Meeting")
+
+
+class MeetingDiscoveryWindow(Base):
+	__tablename__ = "meeting_discovery_windows"
+	__table_args__ = (
+		UniqueConstraint("from_date", "to_date", name="uq_discovery_window_dates"),
 	)
 
 	id: Mapped[int] = mapped_column(Integer, primary_key=True)
-	from_date: Mapped[str] = mapped_column(String, index=True)
-	to_date: Mapped[str] = mapped_column(String, index=True)
-	crawl: Mapped[int] = mapped_column(Integer, default=1, index=True)  # sqlite bool-ish
+	from_date: Mapped[str] = mapped_column(String, index=True)  # inclusive, YYYY-MM-DD
+	to_date: Mapped[str] = mapped_column(String, index=True)    # inclusive, YYYY-MM-DD
+	crawl: Mapped[int] = mapped_column(Integer, default=1)  # how the window was fetched (sqlite bool-ish)
 	chunk_days: Mapped[int] = mapped_column(Integer, default=31)
 	meeting_ids_json: Mapped[str] = mapped_column(Text, default="[]")
 	discovered_count: Mapped[int] = mapped_column(Integer, default=0)
-	last_fetched_at: Mapped[str] = mapped_column(String, default="")
+	last_fetched_at: Mapped[str] = mapped_column(String, default="", index=True)
 	last_used_at: Mapped[str] = mapped_column(String, default="")
 
 
+class IngestJob(Base):
+	__tablename__ = "ingest_jobs"
+
+	job_id: Mapped[str] = mapped_column(String, primary_key=True)
+	status: Mapped[str] = mapped_column(String, index=True, default="queued")  # queued, running, completed, failed
+	params_json: Mapped[str] = mapped_column(Text, default="{}")
+	progress_json: Mapped[str] = mapped_column(Text, default="{}")
+	result_json: Mapped[str] = mapped_column(Text, default="")
+	error: Mapped[str] = mapped_column(Text, default="")
+	checkpoint_meeting_id: Mapped[int | None] = mapped_column(Integer, nullable=True)  # last meeting fully applied
+	attempts: Mapped[int] = mapped_column(Integer, default=0)
+	created_at: Mapped[float] = mapped_column(Float, index=True, default=0.0)  # unix seconds
+	updated_at: Mapped[float] = mapped_column(Float, default=0.0)
+
+
+class IngestJobSchedule(Base):
+	__tablename__ = "ingest_job_schedule"  # jobs without a row are bulk range jobs
+
+	job_id: Mapped[str] = mapped_column(ForeignKey("ingest_jobs.job_id"), primary_key=True)
+	kind: Mapped[str] = mapped_column(String, index=True, default="range")  # range, meeting
+	priority: Mapped[int] = mapped_column(Integer, default=10)  # lower runs first
+
+	job = relationship("IngestJob")
+
+
+class MeetingIngestLease(Base):
+	__tablename__ = "meeting_ingest_leases"
+
+	meeting_id: Mapped[int] = mapped_column(Integer, primary_key=True)  # no FK: the meeting may not be stored yet
+	holder: Mapped[str] = mapped_column(String, default="")  # job ID or request token
+	expires_at: Mapped[float] = mapped_column(Float, default=0.0)  # unix seconds
+
+
+class GraphPendingMeeting(Base):
+	__tablename__ = "graph_pending_meetings"
+
+	meeting_id: Mapped[int] = mapped_column(ForeignKey("meetings.meeting_id"), primary_key=True)
+	marked_at: Mapped[float] = mapped_column(Float, default=0.0)  # unix seconds of the latest unapplied change
+
+
 class MeetingMinutesMetadata(Base):
 	__tablename__ = "meeting_minutes_metadata"
 	__table_args__ = (
@@ -227,6 +320,42 @@ class EntityConnection(Base):
 	to_entity = relationship("Entity", foreign_keys=[to_entity_id])
 
 
+class EvidenceSourceTopic(Base):
+	__tablename__ = "evidence_source_topics"
+	__table_args__ = (
+		UniqueConstraint("source_type", "source_id", name="uq_evidence_source_topic_source"),
+	)
+
+	id: Mapped[int] = mapped_column(Integer, primary_key=True)
+	source_type: Mapped[str] = mapped_column(String, default="")  # EntityConnection.evidence_source_type
+	source_id: Mapped[int] = mapped_column(Integer, default=0)
+	taxonomy_version: Mapped[str] = mapped_column(String, default="")
+	topic_mask: Mapped[int] = mapped_column(Integer, default=0)
+
+
+class EntityCooccurrence(Base):
+	__tablename__ = "entity_cooccurrences"
+	__table_args__ = (
+		UniqueConstraint("entity_id", "granularity", "other_entity_id", name="uq_entity_cooccurrence_pair"),
+	)
+
+	id: Mapped[int] = mapped_column(Integer, primary_key=True)
+	entity_id: Mapped[int] = mapped_column(ForeignKey("entities.id"), index=True)
+	granularity: Mapped[str] = mapped_column(String, default="meeting")  # meeting, agenda_item
+	rank: Mapped[int] = mapped_column(Integer, default=0)  # 0 = strongest neighbor
+	other_entity_id: Mapped[int] = mapped_column(ForeignKey("entities.id"), index=True)
+	cooccurrence_count: Mapped[int] = mapped_column(Integer, default=0)  # other's mentions in shared containers
+	shared_count: Mapped[int] = mapped_column(Integer, default=0)  # distinct shared meetings or agenda items
+
+
+class EntityCooccurrenceState(Base):
+	__tablename__ = "entity_cooccurrence_states"
+
+	entity_id: Mapped[int] = mapped_column(ForeignKey("entities.id"), primary_key=True)
+	marked_at: Mapped[float] = mapped_column(Float, default=0.0)  # unix seconds of the latest change
+	computed_at: Mapped[float] = mapped_column(Float, default=0.0)  # stale while marked_at > computed_at
+
+
 class EntityPerson(Base):
 	__tablename__ = "entity_people"
 	__table_args__ = (
@@ -0,0 +1,208 @@
+"""
+PDF parsing, isolated in worker processes.
+
+pypdf runs in a small process pool, so a pathological attachment can't pin the
+ingest thread or take the app down with it. Each document gets a wall-clock
+deadline (`pdf_timeout`), each worker an address-space cap (`pdf_oom`), and
+workers are replaced after `pdf_worker_max_tasks_per_child` documents so
+pypdf's heap growth doesn't accumulate. At most one document per worker is
+submitted at a time, so the deadline only runs while a document is being
+parsed, never while it waits for a free worker. `pdf_worker_processes = 0`
+parses in-process instead (no limits), which is what the pool itself calls.
+"""
+from __future__ import annotations
+
+import io
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass
+
+from .config import settings
+from .utils.text import normalize_text
+
+# Most pages any extractor reads: document text excerpts use 8, minutes metadata uses 2.
+PDF_TEXT_PAGES = 8
+
+
+@dataclass(frozen=True)
+class PdfSummary:
+    page_count: int | None
+    page_texts: list[str]  # normalized text for the leading pages read before any failure
+    status: str            # ok, pdf_parse_failed, pdf_parser_unavailable, pdf_timeout, pdf_oom
+
+    def pages_ok(self, n: int) -> bool:
+        """True when the first `n` pages (or all pages, if fewer) were read cleanly."""
+        if self.page_count is None:
+            return False
+        return len(self.page_texts) >= min(n, self.page_count)
+
+
+def _failed(status: str) -> PdfSummary:
+    return PdfSummary(page_count=None, page_texts=[], status=status)
+
+
+def parse_pdf_summary(pdf_bytes: bytes, max_pages: int = PDF_TEXT_PAGES) -> PdfSummary:
+    """Parse in the current process. MemoryError propagates so callers can tell OOM apart."""
+    try:
+        from pypdf import PdfReader  # optional dependency
+    except Exception:
+        return _failed("pdf_parser_unavailable")
+
+    try:
+        reader = PdfReader(io.BytesIO(pdf_bytes))
+        page_count = len(reader.pages)
+    except MemoryError:
+        raise
+    except Exception:
+        return _failed("pdf_parse_failed")
+
+    page_texts: list[str] = []
+    try:
+        for page in reader.pages[:max_pages]:
+            page_texts.append(normalize_text(page.extract_text() or ""))
+    except MemoryError:
+        raise
+    except Exception:
+        return PdfSummary(page_count=page_count, page_texts=page_texts, status="pdf_parse_failed")
+    return PdfSummary(page_count=page_count, page_texts=page_texts, status="ok")
+
+
+def _limit_worker_memory(max_bytes: int) -> None:
+    if max_bytes <= 0:
+        return
+    try:
+        import resource  # POSIX only
+    except ImportError:
+        return
+    resource.setrlimit(resource.RLIMIT_AS, (max_bytes, max_bytes))
+
+
+def _parse_in_worker(pdf_bytes: bytes, max_pages: int) -> PdfSummary:
+    try:
+        return parse_pdf_summary(pdf_bytes, max_pages)
+    except MemoryError:
+        return _failed("pdf_oom")
+
+
+class PdfWorkerPool:
+    """Thread-safe front for a recyclable process pool; every failure maps to a status."""
+
+    def __init__(
+        self,
+        processes: int,
+        *,
+        timeout_seconds: float,
+        memory_limit_bytes: int = 0,
+        max_tasks_per_child: int = 0,
+    ):
+        self.processes = max(int(processes), 1)
+        self.timeout_seconds = float(timeout_seconds)
+        self.memory_limit_bytes = int(memory_limit_bytes)
+        self.max_tasks_per_child = int(max_tasks_per_child)
+        self._lock = threading.Lock()
+        # Callers wait here rather than in the executor's queue, where the timeout would already be running.
+        self._slots = threading.BoundedSemaphore(self.processes)
+        self._executor: ProcessPoolExecutor | None = None
+        self._generation = 0
+
+    def _current(self) -> tuple[ProcessPoolExecutor, int]:
+        with self._lock:
+            if self._executor is None:
+                kwargs = {}
+                if self.max_tasks_per_child > 0:
+                    kwargs["max_tasks_per_child"] = self.max_tasks_per_child
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.processes,
+                    # spawn: workers never inherit the parent's threads, sockets or DB handles.
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=_limit_worker_memory,
+                    initargs=(self.memory_limit_bytes,),
+                    **kwargs,
+                )
+            return self._executor, self._generation
+
+    def _discard(self, generation: int, *, kill: bool) -> None:
+        with self._lock:
+            if generation != self._generation or self._executor is None:
+                return  # another thread already replaced this pool
+            executor = self._executor
+            self._executor = None
+            self._generation += 1
+        if kill:
+            # A stuck parse never returns on its own; stop the workers outright.
+            for proc in list((getattr(executor, "_processes", None) or {}).values()):
+                proc.kill()
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    def parse(self, pdf_bytes: bytes, max_pages: int = PDF_TEXT_PAGES) -> PdfSummary:
+        with self._slots:
+            return self._parse(pdf_bytes, max_pages)
+
+    def _parse(self, pdf_bytes: bytes, max_pages: int) -> PdfSummary:
+        for _attempt in range(2):
+            executor, generation = self._current()
+            try:
+                future = executor.submit(_parse_in_worker, pdf_bytes, max_pages)
+                return future.result(timeout=self.timeout_seconds)
+            except FutureTimeoutError:
+                self._discard(generation, kill=True)
+                return _failed("pdf_timeout")
+            except BrokenProcessPool:
+                with self._lock:
+                    restarted = generation != self._generation
+                self._discard(generation, kill=False)
+                if restarted:
+                    # Collateral from another document's timeout; retry once on the new pool.
+                    continue
+                # A worker died mid-parse; on a memory-capped worker that is the OOM killer.
+                return _failed("pdf_oom")
+        return _failed("pdf_timeout")
+
+    def shutdown(self) -> None:
+        with self._lock:
+            executor = self._executor
+            self._executor = None
+            self._generation += 1
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+
+_pool: PdfWorkerPool | None = None
+_pool_lock = threading.Lock()
+
+
+def get_pdf_worker_pool() -> PdfWorkerPool | None:
+    global _pool
+    if settings.pdf_worker_processes <= 0:
+        return None
+    with _pool_lock:
+        if _pool is None:
+            _pool = PdfWorkerPool(
+                settings.pdf_worker_processes,
+                timeout_seconds=settings.pdf_timeout_seconds,
+                memory_limit_bytes=settings.pdf_worker_memory_limit_mb * 1024 * 1024,
+                max_tasks_per_child=settings.pdf_worker_max_tasks_per_child,
+            )
+        return _pool
+
+
+def parse_pdf(pdf_bytes: bytes, max_pages: int = PDF_TEXT_PAGES) -> PdfSummary:
+    """Parse via the worker pool, or in-process when the pool is disabled."""
+    pool = get_pdf_worker_pool()
+    if pool is None:
+        try:
+            return parse_pdf_summary(pdf_bytes, max_pages)
+        except MemoryError:
+            return _failed("pdf_oom")
+    return pool.parse(pdf_bytes, max_pages)
+
+
+def shutdown_pdf_workers() -> None:
+    global _pool
+    with _pool_lock:
+        pool, _pool = _pool, None
+    if pool is not None:
+        pool.shutdown()
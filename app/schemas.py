@@ -16,6 +16,26 @@ class ZoningSignalsOut(BaseModel):
     address: Optional[str] = None
 
 
+class ZoningEventOut(BaseModel):
+    meeting_id: int
+    meeting_date: str
+    agenda_item_id: int
+    item_key: str
+    title: str
+    ordinance_number: Optional[str] = None
+    from_zone: Optional[str] = None
+    to_zone: Optional[str] = None
+    reading_stage: Optional[str] = None
+    address: Optional[str] = None
+
+
+class ZoningEventsPageOut(BaseModel):
+    total: int
+    limit: int
+    offset: int
+    items: List[ZoningEventOut] = Field(default_factory=list)
+
+
 class AgendaItemOut(BaseModel):
     item_key: str
     section: str
@@ -111,6 +131,8 @@ class AgendaTopicSearchOut(BaseModel):
     item_key: str
     title: str
     section: str
+    title_highlight: str = ""  # html-escaped title, matched terms in <mark>
+    score: Optional[float] = None  # BM25, lower is better; absent without FTS5
 
 
 class DocumentSearchOut(BaseModel):
@@ -119,6 +141,18 @@ class DocumentSearchOut(BaseModel):
     agenda_item_id: Optional[int] = None
     title: str
     url: str
+    title_highlight: str = ""
+    score: Optional[float] = None
+
+
+class DocumentTextSearchOut(BaseModel):
+    meeting_id: int
+    document_id: int
+    title: str
+    url: str
+    title_highlight: str = ""
+    snippet: str = ""  # html-escaped excerpt around the matches, matched terms in <mark>
+    score: Optional[float] = None
 
 
 class TimelineBucketOut(BaseModel):
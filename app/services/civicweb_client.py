@@ -2,7 +2,8 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 from typing import Any, Dict, List, Optional
-import httpx
+
+from app.http_client import get_async_client
 
 
 @dataclass(frozen=True)
@@ -21,12 +22,11 @@ class CivicWebClient:
         url = self._url("/Services/MeetingsService.svc/meetings")
         params = {"from": date_from, "to": date_to}
 
-        async with httpx.AsyncClient(timeout=30) as client:
-            r = await client.get(url, params=params)
-            r.raise_for_status()
-            data = r.json()
-            # CivicWeb tends to return a JSON array here
-            return data if isinstance(data, list) else [data]
+        r = await get_async_client().get(url, params=params)
+        r.raise_for_status()
+        data = r.json()
+        # CivicWeb tends to return a JSON array here
+        return data if isinstance(data, list) else [data]
 
     async def get_meeting_data(self, meeting_id: int) -> Dict[str, Any]:
         """
@@ -35,7 +35,18 @@ class CivicWebClient:
         """
         url = self._url(f"/Services/MeetingsService.svc/meetings/{meeting_id}/meetingData")
 
-        async with httpx.AsyncClient(timeout=30) as client:
-            r = await client.get(url)
-            r.raise_for_status()
-            return r.json()
\ No newline at end of file
+        r = await get_async_client().get(url)
+        r.raise_for_status()
+        return r.json()
+
+    async def get_meeting_documents(self, meeting_id: int) -> List[Dict[str, Any]]:
+        """
+        CivicWeb API you found:
+        /Services/MeetingsService.svc/meetings/{id}/meetingDocuments?$format=json
+        """
+        url = self._url(f"/Services/MeetingsService.svc/meetings/{meeting_id}/meetingDocuments")
+
+        r = await get_async_client().get(url, params={"$format": "json"})
+        r.raise_for_status()
+        data = r.json()
+        return data if isinstance(data, list) else [data]
@@ -0,0 +1,143 @@
+"""
+Stored agenda-item topics.
+
+Ingest classifies a meeting's agenda items once and stores the result: topic
+masks in `agenda_item_classifications`, plus one `agenda_item_topics` row per
+title topic so explore endpoints can aggregate with GROUP BY, and a
+`zoning_events` row per zoning item. Every classification is tagged with the
+`CLASSIFICATION_VERSION` it was made under. Items that were never classified,
+or were classified under an older version, are picked up by
+`reclassify_stale_topics`, which the app's startup catch-up runs (`app.catchup`).
+Reads serve whatever is stored and never classify.
+"""
+from __future__ import annotations
+
+from sqlalchemy import delete, or_, select
+from sqlalchemy.orm import Session
+
+from .classifiers.topics import TAXONOMY_VERSION, TOPIC_BITS, classify_topics_batch, topics_from_mask
+from .db import SessionLocal, upsert_rows
+from .evidence_topics import ensure_evidence_topics
+from .models import AgendaItem, AgendaItemClassification, AgendaItemTopic, Document
+from .utils.text import normalize_text
+from .zoning_events import meeting_dates, replace_zoning_events, zoning_event_values
+
+CLASSIFY_BATCH_ITEMS = 500
+# Stored with each classification. The suffix changes whenever what classification derives
+# changes (for example zoning events were added), so existing rows are redone like a taxonomy change.
+CLASSIFICATION_VERSION = f"{TAXONOMY_VERSION}.2"
+
+
+def classify_agenda_items(db: Session, item_ids: list[int]) -> int:
+    """(Re)classify the given agenda items and replace their stored topics; the caller commits."""
+    if not item_ids:
+        return 0
+    items = db.execute(
+        select(AgendaItem.id, AgendaItem.meeting_id, AgendaItem.title, AgendaItem.item_key).where(
+            AgendaItem.id.in_(item_ids)
+        )
+    ).all()
+    doc_titles: dict[int, list[str]] = {}
+    rows = db.execute(
+        select(Document.agenda_item_id, Document.title)
+        .where(Document.agenda_item_id.in_(item_ids))
+        .order_by(Document.id)
+    )
+    for agenda_item_id, title in rows:
+        doc_titles.setdefault(agenda_item_id, []).append(normalize_text(title))
+
+    # Same texts the endpoints classified on every request: the title alone, and the title plus attachment titles.
+    titles = [normalize_text(item.title or "") for item in items]
+    docs_texts = [" ".join(doc_titles.get(item.id, [])) for item in items]
+    title_masks = classify_topics_batch(titles)
+    full_masks = classify_topics_batch([" ".join([title, docs]) for title, docs in zip(titles, docs_texts)])
+
+    upsert_rows(
+        db,
+        AgendaItemClassification,
+        [
+            {
+                "agenda_item_id": item_id,
+                "meeting_id": meeting_id,
+                "taxonomy_version": CLASSIFICATION_VERSION,
+                "title_topic_mask": title_mask,
+                "topic_mask": full_mask,
+            }
+            for (item_id, meeting_id, _title, _key), title_mask, full_mask in zip(items, title_masks, full_masks)
+        ],
+        conflict_columns=["agenda_item_id"],
+        update_columns=["meeting_id", "taxonomy_version", "title_topic_mask", "topic_mask"],
+    )
+    found_ids = [item.id for item in items]
+    db.execute(delete(AgendaItemTopic).where(AgendaItemTopic.agenda_item_id.in_(found_ids)))
+    upsert_rows(
+        db,
+        AgendaItemTopic,
+        [
+            {"agenda_item_id": item_id, "meeting_id": meeting_id, "topic": topic}
+            for (item_id, meeting_id, _title, _key), mask in zip(items, title_masks)
+            for topic in sorted(topics_from_mask(mask))
+        ],
+        conflict_columns=["agenda_item_id", "topic"],
+        update_columns=[],
+    )
+
+    zoning = [i for i, mask in enumerate(full_masks) if mask & TOPIC_BITS["zoning"]]
+    dates = meeting_dates(db, sorted({items[i].meeting_id for i in zoning})) if zoning else {}
+    replace_zoning_events(
+        db,
+        found_ids,
+        [
+            zoning_event_values(
+                agenda_item_id=items[i].id,
+                meeting_id=items[i].meeting_id,
+                meeting_date=dates.get(items[i].meeting_id, ""),
+                item_key=items[i].item_key,
+                title=titles[i],
+                docs_text=docs_texts[i],
+            )
+            for i in zoning
+        ],
+    )
+    return len(items)
+
+
+def classify_meeting_topics(db: Session, meeting_id: int) -> int:
+    """Classify every agenda item of one meeting; called by ingest after items and documents are written."""
+    item_ids = list(db.scalars(select(AgendaItem.id).where(AgendaItem.meeting_id == meeting_id)))
+    return classify_agenda_items(db, item_ids)
+
+
+def _unclassified_items(meeting_id: int | None):
+    query = (
+        select(AgendaItem.id)
+        .outerjoin(AgendaItemClassification, AgendaItemClassification.agenda_item_id == AgendaItem.id)
+        .where(
+            or_(
+                AgendaItemClassification.agenda_item_id.is_(None),
+                AgendaItemClassification.taxonomy_version != CLASSIFICATION_VERSION,
+            )
+        )
+        .order_by(AgendaItem.id)
+        .limit(CLASSIFY_BATCH_ITEMS)
+    )
+    if meeting_id is not None:
+        query = query.where(AgendaItem.meeting_id == meeting_id)
+    return query
+
+
+def ensure_topics_classified(db: Session, *, meeting_id: int | None = None) -> int:
+    """Classify whatever is missing or stale (for one meeting, or everywhere), committing per batch."""
+    total = 0
+    while True:
+        item_ids = list(db.scalars(_unclassified_items(meeting_id)))
+        if not item_ids:
+            return total
+        total += classify_agenda_items(db, item_ids)
+        db.commit()
+
+
+def reclassify_stale_topics() -> int:
+    """Startup catch-up after `TOPIC_PATTERNS` changes, graph evidence included; runs on its own session."""
+    with SessionLocal() as db:
+        return ensure_topics_classified(db) + ensure_evidence_topics(db)
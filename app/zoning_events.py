@@ -0,0 +1,101 @@
+"""
+Zoning events: the zoning signals of every agenda item classified as zoning.
+
+Rows are written by `topic_index.classify_agenda_items`, from the same title and
+attachment-title text `get_agenda` shows, so `/zoning/events` can filter by
+ordinance, zones, address and meeting date without re-reading any agendas.
+"""
+from __future__ import annotations
+
+from sqlalchemy import delete, func, select
+from sqlalchemy.orm import Session
+
+from .db import upsert_rows
+from .extractors.zoning import clean_zone, extract_zoning_signals
+from .minutes import extract_date_from_text
+from .models import Meeting, ZoningEvent
+from .utils.text import normalize_text
+
+
+def meeting_dates(db: Session, meeting_ids: list[int]) -> dict[int, str]:
+    """ISO meeting dates; `Meeting.date` is often blank, so fall back to the date in the meeting name."""
+    rows = db.execute(select(Meeting.meeting_id, Meeting.date, Meeting.name).where(Meeting.meeting_id.in_(meeting_ids)))
+    return {meeting_id: (date or extract_date_from_text(name or "")) for meeting_id, date, name in rows}
+
+
+def zoning_event_values(
+    *,
+    agenda_item_id: int,
+    meeting_id: int,
+    meeting_date: str,
+    item_key: str,
+    title: str,
+    docs_text: str,
+) -> dict:
+    signals = extract_zoning_signals(title, docs_text)
+    return {
+        "agenda_item_id": agenda_item_id,
+        "meeting_id": meeting_id,
+        "meeting_date": meeting_date or "",
+        "item_key": item_key or "",
+        "title": title,
+        **signals,
+    }
+
+
+def replace_zoning_events(db: Session, item_ids: list[int], events: list[dict]) -> None:
+    """Make `events` the zoning events of `item_ids` (items no longer about zoning lose theirs); the caller commits."""
+    if not item_ids:
+        return
+    db.execute(delete(ZoningEvent).where(ZoningEvent.agenda_item_id.in_(item_ids)))
+    upsert_rows(
+        db,
+        ZoningEvent,
+        events,
+        conflict_columns=["agenda_item_id"],
+        update_columns=[col for col in ZoningEvent.__table__.c.keys() if col not in ("id", "agenda_item_id")],
+    )
+
+
+def query_zoning_events(
+    db: Session,
+    *,
+    ordinance_number: str | None = None,
+    from_zone: str | None = None,
+    to_zone: str | None = None,
+    address: str | None = None,
+    reading_stage: str | None = None,
+    meeting_id: int | None = None,
+    date_from: str | None = None,
+    date_to: str | None = None,
+    limit: int = 50,
+    offset: int = 0,
+) -> tuple[int, list[ZoningEvent]]:
+    query = db.query(ZoningEvent)
+    if ordinance_number:
+        number = normalize_text(ordinance_number)
+        query = query.filter(ZoningEvent.ordinance_number.in_({number, number.upper()}))
+    if from_zone:
+        query = query.filter(ZoningEvent.from_zone == clean_zone(from_zone))
+    if to_zone:
+        query = query.filter(ZoningEvent.to_zone == clean_zone(to_zone))
+    if address:
+        query = query.filter(func.lower(ZoningEvent.address).contains(normalize_text(address).lower(), autoescape=True))
+    if reading_stage:
+        query = query.filter(ZoningEvent.reading_stage == normalize_text(reading_stage).lower())
+    if meeting_id is not None:
+        query = query.filter(ZoningEvent.meeting_id == meeting_id)
+    # Undated events cannot satisfy a date bound.
+    if date_from:
+        query = query.filter(ZoningEvent.meeting_date != "", ZoningEvent.meeting_date >= date_from)
+    if date_to:
+        query = query.filter(ZoningEvent.meeting_date != "", ZoningEvent.meeting_date <= date_to)
+
+    total = query.count()
+    rows = (
+        query.order_by(ZoningEvent.meeting_date.desc(), ZoningEvent.meeting_id.desc(), ZoningEvent.item_key.asc())
+        .offset(offset)
+        .limit(limit)
+        .all()
+    )
+    return total, rows
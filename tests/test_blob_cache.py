@@ -0,0 +1,57 @@
+import os
+
+from app.blob_cache import BlobCache
+from app.config import settings
+from app.document_fetch import fetch_document
+
+
+class _FakeResponse:
+    def __init__(self, content: bytes, status_code: int = 200, headers: dict | None = None):
+        self.content = content
+        self.status_code = status_code
+        self.headers = {"content-type": "application/pdf", **(headers or {})}
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise RuntimeError(self.status_code)
+
+
+def test_fetch_document_revalidates_and_reuses_cached_bytes(monkeypatch, tmp_path):
+    monkeypatch.setattr(settings, "blob_cache_dir", str(tmp_path / "blobs"))
+    url = "https://urbandale.civicweb.net/document/148400/minutes.pdf"
+    sent_headers: list[dict] = []
+
+    def fake_http_get(_url, **kwargs):
+        sent_headers.append(kwargs.get("headers") or {})
+        if len(sent_headers) == 1:
+            return _FakeResponse(b"%PDF-body", headers={"etag": '"v1"', "last-modified": "Tue, 03 Feb 2026 00:00:00 GMT"})
+        return _FakeResponse(b"", status_code=304)
+
+    monkeypatch.setattr("app.document_fetch.http_get", fake_http_get)
+
+    first = fetch_document(url)
+    second = fetch_document(url)
+
+    assert first.body == b"%PDF-body" and not first.from_cache
+    assert second.body == b"%PDF-body" and second.from_cache
+    assert second.content_type == "application/pdf"
+    assert sent_headers[0] == {}
+    assert sent_headers[1] == {"If-None-Match": '"v1"', "If-Modified-Since": "Tue, 03 Feb 2026 00:00:00 GMT"}
+
+
+def test_blob_cache_dedupes_content_and_evicts_least_recently_used(tmp_path):
+    cache = BlobCache(tmp_path, max_bytes=10)
+    a = cache.store("https://x/a", b"aaaa", etag='"a"')
+    cache.store("https://x/a-copy", b"aaaa", etag='"a2"')
+    b = cache.store("https://x/b", b"bbbb", etag='"b"')
+    assert len(list((tmp_path / "blobs").glob("*/*"))) == 2
+
+    # Make `a` the oldest, then touch `b` so the next store evicts `a`.
+    os.utime(tmp_path / "blobs" / a.sha256[:2] / a.sha256, (1, 1))
+    assert cache.read(b) == b"bbbb"
+    cache.store("https://x/c", b"cccc", etag='"c"')
+
+    assert cache.lookup("https://x/a") is None
+    assert cache.lookup("https://x/a-copy") is None
+    assert cache.lookup("https://x/b") is not None
+    assert cache.lookup("https://x/c") is not None
@@ -1,10 +1,11 @@
 from fastapi.testclient import TestClient
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, text
 from sqlalchemy.orm import sessionmaker
 
+from app.content_search import FTS_TABLE
 from app.db import Base
 from app.main import app, get_db
-from app.models import AgendaItem, Document, Meeting
+from app.models import AgendaItem, Document, DocumentTextExtraction, Meeting, MeetingMinutesMetadata
 
 
 def test_content_search_returns_agenda_topics_and_documents(tmp_path):
@@ -45,3 +46,78 @@ def test_content_search_returns_agenda_topics_and_documents(tmp_path):
         assert payload2["agenda_topics"][0]["item_key"] == "9.5"
     finally:
         app.dependency_overrides.clear()
+
+
+def test_content_search_ranks_full_text_across_sources_and_falls_back_to_like(tmp_path, monkeypatch):
+    engine = create_engine(f"sqlite:///{tmp_path / 'fts.db'}", connect_args={"check_same_thread": False})
+    TestingSessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False)
+    Base.metadata.create_all(bind=engine)
+
+    def override_get_db():
+        db = TestingSessionLocal()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app.dependency_overrides[get_db] = override_get_db
+
+    with TestingSessionLocal() as db:
+        db.add(Meeting(meeting_id=3001, name="Council", date="", time="", location="", type_id=1, video_url=""))
+        item = AgendaItem(meeting_id=3001, item_key="6.1", section="", title="Rezoning <Walnut Creek> parcel")
+        db.add(item)
+        db.flush()
+        db.add(Document(meeting_id=3001, agenda_item_id=item.id, document_id=9101, title="Staff report", url="u1", handle="h"))
+        db.add(Document(meeting_id=3001, agenda_item_id=item.id, document_id=9102, title="Rezoning map", url="u2", handle="h"))
+        db.add(
+            DocumentTextExtraction(
+                meeting_id=3001, document_id=9101, title="Staff report", url="u1", text_excerpt="Nothing relevant yet."
+            )
+        )
+        db.add(
+            MeetingMinutesMetadata(
+                meeting_id=3001,
+                document_id=9103,
+                title="Minutes",
+                url="u3",
+                text_excerpt="Motion to approve the rezoning of Walnut Creek carried unanimously.",
+            )
+        )
+        db.commit()
+
+    # Created on a database that already has rows: the new index is filled from them.
+    with engine.begin() as conn:
+        conn.execute(text(f"DROP TABLE {FTS_TABLE}"))
+    Base.metadata.create_all(bind=engine)
+
+    with TestingSessionLocal() as db:
+        # Edits and deletes reach the index through the source tables' triggers.
+        extraction = db.query(DocumentTextExtraction).filter_by(document_id=9101).one()
+        extraction.text_excerpt = "Staff recommends approval of the Walnut Creek rezoning subject to conditions."
+        db.query(Document).filter_by(document_id=9102).delete()
+        db.commit()
+
+    try:
+        client = TestClient(app)
+        payload = client.get("/search/content", params={"q": "walnut rezon*"}).json()
+        assert payload["facets"] == {"agenda_topics": 1, "documents": 0, "document_text": 1, "minutes": 1}
+        assert payload["agenda_topics"][0]["title_highlight"] == "<mark>Rezoning</mark> &lt;<mark>Walnut</mark> Creek&gt; parcel"
+        assert payload["agenda_topics"][0]["score"] is not None
+        assert payload["document_text"][0]["document_id"] == 9101
+        assert "<mark>Walnut</mark> Creek <mark>rezoning</mark>" in payload["document_text"][0]["snippet"]
+        assert payload["minutes"][0]["document_id"] == 9103
+
+        phrase = client.get("/search/content", params={"q": '"walnut creek rezoning"'}).json()
+        assert phrase["facets"] == {"agenda_topics": 0, "documents": 0, "document_text": 1, "minutes": 0}
+
+        only_minutes = client.get("/search/content", params={"q": "unanimously", "source": "minutes"}).json()
+        assert [row["document_id"] for row in only_minutes["minutes"]] == [9103]
+        assert only_minutes["agenda_topics"] == [] and only_minutes["document_text"] == []
+
+        monkeypatch.setattr("app.content_search.fts_available", lambda db: False)
+        fallback = client.get("/search/content", params={"q": "walnut rezoning"}).json()
+        assert fallback["facets"] == {"agenda_topics": 1, "documents": 0, "document_text": 1, "minutes": 1}
+        assert fallback["agenda_topics"][0]["score"] is None
+        assert "<mark>rezoning</mark>" in fallback["minutes"][0]["snippet"]
+    finally:
+        app.dependency_overrides.clear()
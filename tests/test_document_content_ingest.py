@@ -1,11 +1,11 @@
 from pathlib import Path
 
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import sessionmaker
 
 from app.db import Base
 from app.ingest import ingest_meeting
-from app.models import DocumentTextExtraction, Entity, EntityMention
+from app.models import AgendaItem, Document, DocumentTextExtraction, Entity, EntityMention, MeetingMinutesMetadata
 
 
 class _FakeResponse:
@@ -53,7 +53,7 @@ def test_ingest_extracts_document_content_entities_from_html_doc(monkeypatch, tm
     monkeypatch.setattr("app.ingest.cw.get_meeting_data", fake_get_meeting_data)
     monkeypatch.setattr("app.ingest.cw.get_meeting_documents", fake_get_meeting_documents)
     monkeypatch.setattr("app.ingest.parse_agenda_html", fake_parse_agenda_html)
-    monkeypatch.setattr("app.document_text.requests.get", lambda *args, **kwargs: _FakeResponse(html_bytes))
+    monkeypatch.setattr("app.document_fetch.http_get", lambda *args, **kwargs: _FakeResponse(html_bytes))
 
     test_db_path = tmp_path / "test.db"
     engine = create_engine(f"sqlite:///{test_db_path}", connect_args={"check_same_thread": False})
@@ -90,3 +90,122 @@ def test_ingest_extracts_document_content_entities_from_html_doc(monkeypatch, tm
             .one_or_none()
         )
         assert mention is not None
+
+
+def _minimal_pdf(text: str) -> bytes:
+    stream = f"BT /F1 12 Tf 72 720 Td ({text}) Tj ET".encode("latin-1")
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        b"<< /Type /Pages /Kids [3 0 R] /Count 1 >>",
+        b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] /Contents 4 0 R "
+        b"/Resources << /Font << /F1 5 0 R >> >> >>",
+        b"<< /Length " + str(len(stream)).encode() + b" >>\nstream\n" + stream + b"\nendstream",
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    ]
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for i, body in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += f"{i} 0 obj\n".encode() + body + b"\nendobj\n"
+    xref = len(out)
+    out += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode()
+    for off in offsets:
+        out += f"{off:010d} 00000 n \n".encode()
+    out += f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode()
+    return bytes(out)
+
+
+def test_ingest_downloads_minutes_pdf_once_for_both_extractors(monkeypatch, tmp_path):
+    pdf_bytes = _minimal_pdf("Minutes of February 3, 2026 at 3600 86th Street")
+    calls: list[str] = []
+
+    def fake_http_get(url, **kwargs):
+        calls.append(url)
+        return _FakeResponse(pdf_bytes, content_type="application/pdf")
+
+    def fake_parse_agenda_html(_html: str):
+        return [
+            {
+                "item_key": "5.1",
+                "section": "",
+                "title": "Approve City Council Meeting Minutes",
+                "attachments": [
+                    {
+                        "document_id": 148400,
+                        "title": "City Council Minutes - Pdf",
+                        "url": "https://urbandale.civicweb.net/document/148400/City%20Council.pdf?handle=95B7",
+                        "handle": "95B7",
+                    }
+                ],
+            }
+        ]
+
+    monkeypatch.setattr("app.ingest.cw.get_meeting_data", lambda mid: {"Name": "City Council", "TypeId": 1})
+    monkeypatch.setattr("app.ingest.cw.get_meeting_documents", lambda mid: [{"DocumentType": 1, "Html": "<table></table>"}])
+    monkeypatch.setattr("app.ingest.parse_agenda_html", fake_parse_agenda_html)
+    monkeypatch.setattr("app.document_fetch.http_get", fake_http_get)
+
+    engine = create_engine(f"sqlite:///{tmp_path / 'test.db'}", connect_args={"check_same_thread": False})
+    TestingSessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False)
+    Base.metadata.create_all(bind=engine)
+
+    with TestingSessionLocal() as db:
+        assert ingest_meeting(db, 1408, store_raw=False)["status"] == "ok"
+
+        minutes = db.query(MeetingMinutesMetadata).filter(MeetingMinutesMetadata.document_id == 148400).one()
+        ext = db.query(DocumentTextExtraction).filter(DocumentTextExtraction.document_id == 148400).one()
+
+    assert len(calls) == 1
+    assert minutes.status == "ok"
+    assert minutes.page_count == 1
+    assert minutes.detected_date == "2026-02-03"
+    assert "3600 86th Street" in minutes.text_excerpt
+    assert ext.status == "ok"
+    assert ext.content_type == "application/pdf"
+    assert "3600 86th Street" in ext.text_excerpt
+
+
+def test_reingest_writes_agenda_children_in_bulk(monkeypatch, tmp_path):
+    titles = {"suffix": "first"}
+
+    def fake_parse_agenda_html(_html: str):
+        return [
+            {
+                "item_key": f"6.{n}",
+                "section": "CONSENT",
+                "title": f"Approve claims batch {n} {titles['suffix']}",
+                "attachments": [
+                    {"document_id": 150000 + n * 10 + k, "title": f"Claims {n}-{k}", "url": "", "handle": ""}
+                    for k in range(3)
+                ],
+            }
+            for n in range(40)
+        ]
+
+    monkeypatch.setattr(
+        "app.ingest.cw.get_meeting_data",
+        lambda mid: {"Name": "City Council", "Location": "", "Time": "", "TypeId": 1},
+    )
+    monkeypatch.setattr("app.ingest.cw.get_meeting_documents", lambda mid: [{"DocumentType": 1, "Html": "<table></table>"}])
+    monkeypatch.setattr("app.ingest.parse_agenda_html", fake_parse_agenda_html)
+
+    engine = create_engine(f"sqlite:///{tmp_path / 'test.db'}", connect_args={"check_same_thread": False})
+    TestingSessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False)
+    Base.metadata.create_all(bind=engine)
+
+    statements: list[str] = []
+    event.listen(engine, "before_cursor_execute", lambda conn, cursor, stmt, *args: statements.append(stmt))
+
+    with TestingSessionLocal() as db:
+        ingest_meeting(db, 5001)
+        titles["suffix"] = "amended"
+        statements.clear()
+        ingest_meeting(db, 5001)
+
+        child_tables = ("agenda_items", "documents ", "document_text_extractions")
+        child_statements = [s for s in statements if any(t in s.split("WHERE")[0] for t in child_tables)]
+        # Prefetch + one batched upsert per table, not one round trip per row.
+        assert len(child_statements) <= 12
+        assert db.query(AgendaItem).count() == 40
+        assert db.query(Document).count() == 120
+        assert db.query(AgendaItem).filter(AgendaItem.title.like("%amended")).count() == 40
@@ -16,7 +16,7 @@ def test_extract_document_text_from_saved_lorey_html(monkeypatch):
     sample_path = Path("samples") / "Ordinance 2025-21 Lorey Property - Rezoning A-2 to R-1S.html"
     html_bytes = sample_path.read_bytes()
 
-    monkeypatch.setattr("app.document_text.requests.get", lambda *args, **kwargs: _FakeResponse(html_bytes))
+    monkeypatch.setattr("app.document_fetch.http_get", lambda *args, **kwargs: _FakeResponse(html_bytes))
 
     result = extract_document_text(
         title="Ordinance 2025-21 Lorey Property - Rezoning A-2 to R-1S",
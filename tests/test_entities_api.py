@@ -1,22 +1,32 @@
+import weakref
+
 from fastapi.testclient import TestClient
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event, update
 from sqlalchemy.orm import sessionmaker
 
+from app.classifiers.topics import TOPIC_BITS
+from app.cooccurrence import ensure_cooccurrences
 from app.db import Base
 from app.entities import extract_entities_from_text, replace_entity_mentions_for_source
-from app.graph import backfill_graph_entities_and_connections
+from app.entity_index import mark_entity_values_changed
+from app.graph import backfill_graph_entities_and_connections, rebuild_graph_for_meeting
+from app.evidence_topics import ensure_evidence_topics
+from app.graph_cache import get_graph_snapshot
 from app.ingest import ingest_meeting
 from app.main import app, get_db
 from app.models import (
     AgendaItem,
     Document,
     Entity,
+    EntityAlias,
     EntityBinding,
     EntityConnection,
+    EntityCooccurrenceState,
     EntityDateValue,
     EntityMention,
     EntityOrganization,
     EntityPlace,
+    EvidenceSourceTopic,
     Meeting,
     MeetingMinutesMetadata,
 )
@@ -74,6 +84,7 @@ def test_meeting_entities_and_search_endpoint(tmp_path):
             entities=extract_entities_from_text(minutes.text_excerpt),
         )
         db.commit()
+        ensure_cooccurrences(db)  # rows added directly: refresh them as ingest would
 
     try:
         client = TestClient(app)
@@ -407,3 +418,368 @@ def test_graph_backfill_promotes_meeting_and_document_entities_and_connections(t
         assert any("City Council Budget Work Session" in (row["context_text"] or "") for row in ep)
     finally:
         app.dependency_overrides.clear()
+
+
+def test_repeated_entities_resolve_once_and_keep_one_kind_row(tmp_path):
+    test_db_path = tmp_path / "test.db"
+    engine = create_engine(f"sqlite:///{test_db_path}", connect_args={"check_same_thread": False})
+    TestingSessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False)
+    Base.metadata.create_all(bind=engine)
+
+    statements: list[str] = []
+    event.listen(engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+
+    with TestingSessionLocal() as db:
+        db.add(Meeting(meeting_id=2003, name="Council", date="", time="", location="", type_id=1, video_url=""))
+        db.flush()
+
+        # The same date and person show up in every source before anything is flushed.
+        for source_id in range(1, 6):
+            if source_id == 2:
+                statements.clear()
+            text = f"Item {source_id}: Mayor Jane Smith set a hearing for February 18, 2026 at 10841 Douglas Avenue"
+            replace_entity_mentions_for_source(
+                db,
+                meeting_id=2003,
+                source_type="agenda_item_title",
+                source_id=source_id,
+                context_text=text,
+                entities=extract_entities_from_text(text),
+            )
+        entity_reads = [s for s in statements if s.startswith("SELECT") and "FROM entities" in s]
+        kind_writes = [s for s in statements if "INSERT INTO entity_dates" in s or "UPDATE entity_dates" in s]
+        db.commit()
+
+        # Only the first source looks entities up or writes kind rows.
+        assert entity_reads == []
+        assert kind_writes == []
+        assert db.query(EntityDateValue).count() == 1
+        assert db.query(EntityPlace).one().state_hint == "Iowa"
+        assert db.query(EntityMention).filter(EntityMention.source_id == 5).count() >= 3
+
+        # Resolving again after commit reuses the cached ids and rewrites nothing.
+        statements.clear()
+        text = "Mayor Jane Smith on February 18, 2026"
+        replace_entity_mentions_for_source(
+            db,
+            meeting_id=2003,
+            source_type="agenda_item_title",
+            source_id=6,
+            context_text=text,
+            entities=extract_entities_from_text(text),
+        )
+        assert not [s for s in statements if "FROM entities" in s or s.startswith(("INSERT", "UPDATE"))]
+
+
+def test_graph_rebuild_uses_bulk_statements_and_is_idempotent(tmp_path):
+    test_db_path = tmp_path / "test.db"
+    engine = create_engine(f"sqlite:///{test_db_path}", connect_args={"check_same_thread": False})
+    TestingSessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False)
+    Base.metadata.create_all(bind=engine)
+
+    with TestingSessionLocal() as db:
+        db.add(Meeting(meeting_id=2004, name="Council", date="", time="", location="", type_id=1, video_url=""))
+        db.flush()
+        for n in range(60):
+            doc = Document(meeting_id=2004, document_id=160000 + n, title=f"Report {n}", url="", handle="")
+            db.add(doc)
+            db.flush()
+            text = f"Hearing on March {n % 28 + 1}, 2026 at {100 + n} Douglas Avenue"
+            replace_entity_mentions_for_source(
+                db,
+                meeting_id=2004,
+                document_id=doc.document_id,
+                source_type="document_content",
+                source_id=doc.id,
+                context_text=text,
+                entities=extract_entities_from_text(text),
+            )
+        db.commit()
+
+        statements: list[str] = []
+        event.listen(engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+        stats = backfill_graph_entities_and_connections(db, meeting_id=2004)
+        edge_statements = [s for s in statements if "entity_connections" in s]
+        edge_count = db.query(EntityConnection).count()
+
+        # 60 contains_document edges plus meeting- and document-level edges for 2 mentions per document.
+        assert stats["connections_written"] == 60 + 60 * 2 * 2
+        assert edge_count == stats["connections_written"]
+        assert len(edge_statements) <= 2  # read the stored edges, write the new ones
+        assert len(statements) <= 20  # constant in the number of documents and mentions
+
+        statements.clear()
+        backfill_graph_entities_and_connections(db, meeting_id=2004)
+        assert db.query(EntityConnection).count() == edge_count
+        assert db.query(EntityBinding).filter(EntityBinding.source_table == "documents").count() == 60
+        assert not [s for s in statements if s.startswith(("INSERT INTO entity_connections", "DELETE FROM entity_connections"))]
+
+        # Re-ingesting a source with fewer entities deletes the edges its old mentions produced.
+        doc = db.query(Document).filter(Document.document_id == 160000).one()
+        replace_entity_mentions_for_source(
+            db,
+            meeting_id=2004,
+            document_id=doc.document_id,
+            source_type="document_content",
+            source_id=doc.id,
+            context_text="Hearing on March 1, 2026",
+            entities=extract_entities_from_text("Hearing on March 1, 2026"),
+        )
+        stats = backfill_graph_entities_and_connections(db, meeting_id=2004)
+        assert stats["connections_removed"] == 2
+        assert db.query(EntityConnection).count() == edge_count - 2
+        assert (
+            db.query(EntityConnection)
+            .filter(EntityConnection.evidence_source_type == "document_content", EntityConnection.evidence_source_id == doc.id)
+            .count()
+            == 2
+        )
+
+
+def test_graph_snapshot_serves_reads_and_reloads_after_graph_commits(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'test.db'}", connect_args={"check_same_thread": False})
+    TestingSessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False)
+    Base.metadata.create_all(bind=engine)
+
+    def mention(db, meeting_id: int, source_id: int, text: str) -> None:
+        replace_entity_mentions_for_source(
+            db,
+            meeting_id=meeting_id,
+            source_type="agenda_item_title",
+            source_id=source_id,
+            context_text=text,
+            entities=extract_entities_from_text(text),
+        )
+        rebuild_graph_for_meeting(db, meeting_id)
+
+    with TestingSessionLocal() as db:
+        for meeting_id in (2005, 2006):
+            db.add(Meeting(meeting_id=meeting_id, name="Council", date="", time="", location="", type_id=1, video_url=""))
+        db.flush()
+        mention(db, 2005, 1, "Mayor Jane Smith at 100 Douglas Avenue")
+        mention(db, 2006, 2, "Mayor Jane Smith at 100 Douglas Avenue on March 3, 2026")
+        db.commit()
+
+        jane = db.query(Entity).filter(Entity.entity_type == "person", Entity.normalized_value == "jane smith").one()
+        douglas = db.query(Entity).filter(Entity.normalized_value == "100 douglas avenue").one()
+        snapshot = get_graph_snapshot(db)
+        assert snapshot.cooccurrences(jane.id)[douglas.id] == (2, 2)
+        assert {edge.relation_type for edge in snapshot.incident_edges(jane.id)} == {"mentions"}
+        assert all(not edge.outgoing for edge in snapshot.incident_edges(jane.id))
+
+        # Commits that leave edges and mentions alone keep the snapshot; a rolled-back write does too.
+        db.get(Meeting, 2005).name = "City Council"
+        db.commit()
+        mention(db, 2005, 3, "Hubbell Realty Company, LLC")
+        db.rollback()
+        assert get_graph_snapshot(db) is snapshot
+
+        mention(db, 2005, 3, "Mayor Jane Smith with Hubbell Realty Company, LLC")
+        db.commit()
+        refreshed = get_graph_snapshot(db)
+        assert refreshed is not snapshot
+        hubbell = db.query(Entity).filter(Entity.entity_type == "organization").one()
+        assert refreshed.cooccurrences(jane.id)[hubbell.id] == (1, 1)
+        jane_id = jane.id
+        ensure_cooccurrences(db)  # rows added directly: refresh them as ingest would
+
+    def override_get_db():
+        db = TestingSessionLocal()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app.dependency_overrides[get_db] = override_get_db
+    try:
+        client = TestClient(app)
+        related = client.get(f"/entities/{jane_id}/related").json()
+        assert [r["display_value"] for r in related[:2]] == ["100 Douglas Avenue", "Hubbell Realty Company, LLC"]
+        assert related[0]["shared_meeting_count"] == 2
+        connections = client.get(f"/entities/{jane_id}/connections").json()
+        assert {r["entity_type"] for r in connections} == {"meeting"}
+        assert all(r["direction"] == "incoming" for r in connections)
+    finally:
+        app.dependency_overrides.clear()
+
+
+def test_related_entities_come_from_stored_cooccurrences_refreshed_for_touched_entities(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'test.db'}", connect_args={"check_same_thread": False})
+    TestingSessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False)
+    Base.metadata.create_all(bind=engine)
+
+    def mention(db, meeting_id: int, agenda_item_id: int, text: str) -> None:
+        replace_entity_mentions_for_source(
+            db,
+            meeting_id=meeting_id,
+            agenda_item_id=agenda_item_id,
+            source_type="agenda_item_title",
+            source_id=agenda_item_id,
+            context_text=text,
+            entities=extract_entities_from_text(text),
+        )
+
+    with TestingSessionLocal() as db:
+        for meeting_id in (2007, 2008):
+            db.add(Meeting(meeting_id=meeting_id, name="Council", date="", time="", location="", type_id=1, video_url=""))
+        db.flush()
+        mention(db, 2007, 1, "Mayor Jane Smith at 100 Douglas Avenue")
+        mention(db, 2007, 2, "Hubbell Realty Company, LLC")
+        mention(db, 2008, 3, "Mayor Robert Jones at 100 Douglas Avenue")
+        for meeting_id in (2007, 2008):
+            rebuild_graph_for_meeting(db, meeting_id)
+        db.commit()
+        assert ensure_cooccurrences(db) == 4
+        assert ensure_cooccurrences(db) == 0
+
+        ids = {e.normalized_value: e.id for e in db.query(Entity).filter(Entity.entity_type != "meeting")}
+        jane, robert, douglas = ids["jane smith"], ids["robert jones"], ids["100 douglas avenue"]
+
+        # Re-ingesting meeting 2008 marks only the entities it mentions, before and after.
+        mention(db, 2008, 3, "Mayor Jane Smith at 100 Douglas Avenue")
+        rebuild_graph_for_meeting(db, 2008)
+        db.commit()
+        stale = db.query(EntityCooccurrenceState).filter(
+            EntityCooccurrenceState.marked_at > EntityCooccurrenceState.computed_at
+        )
+        assert {row.entity_id for row in stale} == {jane, robert, douglas}
+        assert ensure_cooccurrences(db) == 3
+
+    def override_get_db():
+        db = TestingSessionLocal()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app.dependency_overrides[get_db] = override_get_db
+    try:
+        client = TestClient(app)
+        by_meeting = client.get(f"/entities/{jane}/related").json()
+        assert [(r["display_value"], r["shared_meeting_count"], r["cooccurrence_count"]) for r in by_meeting] == [
+            ("100 Douglas Avenue", 2, 2),
+            ("Hubbell Realty Company, LLC", 1, 1),
+        ]
+        by_item = client.get(f"/entities/{jane}/related", params={"granularity": "agenda_item"}).json()
+        assert [r["display_value"] for r in by_item] == ["100 Douglas Avenue"]
+        assert client.get(f"/entities/{robert}/related").json() == []
+    finally:
+        app.dependency_overrides.clear()
+
+
+def test_topic_filtered_connections_use_stored_evidence_masks(tmp_path, monkeypatch):
+    engine = create_engine(f"sqlite:///{tmp_path / 'test.db'}", connect_args={"check_same_thread": False})
+    TestingSessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False)
+    Base.metadata.create_all(bind=engine)
+
+    with TestingSessionLocal() as db:
+        db.add(Meeting(meeting_id=2009, name="Council", date="", time="", location="", type_id=1, video_url=""))
+        db.add(AgendaItem(id=11, meeting_id=2009, item_key="6.1", section="", title="Rezoning hearing for 100 Douglas Avenue"))
+        db.add(AgendaItem(id=12, meeting_id=2009, item_key="6.2", section="", title="Park shelter at 200 Aurora Avenue"))
+        db.flush()
+        for item in db.query(AgendaItem).all():
+            replace_entity_mentions_for_source(
+                db,
+                meeting_id=2009,
+                agenda_item_id=item.id,
+                source_type="agenda_item_title",
+                source_id=item.id,
+                context_text=item.title,
+                entities=extract_entities_from_text(item.title),
+            )
+        rebuild_graph_for_meeting(db, 2009)
+        db.commit()
+
+        masks = {row.source_id: row.topic_mask for row in db.query(EvidenceSourceTopic).all()}
+        assert masks[11] & TOPIC_BITS["zoning"]
+        assert not masks[12] & TOPIC_BITS["zoning"]
+        meeting_entity = db.query(Entity).filter(Entity.entity_type == "meeting").one()
+
+    def override_get_db():
+        db = TestingSessionLocal()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app.dependency_overrides[get_db] = override_get_db
+    try:
+        client = TestClient(app)
+
+        def zoning_connections() -> list[str]:
+            rows = client.get(f"/entities/{meeting_entity.id}/connections", params={"topic": "zoning"}).json()
+            return [r["display_value"] for r in rows]
+
+        def no_classification(texts):
+            raise AssertionError("topic filter classified text on read")
+
+        with monkeypatch.context() as patch:
+            patch.setattr("app.evidence_topics.classify_topics_batch", no_classification)
+            assert zoning_connections() == ["100 Douglas Avenue"]
+            assert client.get(f"/entities/{meeting_entity.id}/connections", params={"topic": "nonsense"}).json() == []
+
+        # Masks made under an older taxonomy read as 0 until the background pass redoes them.
+        monkeypatch.setattr("app.evidence_topics.TAXONOMY_VERSION", "next-version")
+        monkeypatch.setattr("app.graph_cache.TAXONOMY_VERSION", "next-version")
+        monkeypatch.setattr("app.graph_cache._snapshots", weakref.WeakKeyDictionary())  # as after a restart
+        with monkeypatch.context() as patch:
+            patch.setattr("app.evidence_topics.classify_topics_batch", no_classification)
+            assert zoning_connections() == []
+        with TestingSessionLocal() as db:
+            assert ensure_evidence_topics(db) == 2
+            assert {row.taxonomy_version for row in db.query(EvidenceSourceTopic).all()} == {"next-version"}
+        assert zoning_connections() == ["100 Douglas Avenue"]
+    finally:
+        app.dependency_overrides.clear()
+
+
+def test_entity_suggest_and_search_read_an_incrementally_updated_index(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'index.db'}", connect_args={"check_same_thread": False})
+    TestingSessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False)
+    Base.metadata.create_all(bind=engine)
+
+    def override_get_db():
+        db = TestingSessionLocal()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app.dependency_overrides[get_db] = override_get_db
+
+    with TestingSessionLocal() as db:
+        old = Entity(entity_type="organization", display_value="MidAmerican Energy", normalized_value="midamerican energy")
+        db.add(old)
+        db.flush()
+        db.add(EntityAlias(entity_id=old.id, alias_text="MEC", normalized_alias="mec"))
+        # The old suggest only scored the 5,000 newest entities.
+        db.add_all(
+            Entity(entity_type="address", display_value=f"{n} Filler Street", normalized_value=f"{n} filler street")
+            for n in range(5001)
+        )
+        db.commit()
+        old_id = old.id
+
+    try:
+        client = TestClient(app)
+        suggest = client.get("/entities/suggest", params={"q": "MidAmericn"}).json()
+        assert suggest[0]["entity_id"] == old_id
+        assert suggest[0]["display_value"] == "MidAmerican Energy"
+        assert client.get("/entities/suggest", params={"q": "mec"}).json()[0]["entity_id"] == old_id
+        search = client.get("/entities/search", params={"q": "american ener"}).json()
+        assert [row["entity_id"] for row in search] == [old_id]
+        typed = client.get("/entities/search", params={"q": "filler", "entity_type": "address", "limit": 3}).json()
+        assert [row["display_value"] for row in typed] == ["0 Filler Street", "1 Filler Street", "10 Filler Street"]
+
+        with TestingSessionLocal() as db:
+            db.add(Entity(entity_type="person", display_value="Robert Andeweg", normalized_value="robert andeweg"))
+            # A display value changed in place is picked up once the writer flags it.
+            db.execute(update(Entity).where(Entity.id == old_id).values(display_value="MidAmerican Energy Company"))
+            mark_entity_values_changed(db, [old_id])
+            db.commit()
+
+        assert client.get("/entities/suggest", params={"q": "andew"}).json()[0]["display_value"] == "Robert Andeweg"
+        renamed = client.get("/entities/search", params={"q": "energy company"}).json()
+        assert [row["entity_id"] for row in renamed] == [old_id]
+    finally:
+        app.dependency_overrides.clear()
@@ -1,4 +1,4 @@
-from app.entities import extract_entities_from_text
+from app.entities import PersonAliasMatcher, extract_entities_from_text, extract_entities_from_texts
 
 
 def test_extract_entities_from_text_detects_core_types():
@@ -32,3 +32,50 @@ def test_extract_entities_from_text_detects_suffix_titled_person_and_cleans_role
     assert "Patricia Boddy" in people
     assert "Robert D. Andeweg" in people
     assert all("Councilmember" not in p and not p.endswith(" City") for p in people)
+
+
+def test_person_alias_matcher_scans_once_with_overlaps_and_late_additions():
+    matcher = PersonAliasMatcher()
+    matcher.add(1, "Robert D. Andeweg")
+    matcher.add(2, "D. Andeweg")
+    matcher.add(3, "Jane Smith")
+    text = "City Manager ROBERT D. ANDEWEG met Jane Smithson and Jane Smith; Jane Smith seconded."
+
+    assert matcher.find(text) == [(1, "Robert D. Andeweg"), (2, "D. Andeweg"), (3, "Jane Smith")]
+
+    matcher.add(4, "Smithson")
+    matcher.add(3, "jane smith")  # already known
+    assert len(matcher) == 4
+    assert [entity_id for entity_id, _alias in matcher.find(text)] == [1, 2, 4, 3]
+
+
+def test_extract_entities_from_texts_matches_single_text_results():
+    texts = [
+        "Staff Report",
+        "Contract with Acme Paving Company and Hubbell Realty Company, LLC dated March 3, 2026",
+        "Mayor Jane Smith &amp; City Manager Robert D. Andeweg",
+        "",
+        "Staff  Report",
+        "Ordinance No. 2026-14 setting a hearing for 10841 Douglas Avenue, Urbandale, IA 50322 on April 7, 2026",
+    ]
+    batch = extract_entities_from_texts(texts)
+
+    assert batch == [extract_entities_from_text(text) for text in texts]
+    assert batch[0] is batch[4]  # same normalized text is scanned once
+    assert {r["normalized_value"] for r in batch[1] if r["entity_type"] == "organization"} == {
+        "acme paving company",
+        "hubbell realty company, llc",
+    }
+
+
+
+def test_person_alias_matcher_reports_every_alias_sharing_a_start():
+    matcher = PersonAliasMatcher()
+    matcher.add(1, "John Smith")
+    matcher.add(2, "John Smith Jr")
+    matcher.add(3, "Smith")
+    matcher.add(4, "John Smithers")
+
+    assert matcher.find("Council Member John Smith Jr spoke") == [(2, "John Smith Jr"), (1, "John Smith"), (3, "Smith")]
+    # A shorter alias still needs a word boundary after it.
+    assert matcher.find("John Smithers abstained") == [(4, "John Smithers")]
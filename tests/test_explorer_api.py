@@ -5,7 +5,8 @@ from sqlalchemy.orm import sessionmaker
 from app.db import Base
 from app.entities import extract_entities_from_text, replace_entity_mentions_for_source
 from app.main import app, get_db
-from app.models import AgendaItem, Meeting, MeetingRangeDiscoveryCache
+from app.models import AgendaItem, Meeting, MeetingDiscoveryWindow
+from app.topic_index import ensure_topics_classified
 
 
 def test_entity_suggest_and_explore_views(tmp_path):
@@ -59,7 +60,7 @@ def test_entity_suggest_and_explore_views(tmp_path):
         db.commit()
 
         db.add(
-            MeetingRangeDiscoveryCache(
+            MeetingDiscoveryWindow(
                 from_date="2026-01-01",
                 to_date="2026-02-28",
                 crawl=1,
@@ -71,6 +72,7 @@ def test_entity_suggest_and_explore_views(tmp_path):
             )
         )
         db.commit()
+        ensure_topics_classified(db)  # rows added directly: classify them as ingest would
 
     try:
         client = TestClient(app)
@@ -148,8 +150,6 @@ def test_entity_suggest_and_explore_views(tmp_path):
             params={
                 "from_date": "2026-01-01",
                 "to_date": "2026-02-28",
-                "crawl": "true",
-                "chunk_days": 31,
                 "cache_ttl_minutes": 999999,
             },
         )
@@ -158,5 +158,15 @@ def test_entity_suggest_and_explore_views(tmp_path):
         assert cs["has_cache"] is True
         assert cs["cache_fresh"] is True
         assert cs["discovered_count"] == 2
+
+        partial = client.get(
+            "/ingest/cache-status",
+            params={"from_date": "2026-01-01", "to_date": "2026-03-31", "cache_ttl_minutes": 999999},
+        ).json()
+        assert partial["has_cache"] is True
+        assert partial["cache_fresh"] is False
+        assert partial["coverage"] == "partial"
+        assert partial["covered_days"] == 59
+        assert partial["uncovered_ranges"] == [{"from_date": "2026-03-01", "to_date": "2026-03-31"}]
     finally:
         app.dependency_overrides.clear()
@@ -0,0 +1,17 @@
+import asyncio
+
+from app import http_client
+
+
+def test_http_clients_are_shared_and_restartable():
+    first = http_client.get_sync_client()
+    assert http_client.get_sync_client() is first
+    assert http_client.get_async_client() is http_client.get_async_client()
+
+    asyncio.run(http_client.close_http_clients())
+    assert first.is_closed
+
+    http_client.start_http_clients()
+    second = http_client.get_sync_client()
+    assert second is not first
+    assert not second.is_closed
@@ -0,0 +1,155 @@
+import asyncio
+import time
+
+import pytest
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.db import Base
+from app.ingest_async import collect_meeting_ids_async, ingest_range_async, session_to_thread
+from app.leases import meeting_lease, release_meeting_lease, try_acquire_meeting_lease
+from app.models import AgendaItem, Meeting, MeetingIngestLease
+
+
+class _FakeCivicWebClient:
+    def __init__(self):
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.list_calls: list[tuple[str, str]] = []
+
+    async def list_meetings(self, date_from: str, date_to: str = "9999-12-31"):
+        self.list_calls.append((date_from, date_to))
+        if date_from == "2026-01-01":
+            return [{"Id": 1408}, {"Id": 1409}]
+        if date_from == "2026-02-01":
+            return [{"Id": 1409}, {"Id": 1410}]
+        return []
+
+    async def get_meeting_data(self, meeting_id: int):
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await asyncio.sleep(0.01)
+        self.in_flight -= 1
+        return {"Name": f"Meeting {meeting_id}", "Location": "City Hall", "Time": "6:00 PM", "TypeId": 1}
+
+    async def get_meeting_documents(self, meeting_id: int):
+        html = f"<table><tr><td>6.1</td><td>Agenda Item {meeting_id}</td></tr></table>"
+        return [{"DocumentType": 1, "Html": html}]
+
+
+def test_collect_meeting_ids_async_keeps_window_order():
+    client = _FakeCivicWebClient()
+    ids = asyncio.run(collect_meeting_ids_async(client, "2026-01-01", "2026-02-28", chunk_days=31))
+    assert ids == [1408, 1409, 1410]
+    assert sorted(client.list_calls) == [("2026-01-01", "2026-01-31"), ("2026-02-01", "2026-02-28")]
+
+
+def test_ingest_range_async_fetches_concurrently_and_writes_in_order(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'test.db'}", connect_args={"check_same_thread": False})
+    TestingSessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False)
+    Base.metadata.create_all(bind=engine)
+    client = _FakeCivicWebClient()
+    progress: list[dict] = []
+
+    with TestingSessionLocal() as db:
+        result = asyncio.run(
+            ingest_range_async(
+                db,
+                from_date="2026-01-01",
+                to_date="2026-02-28",
+                limit=10,
+                crawl=True,
+                chunk_days=31,
+                store_raw=False,
+                concurrency=3,
+                progress_callback=progress.append,
+                client=client,
+            )
+        )
+
+        assert [r["meeting_id"] for r in result["results"]] == [1408, 1409, 1410]
+        assert result["succeeded"] == 3
+        assert db.query(Meeting).count() == 3
+        assert db.query(AgendaItem).count() == 3
+
+    assert client.max_in_flight > 1
+    assert progress[0]["stage"] == "discovered"
+    assert progress[-1]["stage"] == "completed"
+
+
+def test_ingest_range_async_waits_for_meeting_lease_held_by_another_job(monkeypatch, tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'test.db'}", connect_args={"check_same_thread": False})
+    TestingSessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False)
+    Base.metadata.create_all(bind=engine)
+    monkeypatch.setattr("app.leases.LEASE_POLL_SECONDS", 0.01)
+    client = _FakeCivicWebClient()
+    progress: list[dict] = []
+
+    assert try_acquire_meeting_lease(engine, 1409, "other-job")
+    assert not try_acquire_meeting_lease(engine, 1409, "job-a")
+
+    async def run():
+        async def release_later():
+            await asyncio.sleep(0.2)
+            assert not any(p.get("completed_meeting_id") == 1409 for p in progress)
+            release_meeting_lease(engine, 1409, "other-job")
+
+        with TestingSessionLocal() as db:
+            releaser = asyncio.create_task(release_later())
+            result = await ingest_range_async(
+                db,
+                from_date="2026-01-01",
+                to_date="2026-02-28",
+                limit=10,
+                concurrency=3,
+                progress_callback=progress.append,
+                lease_holder="job-a",
+                client=client,
+            )
+            await releaser
+            return result
+
+    result = asyncio.run(run())
+
+    assert [r["meeting_id"] for r in result["results"]] == [1408, 1409, 1410]
+    assert result["succeeded"] == 3
+    with TestingSessionLocal() as db:
+        assert db.query(MeetingIngestLease).count() == 0
+
+
+def test_meeting_lease_gives_up_after_wait_and_is_renewed_while_held(monkeypatch, tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'test.db'}", connect_args={"check_same_thread": False})
+    Base.metadata.create_all(bind=engine)
+    monkeypatch.setattr("app.leases.LEASE_POLL_SECONDS", 0.01)
+    monkeypatch.setattr("app.leases.settings.meeting_lease_seconds", 0.3)
+
+    assert try_acquire_meeting_lease(engine, 1409, "job-a")
+    with pytest.raises(TimeoutError):
+        with meeting_lease(engine, 1409, "request-b", wait_seconds=0.05):
+            pass
+    release_meeting_lease(engine, 1409, "job-a")
+
+    with meeting_lease(engine, 1409, "request-b", wait_seconds=0.05):
+        time.sleep(0.6)  # twice the lease length: only renewal keeps it from expiring
+        assert not try_acquire_meeting_lease(engine, 1409, "job-a")
+    assert try_acquire_meeting_lease(engine, 1409, "job-a")
+
+
+def test_cancelled_session_work_finishes_before_the_caller_moves_on():
+    finished: list[str] = []
+
+    def apply():
+        time.sleep(0.2)
+        finished.append("apply")
+
+    async def run():
+        task = asyncio.create_task(session_to_thread(apply))
+        await asyncio.sleep(0.05)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        # Only now may the caller close the session.
+        assert finished == ["apply"]
+
+    asyncio.run(run())
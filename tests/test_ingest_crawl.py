@@ -1,9 +1,21 @@
+import time
+
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 
+from app import graph
 from app.db import Base
 from app.ingest import _collect_meeting_ids, ingest_range
-from app.models import AgendaItem, Meeting, MeetingRawData
+from app.models import (
+    AgendaItem,
+    EntityConnection,
+    GraphPendingMeeting,
+    Meeting,
+    MeetingDiscoveryWindow,
+    MeetingIngestState,
+    MeetingRawData,
+)
+from app.parser import parse_agenda_html
 
 
 def _fake_meeting_data(mid: int) -> dict:
@@ -37,12 +49,30 @@ def test_collect_meeting_ids_crawls_windows_and_dedupes(monkeypatch):
     ids = _collect_meeting_ids("2026-01-01", "2026-02-28", chunk_days=31)
 
     assert ids == [1408, 1409, 1410]
-    assert calls == [
+    assert sorted(calls) == [
         ("2026-01-01", "2026-01-31"),
         ("2026-02-01", "2026-02-28"),
     ]
 
 
+def test_collect_meeting_ids_keeps_window_order_when_fetched_concurrently(monkeypatch):
+    def fake_list_meetings(date_from: str, date_to: str):
+        # Earlier windows answer last, so completion order is the reverse of window order.
+        if date_from == "2026-01-01":
+            time.sleep(0.05)
+            return [{"Id": 1408}, {"Id": 1409}]
+        if date_from == "2026-02-01":
+            time.sleep(0.02)
+            return [{"Id": 1409}, {"Id": 1410}]
+        return [{"Id": 1411}]
+
+    monkeypatch.setattr("app.ingest.cw.list_meetings", fake_list_meetings)
+
+    ids = _collect_meeting_ids("2026-01-01", "2026-03-31", chunk_days=31, concurrency=3)
+
+    assert ids == [1408, 1409, 1410, 1411]
+
+
 def test_ingest_range_crawl_stores_raw_data(monkeypatch, tmp_path):
     def fake_list_meetings(date_from: str, date_to: str):
         if date_from == "2026-01-01":
@@ -127,3 +157,183 @@ def test_ingest_range_reuses_recent_discovery_cache(monkeypatch, tmp_path):
         assert first["cache_hit"] is False
         assert second["cache_hit"] is True
         assert second["discovery_source"] == "cache"
+
+
+def test_ingest_range_concurrent_matches_serial_order(monkeypatch, tmp_path):
+    def fake_list_meetings(date_from: str, date_to: str):
+        return [{"Id": 1408}, {"Id": 1409}, {"Id": 1410}, {"Id": 1411}]
+
+    monkeypatch.setattr("app.ingest.cw.list_meetings", fake_list_meetings)
+    monkeypatch.setattr("app.ingest.cw.get_meeting_data", _fake_meeting_data)
+    monkeypatch.setattr("app.ingest.cw.get_meeting_documents", _fake_meeting_documents)
+
+    test_db_path = tmp_path / "test.db"
+    engine = create_engine(f"sqlite:///{test_db_path}", connect_args={"check_same_thread": False})
+    TestingSessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False)
+    Base.metadata.create_all(bind=engine)
+
+    progress: list[dict] = []
+    with TestingSessionLocal() as db:
+        result = ingest_range(
+            db,
+            from_date="2026-01-01",
+            to_date="2026-01-31",
+            limit=10,
+            crawl=False,
+            store_raw=False,
+            use_recent_cache=False,
+            concurrency=3,
+            progress_callback=progress.append,
+        )
+
+        assert [r["meeting_id"] for r in result["results"]] == [1408, 1409, 1410, 1411]
+        assert result["succeeded"] == 4
+        assert db.query(AgendaItem).count() == 4
+        assert progress[-1]["stage"] == "completed"
+        assert [p["processed"] for p in progress if p["stage"] == "ingesting"] == [0, 1, 1, 2, 2, 3, 3, 4]
+
+
+def test_ingest_range_rebuilds_the_graph_once_at_the_end(monkeypatch, tmp_path):
+    monkeypatch.setattr("app.ingest.cw.list_meetings", lambda a, b: [{"Id": 1408}, {"Id": 1409}, {"Id": 1410}])
+    monkeypatch.setattr("app.ingest.cw.get_meeting_data", _fake_meeting_data)
+    monkeypatch.setattr("app.ingest.cw.get_meeting_documents", _fake_meeting_documents)
+    rebuilt: list[int] = []
+    real_rebuild = graph.rebuild_graph_for_meeting
+
+    def counting_rebuild(db, meeting_id):
+        rebuilt.append(meeting_id)
+        return real_rebuild(db, meeting_id)
+
+    monkeypatch.setattr("app.graph.rebuild_graph_for_meeting", counting_rebuild)
+
+    engine = create_engine(f"sqlite:///{tmp_path / 'test.db'}", connect_args={"check_same_thread": False})
+    TestingSessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False)
+    Base.metadata.create_all(bind=engine)
+
+    edges_before_graph_pass: list[int] = []
+    with TestingSessionLocal() as db:
+
+        def progress(event: dict) -> None:
+            if event["stage"] == "graph":
+                edges_before_graph_pass.append(db.query(EntityConnection).count())
+
+        result = ingest_range(
+            db,
+            from_date="2026-01-01",
+            to_date="2026-01-31",
+            limit=10,
+            crawl=False,
+            store_raw=False,
+            use_recent_cache=False,
+            progress_callback=progress,
+        )
+
+        assert edges_before_graph_pass == [0]
+        assert rebuilt == [1408, 1409, 1410]
+        assert result["graph"]["status"] == "ok"
+        assert result["graph"]["meetings"] == 3
+        assert db.query(EntityConnection).count() == result["graph"]["connections"]
+        assert db.query(GraphPendingMeeting).count() == 0
+
+
+def test_ingest_range_fetches_only_uncovered_windows(monkeypatch, tmp_path):
+    calls = []
+
+    def fake_list_meetings(date_from: str, date_to: str):
+        calls.append((date_from, date_to))
+        return {
+            "2026-01-01": [{"Id": 1408}],
+            "2026-02-01": [{"Id": 1409}],
+            "2026-03-01": [{"Id": 1409}, {"Id": 1410}],
+        }.get(date_from, [])
+
+    monkeypatch.setattr("app.ingest.cw.list_meetings", fake_list_meetings)
+    monkeypatch.setattr("app.ingest.cw.get_meeting_data", _fake_meeting_data)
+    monkeypatch.setattr("app.ingest.cw.get_meeting_documents", _fake_meeting_documents)
+
+    test_db_path = tmp_path / "test.db"
+    engine = create_engine(f"sqlite:///{test_db_path}", connect_args={"check_same_thread": False})
+    TestingSessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False)
+    Base.metadata.create_all(bind=engine)
+
+    with TestingSessionLocal() as db:
+        ingest_range(db, from_date="2026-01-01", to_date="2026-02-28", limit=0, chunk_days=31)
+        assert sorted(calls) == [("2026-01-01", "2026-01-31"), ("2026-02-01", "2026-02-28")]
+
+        calls.clear()
+        result = ingest_range(db, from_date="2026-01-01", to_date="2026-03-31", limit=10, chunk_days=31)
+
+        assert calls == [("2026-03-01", "2026-03-31")]
+        assert result["discovery_source"] == "partial"
+        assert result["cache_hit"] is False
+        assert result["cached_windows"] == 2
+        assert [r["meeting_id"] for r in result["results"]] == [1408, 1409, 1410]
+        assert db.query(MeetingDiscoveryWindow).count() == 3
+
+
+def test_ingest_range_incremental_skips_unchanged_meetings(monkeypatch, tmp_path):
+    parse_calls = {"count": 0}
+    documents = {1408: _fake_meeting_documents(1408), 1409: _fake_meeting_documents(1409)}
+
+    def counting_parse(html: str):
+        parse_calls["count"] += 1
+        return parse_agenda_html(html)
+
+    monkeypatch.setattr("app.ingest.cw.list_meetings", lambda a, b: [{"Id": 1408}, {"Id": 1409}])
+    monkeypatch.setattr("app.ingest.cw.get_meeting_data", _fake_meeting_data)
+    monkeypatch.setattr("app.ingest.cw.get_meeting_documents", lambda mid: documents[mid])
+    monkeypatch.setattr("app.ingest.parse_agenda_html", counting_parse)
+
+    test_db_path = tmp_path / "test.db"
+    engine = create_engine(f"sqlite:///{test_db_path}", connect_args={"check_same_thread": False})
+    TestingSessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False)
+    Base.metadata.create_all(bind=engine)
+
+    kwargs = dict(from_date="2026-01-01", to_date="2026-01-31", crawl=False, use_recent_cache=False, incremental=True)
+    with TestingSessionLocal() as db:
+        first = ingest_range(db, **kwargs)
+        assert first["unchanged"] == 0
+        assert parse_calls["count"] == 2
+
+        documents[1409] = [{"DocumentType": 1, "Html": "<table><tr><td>6.1</td><td>Amended Item</td></tr></table>"}]
+        second = ingest_range(db, **kwargs)
+
+        assert [r["status"] for r in second["results"]] == ["unchanged", "ok"]
+        assert second["unchanged"] == 1
+        assert second["succeeded"] == 2
+        assert parse_calls["count"] == 3
+
+        state = db.query(MeetingIngestState).filter(MeetingIngestState.meeting_id == 1408).one()
+        assert state.payload_fingerprint
+        assert state.last_checked_at >= state.last_ingested_at
+
+
+def test_ingest_range_resumes_after_checkpoint(monkeypatch, tmp_path):
+    def fake_list_meetings(date_from: str, date_to: str):
+        return [{"Id": 1408}, {"Id": 1409}, {"Id": 1410}]
+
+    monkeypatch.setattr("app.ingest.cw.list_meetings", fake_list_meetings)
+    monkeypatch.setattr("app.ingest.cw.get_meeting_data", _fake_meeting_data)
+    monkeypatch.setattr("app.ingest.cw.get_meeting_documents", _fake_meeting_documents)
+
+    test_db_path = tmp_path / "test.db"
+    engine = create_engine(f"sqlite:///{test_db_path}", connect_args={"check_same_thread": False})
+    TestingSessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False)
+    Base.metadata.create_all(bind=engine)
+
+    events = []
+    with TestingSessionLocal() as db:
+        result = ingest_range(
+            db,
+            from_date="2026-01-01",
+            to_date="2026-01-31",
+            limit=10,
+            resume_after_meeting_id=1409,
+            progress_callback=events.append,
+        )
+
+        assert [r["meeting_id"] for r in result["results"]] == [1410]
+        assert result["discovered"] == 3
+        assert result["skipped"] == 2
+        assert events[-1]["processed"] == 3
+        assert db.query(Meeting).count() == 1
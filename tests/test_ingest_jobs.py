@@ -0,0 +1,143 @@
+import asyncio
+import threading
+import time
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app import jobs
+from app.db import Base
+from app.models import IngestJob
+
+
+def _use_test_db(monkeypatch, tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'jobs.db'}", connect_args={"check_same_thread": False})
+    Base.metadata.create_all(bind=engine)
+    TestingSessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False)
+    monkeypatch.setattr("app.jobs.SessionLocal", TestingSessionLocal)
+    return TestingSessionLocal
+
+
+def test_interrupted_job_resumes_after_checkpoint(monkeypatch, tmp_path):
+    TestingSessionLocal = _use_test_db(monkeypatch, tmp_path)
+    calls = []
+
+    async def fake_ingest_range_async(db, **kwargs):
+        calls.append(kwargs)
+        progress = kwargs["progress_callback"]
+        progress({"stage": "ingesting", "processed": 2, "current_meeting_id": 1409, "completed_meeting_id": 1409})
+        if len(calls) == 1:
+            raise asyncio.CancelledError  # the process goes away mid-job
+        progress({"stage": "completed", "processed": 3, "completed_meeting_id": 1410})
+        return {"discovered": 3, "skipped": 2}
+
+    monkeypatch.setattr("app.jobs.ingest_range_async", fake_ingest_range_async)
+    monkeypatch.setattr("app.jobs.start_ingest_job", lambda job_id: None)
+
+    job_id = jobs.create_ingest_job({"from_date": "2026-01-01", "to_date": "2026-03-31", "limit": 10})
+    assert jobs.count_active_jobs() == 1
+
+    try:
+        asyncio.run(jobs._run_ingest_job(job_id))
+    except asyncio.CancelledError:
+        pass
+    interrupted = jobs.get_job(job_id)
+    assert interrupted["status"] == "running"
+    assert interrupted["checkpoint_meeting_id"] == 1409
+
+    assert jobs.resume_interrupted_jobs() == [job_id]
+    assert jobs.get_job(job_id)["progress"]["stage"] == "resuming"
+    asyncio.run(jobs._run_ingest_job(job_id))
+
+    assert calls[0]["resume_after_meeting_id"] is None
+    assert calls[1]["resume_after_meeting_id"] == 1409
+    done = jobs.get_job(job_id)
+    assert done["status"] == "completed"
+    assert done["attempts"] == 2
+    assert done["checkpoint_meeting_id"] == 1410
+    assert done["result"] == {"discovered": 3, "skipped": 2}
+    assert jobs.count_active_jobs() == 0
+
+    with TestingSessionLocal() as db:
+        assert db.get(IngestJob, job_id) is not None
+
+
+def test_progress_is_written_off_the_event_loop_in_order(monkeypatch, tmp_path):
+    _use_test_db(monkeypatch, tmp_path)
+    writer_threads = set()
+    update_job = jobs._update_job
+
+    def recording_update_job(job_id, **fields):
+        writer_threads.add(threading.current_thread())
+        update_job(job_id, **fields)
+
+    async def fake_ingest_range_async(db, **kwargs):
+        for meeting_id in range(1400, 1420):
+            kwargs["progress_callback"]({"stage": "ingesting", "completed_meeting_id": meeting_id})
+            await asyncio.sleep(0)
+        return {"discovered": 20}
+
+    monkeypatch.setattr("app.jobs._update_job", recording_update_job)
+    monkeypatch.setattr("app.jobs.ingest_range_async", fake_ingest_range_async)
+    monkeypatch.setattr("app.jobs.start_ingest_job", lambda job_id: None)
+
+    job_id = jobs.create_ingest_job({"from_date": "2026-01-01", "to_date": "2026-01-31"})
+    asyncio.run(jobs._run_ingest_job(job_id))
+
+    assert threading.main_thread() not in writer_threads
+    done = jobs.get_job(job_id)
+    assert done["status"] == "completed"
+    assert done["checkpoint_meeting_id"] == 1419
+
+
+def test_finished_jobs_age_out_and_stuck_jobs_give_up(monkeypatch, tmp_path):
+    TestingSessionLocal = _use_test_db(monkeypatch, tmp_path)
+    monkeypatch.setattr("app.jobs.start_ingest_job", lambda job_id: None)
+    old = time.time() - 7 * 24 * 3600
+
+    with TestingSessionLocal() as db:
+        db.add(IngestJob(job_id="old-done", status="completed", created_at=old, updated_at=old))
+        db.add(IngestJob(job_id="new-done", status="failed", created_at=time.time(), updated_at=time.time()))
+        db.add(IngestJob(job_id="crashy", status="running", attempts=3, created_at=old, updated_at=old))
+        db.commit()
+
+    assert jobs.resume_interrupted_jobs() == []
+    assert jobs.get_job("old-done") is None
+    assert jobs.get_job("new-done")["status"] == "failed"
+    crashy = jobs.get_job("crashy")
+    assert crashy["status"] == "failed"
+    assert crashy["error"] == "interrupted_too_many_times"
+
+
+def test_scheduler_runs_interactive_jobs_ahead_of_bulk(monkeypatch):
+    started: list[str] = []
+    gates: dict[str, asyncio.Event] = {}
+
+    async def fake_run_ingest_job(job_id):
+        started.append(job_id)
+        await gates[job_id].wait()
+
+    monkeypatch.setattr("app.jobs._run_ingest_job", fake_run_ingest_job)
+
+    async def run():
+        for job_id in ("bulk-1", "bulk-2", "meeting-1"):
+            gates[job_id] = asyncio.Event()
+        scheduler = jobs.JobScheduler(workers=2, interactive_reserve=1)
+        scheduler.start()
+        scheduler.submit("bulk-1", jobs.PRIORITY_BULK, 1.0)
+        scheduler.submit("bulk-2", jobs.PRIORITY_BULK, 2.0)
+        scheduler.submit("meeting-1", jobs.PRIORITY_INTERACTIVE, 3.0)
+        await asyncio.sleep(0.01)
+        # Only one bulk slot: the second backfill waits, the meeting refresh does not.
+        assert started == ["bulk-1", "meeting-1"]
+        assert scheduler.snapshot()["queued"] == ["bulk-2"]
+
+        gates["bulk-1"].set()
+        await asyncio.sleep(0.01)
+        assert started == ["bulk-1", "meeting-1", "bulk-2"]
+
+        gates["meeting-1"].set()
+        gates["bulk-2"].set()
+        await scheduler.stop()
+
+    asyncio.run(run())
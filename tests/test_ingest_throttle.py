@@ -17,8 +17,8 @@ def test_ingest_range_job_rejects_too_large_date_span(monkeypatch):
 
 
 def test_ingest_range_job_throttle_active_job(monkeypatch):
-    monkeypatch.setattr("app.main.count_active_jobs", lambda: 1)
-    monkeypatch.setattr("app.main.most_recent_job_created_at", lambda: None)
+    monkeypatch.setattr("app.main.count_active_jobs", lambda **_: 4)
+    monkeypatch.setattr("app.main.most_recent_job_created_at", lambda **_: None)
     client = TestClient(app)
     resp = client.post(
         "/ingest/range/job",
@@ -32,8 +32,8 @@ def test_ingest_range_job_throttle_active_job(monkeypatch):
 
 
 def test_ingest_range_job_throttle_cooldown(monkeypatch):
-    monkeypatch.setattr("app.main.count_active_jobs", lambda: 0)
-    monkeypatch.setattr("app.main.most_recent_job_created_at", lambda: __import__("time").time())
+    monkeypatch.setattr("app.main.count_active_jobs", lambda **_: 0)
+    monkeypatch.setattr("app.main.most_recent_job_created_at", lambda **_: __import__("time").time())
     client = TestClient(app)
     resp = client.post(
         "/ingest/range/job",
@@ -44,3 +44,15 @@ def test_ingest_range_job_throttle_cooldown(monkeypatch):
     )
     assert resp.status_code == 429
     assert "ingest_job_cooldown_active" in resp.json()["detail"]
+
+
+def test_ingest_meeting_reports_conflict_while_a_job_holds_the_lease(monkeypatch):
+    def busy_lease(*_args, **_kwargs):
+        raise TimeoutError
+
+    monkeypatch.setattr("app.main.meeting_lease", busy_lease)
+    monkeypatch.setattr("app.main.ingest_meeting", lambda *_args, **_kwargs: {"status": "ok"})
+    client = TestClient(app)
+    resp = client.post("/ingest/meeting/1409")
+    assert resp.status_code == 409
+    assert resp.json()["detail"] == "meeting_ingest_in_progress"
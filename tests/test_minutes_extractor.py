@@ -10,7 +10,7 @@ def test_minutes_url_sample_detects_date_when_download_fails(monkeypatch):
     def fail_get(*args, **kwargs):
         raise RuntimeError("network disabled in test")
 
-    monkeypatch.setattr("app.minutes.requests.get", fail_get)
+    monkeypatch.setattr("app.document_fetch.http_get", fail_get)
 
     metadata = extract_minutes_metadata(title=title, url=url)
     assert metadata["detected_date"] == "2026-02-07"
@@ -0,0 +1,81 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pypdf
+
+from app.pdf_worker import PdfSummary, PdfWorkerPool, _parse_in_worker
+
+
+def _minimal_pdf(text: str) -> bytes:
+    stream = f"BT /F1 12 Tf 72 720 Td ({text}) Tj ET".encode("latin-1")
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        b"<< /Type /Pages /Kids [3 0 R] /Count 1 >>",
+        b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] /Contents 4 0 R "
+        b"/Resources << /Font << /F1 5 0 R >> >> >>",
+        b"<< /Length " + str(len(stream)).encode() + b" >>\nstream\n" + stream + b"\nendstream",
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    ]
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for i, body in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += f"{i} 0 obj\n".encode() + body + b"\nendobj\n"
+    xref = len(out)
+    out += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode()
+    for off in offsets:
+        out += f"{off:010d} 00000 n \n".encode()
+    out += f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode()
+    return bytes(out)
+
+
+def test_worker_pool_parses_pdf_and_recovers_after_timeout():
+    pdf_bytes = _minimal_pdf("Rezoning hearing for 3600 86th Street")
+    pool = PdfWorkerPool(1, timeout_seconds=0.001, max_tasks_per_child=2)
+    try:
+        # Worker start-up alone exceeds the deadline, so the document is abandoned.
+        assert pool.parse(pdf_bytes).status == "pdf_timeout"
+
+        pool.timeout_seconds = 60
+        for _ in range(3):  # crosses max_tasks_per_child, so a worker is recycled mid-run
+            summary = pool.parse(pdf_bytes)
+            assert summary.status == "ok"
+            assert summary.page_count == 1
+            assert "3600 86th Street" in summary.page_texts[0]
+    finally:
+        pool.shutdown()
+
+
+def test_waiting_for_a_busy_worker_does_not_count_toward_the_timeout(monkeypatch):
+    def slow_parse(_pdf_bytes, _max_pages):
+        time.sleep(0.2)
+        return PdfSummary(page_count=1, page_texts=["ok"], status="ok")
+
+    # An in-process executor stands in for the worker process, so the slow parse can be patched in.
+    monkeypatch.setattr("app.pdf_worker._parse_in_worker", slow_parse)
+    pool = PdfWorkerPool(1, timeout_seconds=0.5)
+    executor = ThreadPoolExecutor(max_workers=1)
+    monkeypatch.setattr(pool, "_current", lambda: (executor, 0))
+    statuses: list[str] = []
+    threads = [threading.Thread(target=lambda: statuses.append(pool.parse(b"%PDF-1.4").status)) for _ in range(4)]
+    try:
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    finally:
+        executor.shutdown()
+    # The last document waits 0.6 s for the worker but each parse takes only 0.2 s.
+    assert statuses == ["ok"] * 4
+
+
+def test_memory_error_in_worker_maps_to_pdf_oom(monkeypatch):
+    def exhausted(*_args, **_kwargs):
+        raise MemoryError
+
+    monkeypatch.setattr(pypdf, "PdfReader", exhausted)
+    summary = _parse_in_worker(b"%PDF-1.4", 8)
+    assert summary.status == "pdf_oom"
+    assert summary.page_count is None
+    assert not summary.pages_ok(2)
@@ -8,6 +8,7 @@ from sqlalchemy.orm import sessionmaker
 from app.db import Base
 from app.main import app, get_db
 from app.models import AgendaItem, Document, Meeting
+from app.topic_index import ensure_topics_classified
 
 
 SAMPLES_DIR = Path(__file__).resolve().parents[1] / "samples"
@@ -60,6 +61,7 @@ def test_topic_filters_work_for_new_labels_with_agenda_1408(tmp_path):
                 )
 
         db.commit()
+        ensure_topics_classified(db)  # rows added directly: classify them as ingest would
 
     try:
         client = TestClient(app)
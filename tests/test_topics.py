@@ -5,10 +5,11 @@ from fastapi.testclient import TestClient
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 
-from app.classifiers.topics import classify_topics
+from app.classifiers.topics import classify_topics, classify_topics_batch, topics_from_mask
 from app.db import Base
 from app.main import app, get_db
-from app.models import AgendaItem, Document, Meeting
+from app.models import AgendaItem, AgendaItemClassification, AgendaItemTopic, Document, Meeting
+from app.topic_index import CLASSIFICATION_VERSION, ensure_topics_classified
 from app.utils.text import normalize_text
 
 
@@ -26,6 +27,15 @@ def test_classify_topics_from_samples():
         assert topics == case["expected_topics"]
 
 
+def test_classify_topics_batch_matches_single_classification():
+    cases = _load_json("topic_classification_samples.json")
+    texts = [case["text"] for case in cases] + [cases[0]["text"].upper(), "", "Approval of Minutes"]
+    masks = classify_topics_batch(texts)
+    assert len(masks) == len(texts)
+    assert [topics_from_mask(mask) for mask in masks] == [classify_topics(text) for text in texts]
+    assert masks[0] == masks[len(cases)]
+
+
 def test_normalize_text_unescapes_and_normalizes_punctuation():
     src = "Title 15\u00a0Chapter 160 &amp; Zoning\u2014Updates\u2026"
     assert normalize_text(src) == "Title 15 Chapter 160 & Zoning-Updates..."
@@ -74,6 +84,7 @@ def test_agenda_topic_filter_returns_only_zoning(tmp_path):
                 )
 
         db.commit()
+        ensure_topics_classified(db)  # rows added directly: classify them as ingest would
 
     try:
         client = TestClient(app)
@@ -122,6 +133,7 @@ def test_agenda_topic_filter_supports_new_lens_topics(tmp_path):
             db.add(AgendaItem(meeting_id=9001, item_key=item_key, section="", title=title))
 
         db.commit()
+        ensure_topics_classified(db)  # rows added directly: classify them as ingest would
 
     try:
         client = TestClient(app)
@@ -139,3 +151,60 @@ def test_agenda_topic_filter_supports_new_lens_topics(tmp_path):
         assert [item["item_key"] for item in enforcement.json()] == ["6.3"]
     finally:
         app.dependency_overrides.clear()
+
+
+def test_topics_are_stored_and_reclassified_when_taxonomy_changes(monkeypatch, tmp_path):
+    test_db_path = tmp_path / "test_topic_index.db"
+    engine = create_engine(f"sqlite:///{test_db_path}", connect_args={"check_same_thread": False})
+    TestingSessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False)
+    Base.metadata.create_all(bind=engine)
+
+    def override_get_db():
+        db = TestingSessionLocal()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app.dependency_overrides[get_db] = override_get_db
+
+    with TestingSessionLocal() as db:
+        for meeting_id in (9101, 9102):
+            db.add(Meeting(meeting_id=meeting_id, name="Council", date="", time="", location="", type_id=1, video_url=""))
+        db.flush()
+        db.add(AgendaItem(meeting_id=9101, item_key="6.1", section="", title="Rezoning hearing for Douglas Avenue"))
+        db.add(AgendaItem(meeting_id=9102, item_key="6.1", section="", title="Zoning ordinance first reading"))
+        db.add(AgendaItem(meeting_id=9102, item_key="6.2", section="", title="Sidewalk patch program"))
+        db.commit()
+
+    try:
+        client = TestClient(app)
+        # Reads serve what is stored; classification is left to ingest and the startup pass.
+        assert client.get("/explore/topics").json() == []
+        with TestingSessionLocal() as db:
+            assert ensure_topics_classified(db) == 3
+
+        topics = {row["topic"]: row for row in client.get("/explore/topics").json()}
+        assert topics["zoning"]["agenda_item_count"] == 2
+        assert topics["zoning"]["meeting_count"] == 2
+        assert topics["zoning"]["recent_meeting_ids"] == [9102, 9101]
+        assert topics["ordinances_general"]["recent_meeting_ids"] == [9102]
+        assert [t["topic"] for t in client.get("/explore/topics", params={"q": "infra"}).json()] == [
+            "infrastructure_transport"
+        ]
+
+        with TestingSessionLocal() as db:
+            assert {r.taxonomy_version for r in db.query(AgendaItemClassification).all()} == {CLASSIFICATION_VERSION}
+            assert db.query(AgendaItemTopic).filter(AgendaItemTopic.topic == "zoning").count() == 2
+
+        # A taxonomy change marks every stored row stale; the startup job redoes them.
+        monkeypatch.setattr("app.topic_index.CLASSIFICATION_VERSION", "next-version")
+        with TestingSessionLocal() as db:
+            assert ensure_topics_classified(db) == 3
+            assert ensure_topics_classified(db) == 0
+            assert {r.taxonomy_version for r in db.query(AgendaItemClassification).all()} == {"next-version"}
+
+        popular = client.get("/explore/popular").json()["topics"]
+        assert popular[0] == {"topic": "zoning", "count": 2}
+    finally:
+        app.dependency_overrides.clear()